@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from argparse import ArgumentParser
+from os.path import exists
+from sys import exit
+from falcom.bench import MICRO_BENCHMARKS, MicroBenchmarkSuite
+from falcom.bench import load_results, save_results
+from falcom.bench.micro import DEFAULT_THRESHOLD, SIZES
+from falcom.bench.micro import compare, default_baseline_path
+
+names = [b.name for b in MICRO_BENCHMARKS]
+
+parser = ArgumentParser(description="Time parsers and matchers")
+parser.add_argument("--only", nargs="+", choices=names, metavar="NAME",
+                    help="run only these ({})".format(", ".join(names)))
+parser.add_argument("--sizes", nargs="+", type=int, default=SIZES,
+                    help="how many items to give each benchmark")
+parser.add_argument("--repeat", type=int, default=3,
+                    help="keep the best of this many tries")
+parser.add_argument("--baseline", metavar="FILE",
+                    default=default_baseline_path(),
+                    help="fail if anything is slower than this by more"
+                         " than --threshold times")
+parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+parser.add_argument("--save-baseline", metavar="FILE",
+                    help="save these results as a new baseline")
+parser.add_argument("-o", "--output", metavar="FILE",
+                    help="save results here as JSON")
+args = parser.parse_args()
+
+def report (key, result):
+    print("{:<24s} {:>14.6f} ms  score {:>12.4f}".format(
+            key, 1000 * result["seconds"], result["score"]), flush=True)
+
+benchmarks = [b for b in MICRO_BENCHMARKS
+              if args.only is None or b.name in args.only]
+suite = MicroBenchmarkSuite(benchmarks, args.sizes, args.repeat)
+results = suite.run(report)
+
+if args.output:
+    save_results(results, args.output)
+
+if args.save_baseline:
+    save_results(results, args.save_baseline)
+
+elif exists(args.baseline):
+    regressions = compare(results, load_results(args.baseline),
+                          args.threshold)
+
+    for r in regressions:
+        print("REGRESSION {}: {:.2f}x its baseline".format(r.key, r.ratio))
+
+    if regressions:
+        exit(1)
+
+    else:
+        print("No regressions past {:.1f}x.".format(args.threshold))
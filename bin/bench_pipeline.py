@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from argparse import ArgumentParser
+from json import dumps as json_dump_str
+from falcom.bench import PipelineBenchmark, save_results
+
+parser = ArgumentParser(
+        description="Time barcode lookups against stand-in APIs")
+parser.add_argument("-n", "--barcodes", type=int, default=500,
+                    help="how many barcodes to look up")
+parser.add_argument("--workers", type=int, default=8,
+                    help="barcodes to look up at once")
+parser.add_argument("--latency", type=float, default=0.005,
+                    metavar="SECONDS",
+                    help="how long the stand-ins take to answer")
+parser.add_argument("--error-rate", type=float, default=0,
+                    help="fraction of requests the stand-ins hang up on")
+parser.add_argument("--volumes-per-title", type=int, default=1,
+                    help="barcodes that share a bib and OCLC number")
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("-o", "--output", metavar="FILE",
+                    help="save results here as JSON")
+args = parser.parse_args()
+
+benchmark = PipelineBenchmark(barcodes=args.barcodes,
+                              workers=args.workers,
+                              latency=args.latency,
+                              error_rate=args.error_rate,
+                              volumes_per_title=args.volumes_per_title,
+                              seed=args.seed)
+results = benchmark.run()
+
+print("{:.1f} barcodes/sec over {:.2f}s".format(
+        results["barcodes_per_second"], results["seconds"]))
+print("Latency (ms): p50 {p50:.1f}, p95 {p95:.1f}, p99 {p99:.1f}".format(
+        **results["latency_ms"]))
+print("Requests: {}".format(json_dump_str(results["requests"],
+                                          sort_keys=True)))
+
+if results["peak_rss_kb"] is not None:
+    print("Peak RSS: {:d} KiB".format(results["peak_rss_kb"]))
+
+if args.output:
+    save_results(results, args.output)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from argparse import ArgumentParser
+from sys import stderr, stdout
+from falcom.api.marc.bulk import BulkMARCExtractor, ROW_FIELDS
+
+parser = ArgumentParser(description="Pull MARC fields out in bulk")
+parser.add_argument("sources", nargs="+",
+                    help="MARCXML files or directories of XML files")
+parser.add_argument("--jobs", type=int, default=None,
+                    help="processes to parse with (default: all cores)")
+parser.add_argument("--chunk-size", type=int, default=200,
+                    help="records to hand each process at a time")
+parser.add_argument("--progress-every", type=int, default=10000,
+                    metavar="N", help="report progress every N records")
+parser.add_argument("-o", "--output", metavar="FILE",
+                    help="write rows here instead of stdout")
+args = parser.parse_args()
+
+extractor = BulkMARCExtractor(args.jobs, args.chunk_size)
+
+if args.output:
+    out = open(args.output, "w")
+
+else:
+    out = stdout
+
+out.write("\t".join(ROW_FIELDS) + "\n")
+
+for i, row in enumerate(extractor.rows_from_sources(args.sources), 1):
+    out.write("\t".join(row) + "\n")
+
+    if i % args.progress_every == 0:
+        print("  {:d} records ...".format(i), file=stderr)
+
+if out is not stdout:
+    out.close()
+
+print("Done: {:d} records.".format(extractor.records_done), file=stderr)
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from argparse import ArgumentParser
+from falcom.api.worldcat import LocalHoldings
+
+parser = ArgumentParser(description="Index a WorldCat holdings export")
+parser.add_argument("index", help="where to write the index")
+parser.add_argument("exports", nargs="+",
+                    help="TSV (oclc, symbols...) or JSON lines files")
+args = parser.parse_args()
+
+with LocalHoldings.build(args.index, *args.exports) as holdings:
+    print("Indexed {:d} OCLC numbers.".format(len(holdings.db)))
@@ -2,124 +2,17 @@
 from argparse import ArgumentParser
 from collections import namedtuple
 from datetime import datetime
-from falcom.api.reject_list import VolumeDataFromBarcode
+from falcom.api import reject_list
+from falcom.api.uri import PooledURLOpener
+from falcom.api.uri import RecordingURLOpener, ReplayURLOpener
+from falcom.api.uri import ResponseCache
+from falcom.api.worldcat import InstitutionClassifier, LocalHoldings
+from falcom.table import ResumableTableWriter
 from re import compile as re_compile
 
 RE_14_BARCODE = re_compile(r"^[0-9]{14}$")
 RE_PROTO_BARCODE = re_compile(r"^[Bb][0-9]+$")
 
-UM_INSTITUTIONS = {
-  "EYM",
-  "BEU",
-  "E8W",
-  "EER",
-  "EKL",
-  "EMI",
-  "EUQ",
-  "EYD",
-  "HJ8",
-  "U2T",
-  "UMSPO",
-  "UMDON",
-}
-
-HATHI_INSTITUTIONS = {
-  "HATHI",
-}
-
-CIC_INSTITUTIONS = {
-  # University of Chicago
-  "CGU",
-  "IAB",
-  "KEH",
-
-  # University of Illinois
-  "UIU",
-  "ILG",
-  "IAL",
-  "LSI",
-  "RHU",
-  "RQF",
-  "RQR",
-
-  # Indiana University
-  "AAAMC",
-  "FSIUL",
-  "I3U",
-  "IJZ",
-  "IUB",
-  "IUG",
-  "IUL",
-  "IULGB",
-  "IULSP",
-  "RQQ",
-  "XUL",
-  "XYA",
-
-  # University of Iowa
-  "NUI",
-  "LUI",
-  "UIL",
-  "UKO",
-
-  # Michigan State University
-  "EEM",
-  "EVK",
-  "MIMSU",
-  "MSUTA",
-  "MSUTP",
-
-  # University of Minnesota
-  "MNU",
-  "DIF",
-  "HOR",
-  "MCR",
-  "MLL",
-  "MND",
-  "MNH",
-  "MNU",
-  "MNUDS",
-  "MNX",
-  "MNY",
-  "NRI",
-  "UMM",
-  "UMMBL",
-  "XOR",
-
-  # Northwestern University
-  "INU",
-  "FSINU",
-  "INL",
-  "INM",
-  "INUQR",
-  "JCR",
-  "TSINU",
-  "YO5",
-
-  # Ohio State University
-  "OSU",
-  "OHL",
-  "OS0",
-  "OS1",
-  "OS6",
-  "ZH5",
-  "ZH6",
-
-  # Pennsylvania State University
-  "UPM",
-  "UPC",
-
-  # Purdue University
-  "IPL",
-  "IPC",
-  "IPN",
-  "IUP",
-  "HV6",
-
-  # University of Wisconsin - Madison
-  "GZI",
-}
-
 DataRow = namedtuple("DataRow",
                      ("bib",
                       "oclc",
@@ -165,8 +58,46 @@ REQUIRED_FIELDS = {
 
 parser = ArgumentParser(description="Extend spreadsheets")
 parser.add_argument("spreadsheets", nargs="+")
+parser.add_argument("--workers", type=int, default=8,
+                    help="barcodes to look up at once")
+parser.add_argument("--per-host", type=int, default=4,
+                    help="most requests in flight to any one API host")
+parser.add_argument("--worldcat-rate", type=float,
+                    default=reject_list.worldcat_rate.rate,
+                    help="most WorldCat requests per second")
+parser.add_argument("--cache", metavar="FILE",
+                    help="keep API responses in this file across runs")
+parser.add_argument("--holdings", metavar="INDEX",
+                    help="read WorldCat holdings from this local index")
+parser.add_argument("--record", metavar="ARCHIVE",
+                    help="save every API response to this archive")
+parser.add_argument("--replay", metavar="ARCHIVE",
+                    help="answer API requests from this archive only")
+parser.add_argument("--replay-latency", type=float, default=0,
+                    metavar="SECONDS",
+                    help="wait this long before each replayed response")
 args = parser.parse_args()
 
+if args.record and args.replay:
+    parser.error("can't --record and --replay at the same time")
+
+reject_list.host_limiter.limit = args.per_host
+reject_list.worldcat_rate.rate = args.worldcat_rate
+
+if args.cache:
+    reject_list.use_response_cache(ResponseCache(args.cache))
+
+if args.holdings:
+    reject_list.use_worldcat_source(LocalHoldings(args.holdings))
+
+if args.record:
+    recorder = RecordingURLOpener(reject_list.url_opener, args.record)
+    reject_list.use_url_opener(recorder)
+
+if args.replay:
+    reject_list.use_url_opener(ReplayURLOpener(args.replay,
+                                               args.replay_latency))
+
 tables = { }
 
 for spreadsheet in args.spreadsheets:
@@ -200,37 +131,36 @@ for spreadsheet in args.spreadsheets:
 
     tables[spreadsheet] = table
 
+institutions = InstitutionClassifier()
 barcode_filename = datetime.now().strftime("barcodes-%Y%m%d.txt")
 
 for filename, table in tables.items():
     print("Processing {} ...".format(filename))
-    new_table = [table[0] + list(header_row)]
-    barcode_lines = [ ]
+    output = ResumableTableWriter(filename, table[0] + list(header_row))
+
+    if output.resumed:
+        print("  resuming after {:d} rows".format(len(output.done)))
 
-    for i in range(1, len(table)):
-        row = table[i]
+    # Rows are keyed by position as well as barcode so that a barcode
+    # listed twice still gets both of its rows.
+    todo = [(i, row) for i, row in enumerate(table[1:], 1)
+            if "{:d}:{}".format(i, row[0]) not in output.done]
+
+    barcodes = [row[0] for i, row in todo]
+    volumes = reject_list.get_volume_data_in_order(barcodes,
+                                                   args.workers)
+
+    for (i, row), data in zip(todo, volumes):
         barcode = row[0]
         status = row[-1]
+        key = "{:d}:{}".format(i, barcode)
 
         print("  {:<14s} ({:d}/{:d}) ...".format(
                         barcode, i, len(table) - 1))
 
-        data = VolumeDataFromBarcode(barcode)
-
         if data.marc:
-            numcic = 0
-            numoth = 0
-            numum = 0
-            dumb = 0
-            for code in data.worldcat:
-                if code in HATHI_INSTITUTIONS:
-                    dumb += 1
-                elif code in UM_INSTITUTIONS:
-                    numum += 1
-                elif code in CIC_INSTITUTIONS:
-                    numcic += 1
-                else:
-                    numoth += 1
+            dumb, numum, numcic, numoth = institutions.count(
+                    data.worldcat)
 
             if numcic > 0:
                 is_unique = numcic + numoth < 3
@@ -257,16 +187,38 @@ for filename, table in tables.items():
                     data.hathi_title_match_percent())
 
             new_row = row + list(extension)
-            new_table.append("" if x is None else x
-                             for x in new_row)
+            output.write_row(key, ("" if x is None else x
+                                   for x in new_row),
+                             "{}\t{}".format(barcode, status))
 
-            barcode_lines.append("{}\t{}\n".format(barcode, status))
+        else:
+            output.skip(key)
 
-    with open(filename, "w") as spreadsheet_file:
-        for row in new_table:
-            spreadsheet_file.write("\t".join(row) + "\n")
+    barcode_lines = ["{}\n".format(note)
+                     for note in output.done.values() if note]
+    output.finish()
 
     with open(barcode_filename, "a") as barcode_file:
         barcode_file.write("".join(barcode_lines))
 
+# A recording still went through the pool, but a replay never opened
+# a connection at all.
+opener = reject_list.aleph_api.url_opener
+if isinstance(opener, RecordingURLOpener):
+    opener = opener.url_opener
+
+if isinstance(opener, PooledURLOpener):
+    print("Connections: {:d} opened, {:d} reused".format(
+            opener.connections_opened, opener.connections_reused))
+
+if args.record:
+    recorder.save()
+    print("Recorded: {:d} responses".format(len(recorder)))
+
+if args.cache:
+    cache = reject_list.aleph_api.cache
+    print("Cache: {:d} hits, {:d} misses".format(cache.hits,
+                                                 cache.misses))
+    cache.close()
+
 print("Done.")
@@ -2,4 +2,4 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 
-from .reject_list import VolumeDataFromBarcode
+from .reject_list import VolumeDataFromBarcode, get_volume_data_in_order
@@ -3,3 +3,4 @@
 # BSD License. See LICENSE.txt for details.
 
 from .read_only_data_structure import ReadOnlyDataStructure
+from .lru_memo import LRUMemo
@@ -0,0 +1,89 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+
+class LRUMemo:
+
+    def __init__ (self, func, max_entries = 4096):
+        self.func = func
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.__lock = Lock()
+        self.clear()
+
+    def __call__ (self, key):
+        with self.__lock:
+            if key in self.__done:
+                return self.__recall(key)
+
+            future, we_own_it = self.__join_or_claim(key)
+
+        if we_own_it:
+            return self.__compute(key, future)
+
+        else:
+            return future.result()
+
+    def clear (self):
+        with self.__lock:
+            self.__done = OrderedDict()
+            self.__pending = { }
+
+    def __len__ (self):
+        return len(self.__done)
+
+    def __repr__ (self):
+        return "<{} {} entries={:d} hits={:d} misses={:d}>".format(
+                self.__class__.__name__, repr(self.func), len(self),
+                self.hits, self.misses)
+
+    def __recall (self, key):
+        self.hits += 1
+        self.__done.move_to_end(key)
+        return self.__done[key]
+
+    def __join_or_claim (self, key):
+        if key in self.__pending:
+            self.hits += 1
+            return self.__pending[key], False
+
+        else:
+            self.misses += 1
+            self.__pending[key] = Future()
+            return self.__pending[key], True
+
+    def __compute (self, key, future):
+        try:
+            value = self.func(key)
+
+        except BaseException as error:
+            self.__forget(key)
+            future.set_exception(error)
+            raise
+
+        self.__remember(key, value)
+        future.set_result(value)
+        return value
+
+    def __forget (self, key):
+        with self.__lock:
+            self.__pending.pop(key, None)
+
+    def __remember (self, key, value):
+        with self.__lock:
+            self.__pending.pop(key, None)
+
+            # Empty results mean the request failed, and we'd rather
+            # ask again next time than remember the failure.
+            if value:
+                self.__done[key] = value
+                self.__evict_least_recently_used()
+
+    def __evict_least_recently_used (self):
+        while len(self.__done) > self.max_entries:
+            self.__done.popitem(last=False)
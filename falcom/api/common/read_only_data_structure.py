@@ -2,73 +2,95 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 
-class ReadOnlyDataStructure:
+class ReadOnlyDataStructureType (type):
+
+    def __new__ (mcs, name, bases, namespace):
+        # Every class in the hierarchy has to declare __slots__, or its
+        # instances would each carry a __dict__ after all.
+        namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace)
+
+    def __init__ (cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._generate_auto_properties()
+
+class ReadOnlyDataStructure (metaclass=ReadOnlyDataStructureType):
 
     auto_properties = ( )
-    __subclasses = set()
+    __slots__ = ("__values", "__extras")
 
     def __init__ (self, **kwargs):
-        self.__set_read_only_data(kwargs)
-        self.__ensure_we_have_our_property_accession_methods()
+        self.__values = tuple(kwargs.pop(name, None)
+                              for name in self.__field_names)
+        self.__set_extras(kwargs)
 
     def get (self, key, default = None):
-        return self.__read_only_data.get(key, default)
+        value = self.__get_value_or_none(key)
+
+        if value is None:
+            return default
+
+        else:
+            return value
 
     def __bool__ (self):
-        return bool(self.__read_only_data)
+        return self.__extras is not None \
+                or any(v is not None for v in self.__values)
 
     def __repr__ (self):
         dictstr = [self.__class__.__name__]
-        for key, value in self.__read_only_data.items():
+        for key, value in self.__items():
             dictstr.append("{}={}".format(key, repr(value)))
 
         return "<{}>".format(" ".join(dictstr))
 
-    def __set_read_only_data (self, kwargs):
-        self.__read_only_data = kwargs
-        self.__remove_null_keys()
+    @classmethod
+    def _generate_auto_properties (cls):
+        names = [ ]
 
-    def __remove_null_keys (self):
-        null_keys = self.__independent_list_of_keys_with_null_values()
+        for prop in cls.auto_properties:
+            name, default = cls.__read_auto_property_instruction(prop)
+            cls.__generate_property_accession_method(len(names),
+                                                     name, default)
+            names.append(name)
 
-        for key in null_keys:
-            del self.__read_only_data[key]
+        cls.__field_names = tuple(names)
+        cls.__field_index = dict((n, i) for i, n in enumerate(names))
 
-    def __independent_list_of_keys_with_null_values (self):
-        return [k for k, v in self.__read_only_data.items()
-                   if v is None]
+    @classmethod
+    def __read_auto_property_instruction (cls, prop):
+        if isinstance(prop, tuple):
+            return prop
 
-    def __ensure_we_have_our_property_accession_methods (self):
-        if self.__this_is_the_first_instance_of_this_class():
-            self.__generate_each_property_accession_method()
-            self.__mark_this_class_as_a_complete_subclass()
+        else:
+            return prop, None
 
-    def __this_is_the_first_instance_of_this_class (self):
-        return self.__class__ not in self.__subclasses
+    @classmethod
+    def __generate_property_accession_method (cls, index, name,
+                                              default_value):
+        def get_this_property (self):
+            value = self.__values[index]
+            return default_value if value is None else value
 
-    def __mark_this_class_as_a_complete_subclass (self):
-        self.__subclasses.add(self.__class__)
+        setattr(cls, name, property(get_this_property))
 
-    def __generate_each_property_accession_method (self):
-        for p in self.auto_properties:
-            self.__read_auto_property_instruction(p)
+    def __set_extras (self, kwargs):
+        # Most records have nothing beyond their auto properties, and we
+        # don't want to pay for an empty dict on each of them.
+        extras = dict((k, v) for k, v in kwargs.items() if v is not None)
+        self.__extras = extras or None
 
-    def __read_auto_property_instruction (self, prop):
-        if self.__property_instruction_contains_multiple_args(prop):
-            self.__generate_property_accession_method(*prop)
+    def __get_value_or_none (self, key):
+        if key in self.__field_index:
+            return self.__values[self.__field_index[key]]
 
-        else:
-            self.__generate_property_accession_method(prop)
+        elif self.__extras is not None:
+            return self.__extras.get(key)
 
-    def __property_instruction_contains_multiple_args (self, prop):
-        return isinstance(prop, tuple)
-
-    def __generate_property_accession_method (self,
-                                              property_name,
-                                              default_value = None):
-        def get_this_property (self):
-            return self.get(property_name, default_value)
+    def __items (self):
+        for name, value in zip(self.__field_names, self.__values):
+            if value is not None:
+                yield name, value
 
-        setattr(self.__class__,
-                property_name,
-                property(get_this_property))
+        if self.__extras is not None:
+            yield from self.__extras.items()
@@ -2,5 +2,6 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 
+from .batch import HathiBatcher, split_hathi_json_by_id
 from .from_json import get_hathi_data_from_json
 from .oclc_counts import get_oclc_counts_from_json
@@ -0,0 +1,130 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from concurrent.futures import Future, TimeoutError
+from json import dumps as json_dump_str, loads as json_load_str
+from threading import Lock
+
+from .from_json import get_hathi_data_from_json
+
+def split_hathi_json_by_id (json_data, ids):
+    try:
+        data = json_load_str(json_data)
+
+    except:
+        data = None
+
+    if isinstance(data, dict):
+        return dict((i, json_dump_str(data.get(i, { }))) for i in ids)
+
+    else:
+        # A failed request looks the same for every id in it.
+        return dict((i, json_data) for i in ids)
+
+class HathiBatcher:
+
+    # This is the most identifiers HathiTrust will take in one call.
+    max_chunk_size = 20
+
+    def __init__ (self, api, chunk_size = 20, max_wait = 0.05):
+        self.api = api
+        self.chunk_size = min(chunk_size, self.max_chunk_size)
+        self.max_wait = max_wait
+        self.requests_sent = 0
+
+        self.__lock = Lock()
+        self.__pending = { }
+
+    def get (self, id_type, id_value):
+        key = "{}:{}".format(id_type, id_value)
+        cached = self.api.cache.get(self.__uri_for(key), self.api.cache_ttl)
+
+        if cached is not None:
+            return cached
+
+        future, batch = self.__add_to_pending(key)
+
+        if batch:
+            self.__send(batch)
+
+        return self.__wait_for(key, future)
+
+    def get_hathi_data (self, id_type, id_value):
+        return get_hathi_data_from_json(self.get(id_type, id_value))
+
+    def flush (self):
+        with self.__lock:
+            batch = self.__take_batch()
+
+        if batch:
+            self.__send(batch)
+
+    def __repr__ (self):
+        return "<{} chunk_size={:d} sent={:d}>".format(
+                self.__class__.__name__, self.chunk_size,
+                self.requests_sent)
+
+    def __add_to_pending (self, key):
+        with self.__lock:
+            if key not in self.__pending:
+                self.__pending[key] = Future()
+
+            future = self.__pending[key]
+
+            if len(self.__pending) >= self.chunk_size:
+                return future, self.__take_batch()
+
+            else:
+                return future, None
+
+    def __wait_for (self, key, future):
+        try:
+            return future.result(timeout=self.max_wait)
+
+        except TimeoutError:
+            # Nobody filled the batch in time, so whoever notices first
+            # sends what has gathered so far.
+            self.flush()
+            return future.result()
+
+    def __take_batch (self):
+        batch = self.__pending
+        self.__pending = { }
+        return batch
+
+    def __send (self, batch):
+        with self.__lock:
+            self.requests_sent += 1
+
+        # We sort the ids so that the same batch always has the same
+        # URI, however its lookups happened to arrive. We cache each id
+        # below, so caching the batch too would only double the cache.
+        try:
+            json_data = self.api.get_uncached(ids="|".join(sorted(batch)))
+
+        except BaseException as error:
+            for future in batch.values():
+                future.set_exception(error)
+
+            raise
+
+        json_by_id = split_hathi_json_by_id(json_data, batch)
+
+        if json_data:
+            self.__cache_each(json_by_id)
+
+        self.__resolve(batch, json_by_id)
+
+    def __cache_each (self, json_by_id):
+        # Which ids share a request depends on timing, so we also keep
+        # each id's answer under the URI it would have on its own. Then
+        # a rerun only sends the ids we haven't seen.
+        for key, json_data in json_by_id.items():
+            self.api.cache.set(self.__uri_for(key), json_data)
+
+    def __uri_for (self, key):
+        return self.api.uri(ids=key)
+
+    def __resolve (self, batch, json_by_id):
+        for key, future in batch.items():
+            future.set_result(json_by_id[key])
@@ -0,0 +1,95 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from functools import lru_cache
+from re import compile as re_compile
+
+RE_SYMBOL = re_compile(r"[^0-9A-Za-z\s]")
+RE_SPACES = re_compile(r"\s+")
+
+@lru_cache(maxsize=65536)
+def soften_title (text):
+    without_symbols = RE_SYMBOL.sub("", text)
+    collapsed_spaces = RE_SPACES.sub(" ", without_symbols)
+    return collapsed_spaces.lower()
+
+def bounded_levenshtein (a, b, max_dist):
+    # We only care about distances up to max_dist, which only cells
+    # that close to the diagonal can hold, so we fill in just that band
+    # and give up with None once a whole row is out of reach.
+    if len(a) < len(b):
+        a, b = b, a
+
+    if len(a) - len(b) > max_dist:
+        return None
+
+    too_far = max_dist + 1
+    previous = [j if j <= max_dist else too_far
+                for j in range(len(b) + 1)]
+
+    for i, char in enumerate(a, 1):
+        current = [too_far] * (len(b) + 1)
+        if i <= max_dist:
+            current[0] = i
+
+        low = max(1, i - max_dist)
+        high = min(len(b), i + max_dist)
+
+        for j in range(low, high + 1):
+            current[j] = min(previous[j] + 1,
+                             current[j - 1] + 1,
+                             previous[j - 1] + (char != b[j - 1]))
+
+        if min(current[low - 1:high + 1]) > max_dist:
+            return None
+
+        previous = current
+
+    if previous[-1] > max_dist:
+        return None
+
+    else:
+        return previous[-1]
+
+class TitleMatcher:
+
+    def __init__ (self, titles):
+        self.soft_titles = tuple(soften_title(t) for t in titles)
+
+    def min_distance (self, title):
+        # We divide by the longer title's length, as the Distance
+        # package's normalized levenshtein does.
+        if not self.soft_titles:
+            return 1
+
+        soft_title = soften_title(title)
+        if soft_title in self.soft_titles:
+            return 0.0
+
+        # We keep the best distance as an exact fraction so that the
+        # cutoff for the next candidate needs no float rounding.
+        best_dist, best_length = 1, 1
+
+        for candidate in self.__closest_lengths_first(soft_title):
+            length = max(len(candidate), len(soft_title))
+            max_dist = (best_dist * length - 1) // best_length
+
+            dist = bounded_levenshtein(soft_title, candidate, max_dist)
+            if dist is not None:
+                best_dist, best_length = dist, length
+
+        return best_dist / float(best_length)
+
+    def min_distances (self, titles):
+        return [self.min_distance(t) for t in titles]
+
+    def __repr__ (self):
+        return "<{} titles={:d}>".format(self.__class__.__name__,
+                                         len(self.soft_titles))
+
+    def __closest_lengths_first (self, soft_title):
+        return sorted(self.soft_titles,
+                      key=lambda t: abs(len(t) - len(soft_title)))
+
+def min_title_distances (marc_titles, hathi_titles):
+    return TitleMatcher(hathi_titles).min_distances(marc_titles)
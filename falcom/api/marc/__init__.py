@@ -2,4 +2,5 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 
+from .collection import MARCXMLCollection, get_marc_data_from_xml_collection
 from .from_xml import get_marc_data_from_xml
@@ -0,0 +1,222 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import islice
+from mmap import mmap, ACCESS_READ
+from os import listdir
+from os.path import getsize, isdir, join
+from re import DOTALL, compile as re_compile
+import xml.etree.ElementTree as ET
+
+from ...compat import cpu_count
+from .collection import MARCXMLCollection
+from .from_xml import get_marc_data_from_xml
+
+ROW_FIELDS = ("bib", "oclc", "callno", "author", "title", "desc",
+              "year1", "year2")
+
+RE_PROLOG = re_compile(br"(?:\s*(?:<\?.*?\?>|<!--.*?-->"
+                       br"|<!DOCTYPE[^>\[]*(?:\[.*?\])?\s*>))*\s*",
+                       DOTALL)
+RE_ROOT = re_compile(br"<([A-Za-z_][^\s/>]*)[^>]*>")
+RE_RECORD_TAG = re_compile(br"<!--.*?-->|<!\[CDATA\[.*?\]\]>"
+                           br"|<(/?)(?:[A-Za-z_][\w.-]*:)?record"
+                           br"(?:\s[^>]*?)?(/?)>", DOTALL)
+
+# A run of whole records somewhere in a collection file, along with
+# what has to wrap it (the XML declaration and the collection's start
+# and end tags) for it to parse on its own with the same encoding and
+# namespaces.
+MARCXMLSlice = namedtuple("MARCXMLSlice", ("path", "start", "end",
+                                           "header", "footer"))
+
+def marc_data_to_row (data):
+    row = (data.bib, data.oclc, data.callno, data.author, data.title,
+           data.description) + tuple(data.years)
+
+    return tuple("" if x is None else x for x in row)
+
+def extract_rows_from_files (paths):
+    rows = [ ]
+
+    for path in paths:
+        with open(path, "r") as f:
+            rows.append(marc_data_to_row(get_marc_data_from_xml(f.read())))
+
+    return rows
+
+def extract_rows_from_slice (piece):
+    # If we split the file somewhere we shouldn't have, we say so
+    # rather than guess, and the whole file gets read the slow way.
+    with open(piece.path, "rb") as f:
+        f.seek(piece.start)
+        data = f.read(piece.end - piece.start)
+
+    source = BytesIO(piece.header + data + piece.footer)
+
+    try:
+        return [marc_data_to_row(x) for x in MARCXMLCollection(source)]
+
+    except ET.ParseError:
+        return None
+
+def xml_files_in (path):
+    for filename in sorted(listdir(path)):
+        if filename.endswith(".xml"):
+            yield join(path, filename)
+
+def marcxml_slices (path, records_per_slice = 200):
+    # Finding where each record starts and ends is much quicker than
+    # parsing it, so that's all we do here; the workers parse.
+    if getsize(path) == 0:
+        return
+
+    with open(path, "rb") as f:
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as data:
+            yield from slices_of_collection(path, data, records_per_slice)
+
+def slices_of_collection (path, data, records_per_slice):
+    prolog = RE_PROLOG.match(data).group(0)
+    root = RE_ROOT.match(data, len(prolog))
+
+    if root is None:
+        return
+
+    elif root.group(1).split(b":")[-1] == b"record":
+        # The whole file is one record, and it'll parse as it is.
+        yield MARCXMLSlice(path, 0, len(data), b"", b"")
+
+    else:
+        header = prolog + root.group(0)
+        footer = b"</" + root.group(1) + b">"
+
+        for start, end in record_spans(data, root.end(),
+                                       records_per_slice):
+            yield MARCXMLSlice(path, start, end, header, footer)
+
+def record_spans (data, position, records_per_slice):
+    start = None
+    count = 0
+
+    for record_start, record_end in records_in(data, position):
+        if start is None:
+            start = record_start
+
+        position = record_end
+        count += 1
+
+        if count == records_per_slice:
+            yield start, position
+            start = None
+            count = 0
+
+    if start is not None:
+        yield start, position
+
+def records_in (data, position):
+    opened = None
+
+    for tag in RE_RECORD_TAG.finditer(data, position):
+        closing, empty = tag.group(1), tag.group(2)
+
+        if closing is None:
+            # This was a comment or CDATA, which can say anything.
+            continue
+
+        elif empty:
+            yield tag.start(), tag.end()
+
+        elif not closing:
+            if opened is None:
+                opened = tag.start()
+
+        elif opened is not None:
+            yield opened, tag.end()
+            opened = None
+
+class BulkMARCExtractor:
+
+    def __init__ (self, jobs = None, chunk_size = 200):
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.records_done = 0
+
+    def rows_from_sources (self, paths):
+        with ProcessPoolExecutor(self.jobs) as executor:
+            for path in paths:
+                yield from self.__rows_from_source(executor, path)
+
+    def __repr__ (self):
+        return "<{} jobs={} chunk_size={:d}>".format(
+                self.__class__.__name__, self.jobs, self.chunk_size)
+
+    def __rows_from_source (self, executor, path):
+        # A collection file is split by byte offsets, so each worker
+        # reads and parses its own records and we never send any XML.
+        if isdir(path):
+            work = ((extract_rows_from_files, chunk)
+                    for chunk in self.__chunks(xml_files_in(path)))
+
+        else:
+            work = ((extract_rows_from_slice, piece)
+                    for piece in marcxml_slices(path, self.chunk_size))
+
+        rows_so_far = 0
+
+        for rows in self.__rows_from_pool(executor, work):
+            if rows is None:
+                yield from self.__rows_by_iterparse(path, rows_so_far)
+                return
+
+            rows_so_far += len(rows)
+            yield from rows
+
+    def __rows_by_iterparse (self, path, rows_to_skip):
+        for data in islice(MARCXMLCollection(path), rows_to_skip, None):
+            self.records_done += 1
+            yield marc_data_to_row(data)
+
+    def __rows_from_pool (self, executor, work):
+        # We keep only a few chunks ahead of the one we're waiting on,
+        # so a huge input never has to sit in memory all at once, and
+        # we collect results in the order we sent them.
+        in_flight = deque()
+        most_in_flight = 2 * (self.jobs or cpu_count() or 1)
+
+        try:
+            for function, arg in work:
+                in_flight.append(executor.submit(function, arg))
+
+                if len(in_flight) >= most_in_flight:
+                    yield self.__finish(in_flight.popleft())
+
+            while in_flight:
+                yield self.__finish(in_flight.popleft())
+
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def __finish (self, future):
+        rows = future.result()
+
+        if rows is not None:
+            self.records_done += len(rows)
+
+        return rows
+
+    def __chunks (self, items):
+        chunk = [ ]
+
+        for item in items:
+            chunk.append(item)
+
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = [ ]
+
+        if chunk:
+            yield chunk
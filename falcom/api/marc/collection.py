@@ -0,0 +1,47 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import xml.etree.ElementTree as ET
+
+from .from_xml import get_marc_data_from_xml
+from .mapping import MARCMapping
+
+class MARCXMLCollection:
+
+    record_tag = "{{{}}}record".format(MARCMapping.xmlns)
+
+    def __init__ (self, source):
+        self.source = source
+
+    def __iter__ (self):
+        for record in self.records():
+            yield get_marc_data_from_xml(record)
+
+    def records (self):
+        ancestors = [ ]
+
+        for event, elt in ET.iterparse(self.source, ("start", "end")):
+            if event == "start":
+                ancestors.append(elt)
+
+            else:
+                ancestors.pop()
+
+                if elt.tag == self.record_tag:
+                    yield elt
+                    self.__forget(elt, ancestors)
+
+    def __repr__ (self):
+        return "<{} {}>".format(self.__class__.__name__,
+                                repr(self.source))
+
+    def __forget (self, record, ancestors):
+        # Once a record has been read, nothing will look at it again,
+        # so we drop it to keep memory flat across the whole file.
+        record.clear()
+
+        if ancestors:
+            ancestors[-1].remove(record)
+
+def get_marc_data_from_xml_collection (source):
+    return iter(MARCXMLCollection(source))
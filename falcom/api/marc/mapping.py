@@ -14,12 +14,10 @@ class MARCMapping:
         else:
             self.__try_to_parse_xml(xml_str)
 
-    def __getitem__ (self, key):
-        if self.__this_key_is_for_a_datafield(key):
-            return self.__get_datafield(*key)
+        self.__build_index()
 
-        else:
-            return self.__get_controlfield(key)
+    def __getitem__ (self, key):
+        return iter(self.__index.get(key, ()))
 
     def __try_to_parse_xml (self, xml_str):
         try:
@@ -28,26 +26,38 @@ class MARCMapping:
         except:
             self.xml = ET.fromstring("<empty/>")
 
-    def __this_key_is_for_a_datafield (self, key):
-        return isinstance(key, tuple)
+    def __build_index (self):
+        # We walk the record once and file every value under its tag
+        # (for controlfields) or its (tag, code) pair (for datafields),
+        # keeping document order within each key.
+        self.__index = { }
+        controlfield = self.__etree_tag("controlfield")
+        datafield = self.__etree_tag("datafield")
+
+        for elt in self.__descendants():
+            if elt.tag == controlfield:
+                self.__add(elt.get("tag"), elt.text)
 
-    def __get_datafield (self, tag, code):
-        return self.__find_all(".//{}/{}".format(
-                self.__make_xpath("datafield", "tag", tag),
-                self.__make_xpath("subfield", "code", code)))
+            elif elt.tag == datafield:
+                self.__add_subfields(elt)
 
-    def __get_controlfield (self, tag):
-        return self.__find_all(".//{}".format(
-                self.__make_xpath("controlfield", "tag", tag)))
+    def __descendants (self):
+        elements = self.xml.iter()
+        next(elements)
+        return elements
 
-    def __make_xpath (self, field, attr, value):
-        return "{}[@{}='{}']".format(
-                self.__etree_tag(field), attr, value)
+    def __add_subfields (self, datafield):
+        tag = datafield.get("tag")
+        subfield = self.__etree_tag("subfield")
+
+        for elt in datafield:
+            if elt.tag == subfield:
+                self.__add((tag, elt.get("code")), elt.text)
+
+    def __add (self, key, value):
+        self.__index.setdefault(key, [ ]).append(value)
 
     def __etree_tag (self, field):
         # ElementTree stores `<ns:tag xmlns:ns="full_ns_uri">` as a tag
         # with the name `{full_ns_uri}tag`.
         return "{{{}}}{}".format(self.xmlns, field)
-
-    def __find_all (self, xpath):
-        return (elt.text for elt in self.xml.findall(xpath))
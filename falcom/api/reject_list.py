@@ -1,48 +1,150 @@
 # Copyright (c) 2017 The Regents of the University of Michigan.
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
+from concurrent.futures import ThreadPoolExecutor
 from os import environ
 from time import sleep
-from urllib.request import urlopen
 
-from .uri import URI, APIQuerier
+from ..decorators import try_forever
+from .common import LRUMemo
+from .uri import URI, APIQuerier, CircuitBreakers, CircuitOpen, HostLimiter
+from .uri import PooledURLOpener, TokenBucket
 from .marc import get_marc_data_from_xml
 from .worldcat import get_worldcat_data_from_json
 from .hathi import get_oclc_counts_from_json, get_hathi_data_from_json
+from .hathi import HathiBatcher
 
 AlephURI = URI("http://mirlyn-aleph.lib.umich.edu/cgi-bin/bc2meta")
 WorldCatURI = URI("http://www.worldcat.org/webservices/catalog"
                   "/content/libraries/{oclc}")
 HathiURI = URI("http://catalog.hathitrust.org/api/volumes/brief"
-               "/oclc/{oclc}.json")
-BibURI = URI("http://catalog.hathitrust.org/api/volumes/brief"
-             "/recordnumber/{bib}.json")
+               "/json/{ids}")
 
-aleph_api = APIQuerier(AlephURI, url_opener=urlopen)
-worldcat_api = APIQuerier(WorldCatURI, url_opener=urlopen)
-hathi_oclc_api = APIQuerier(HathiURI, url_opener=urlopen)
-hathi_bib_api = APIQuerier(BibURI, url_opener=urlopen)
+ONE_DAY = 60*60*24
+
+# Every querier shares one limiter so that, no matter how many volumes
+# we look up at once, no single host sees more than this many of our
+# requests at a time.
+host_limiter = HostLimiter(4)
+
+# They also share keep-alive connections, rather than opening a new one
+# for every request.
+url_opener = PooledURLOpener(max_idle_per_host=8)
+
+# When a host fails over and over, we stop sending it anything for a
+# while. Volumes waiting on it give up and try again later, which
+# leaves the other hosts' work free to carry on.
+circuit_breakers = CircuitBreakers(failure_threshold=5, cool_down=120)
+
+# We keep to a steady pace with each service rather than bursting and
+# being throttled.
+aleph_rate = TokenBucket(rate=10, burst=10)
+worldcat_rate = TokenBucket(rate=2, burst=4)
+hathi_rate = TokenBucket(rate=10, burst=10)
+
+# A blip should cost us seconds, but a long outage shouldn't have us
+# knocking more than every five minutes.
+retry_policy = {
+    "sleep_time": 5,
+    "backoff": 2,
+    "max_sleep_time": 300,
+    "jitter": 0.5,
+}
+
+aleph_api = APIQuerier(AlephURI, url_opener=url_opener,
+                       host_limiter=host_limiter,
+                       circuit_breaker=circuit_breakers,
+                       rate_limiter=aleph_rate,
+                       cache_ttl=7*ONE_DAY,
+                       **retry_policy)
+worldcat_api = APIQuerier(WorldCatURI, url_opener=url_opener,
+                          host_limiter=host_limiter,
+                          circuit_breaker=circuit_breakers,
+                          rate_limiter=worldcat_rate,
+                          cache_ttl=30*ONE_DAY,
+                          **retry_policy)
+hathi_api = APIQuerier(HathiURI, url_opener=url_opener,
+                       host_limiter=host_limiter,
+                       circuit_breaker=circuit_breakers,
+                       rate_limiter=hathi_rate,
+                       cache_ttl=ONE_DAY,
+                       **retry_policy)
+
+all_apis = (aleph_api, worldcat_api, hathi_api)
+
+# HathiTrust takes many OCLC numbers and bibs in a single request, so
+# we gather up lookups from volumes in flight and send them together.
+hathi_batcher = HathiBatcher(hathi_api)
+
+# Holdings come from the WorldCat API unless we've been pointed at a
+# local holdings index (see use_worldcat_source).
+worldcat_source = worldcat_api
 
 wc_key = environ.get("MDP_REJECT_WC_KEY", "none")
 
+def get_worldcat_json (oclc):
+    return worldcat_source.get(oclc=oclc,
+                               wskey=wc_key,
+                               format="json",
+                               maximumLibraries="50")
+
+def get_hathi_json_via_oclc (oclc):
+    return hathi_batcher.get("oclc", oclc)
+
+def get_hathi_json_via_bib (bib):
+    return hathi_batcher.get("recordnumber", bib)
+
+# Every volume in a multi-volume set shares its OCLC number (and often
+# its bib), so we remember these by key. Volumes that ask for the same
+# key at the same time all wait on a single request.
+worldcat_json_by_oclc = LRUMemo(get_worldcat_json)
+hathi_json_by_oclc = LRUMemo(get_hathi_json_via_oclc)
+hathi_json_by_bib = LRUMemo(get_hathi_json_via_bib)
+
+all_memos = (worldcat_json_by_oclc, hathi_json_by_oclc, hathi_json_by_bib)
+
+# Once we have a volume's MARC record, its WorldCat and HathiTrust
+# requests don't depend on each other, so we send them all at once.
+# These tasks never submit work of their own, so volumes sharing this
+# pool can't deadlock waiting on it. Each volume sends at most three at
+# a time, so we size the pool from the number of volume workers.
+FAN_OUT_PER_VOLUME = 3
+fan_out_workers = 8 * FAN_OUT_PER_VOLUME
+fan_out_pool = ThreadPoolExecutor(max_workers=fan_out_workers)
+
+# This is how long we wait before giving a volume held up by an open
+# circuit another go.
+blocked_volume_retry = try_forever(minutes_between_attempts=1,
+                                   backoff=2,
+                                   max_seconds_between_attempts=60*30,
+                                   jitter=0.5)
+
 class VolumeDataFromBarcode:
 
     barcode = None
     marc = None
     worldcat = None
     oclc_counts = None
+    hathi_bib = None
+    blocked_by = None
 
     def __init__ (self, barcode):
         self.barcode = barcode
+        self.__has_marc = False
+        self.look_up()
 
-        while True:
-            try:
-                self.__get_marc_data()
-                self.__get_oclc_data()
-                break
+    def look_up (self):
+        # When a host's circuit is open, we note it and stop rather than
+        # wait here and tie up whoever is running us. Looking up again
+        # picks up where we left off, so we never refetch MARC.
+        try:
+            self.__get_all_data()
+            self.blocked_by = None
 
-            except ConnectionError:
-                sleep(60*30)
+        except CircuitOpen as error:
+            self.blocked_by = error
+
+        return self
 
     def hathi_title_match_percent (self):
         if self.marc.title is None:
@@ -51,6 +153,13 @@ class VolumeDataFromBarcode:
         else:
             return self.__hathi_bib_data_has_title(self.marc.title)
 
+    def __get_all_data (self):
+        if not self.__has_marc:
+            self.__get_marc_data()
+            self.__has_marc = True
+
+        self.__get_oclc_and_bib_data()
+
     def __get_marc_data (self):
         self.marc = self.__marc_via_internal_barcode()
 
@@ -68,40 +177,122 @@ class VolumeDataFromBarcode:
                         id="mdp." + self.barcode,
                         schema="marcxml"))
 
-    def __get_oclc_data (self):
-        worldcat, hathi = self.__get_json_through_oclc()
+    def __get_oclc_and_bib_data (self):
+        worldcat, hathi, bib = self.__get_all_json_at_once(
+                self.__get_worldcat_json,
+                self.__get_hathi_json_via_oclc,
+                self.__get_hathi_json_via_bib)
 
         self.worldcat = get_worldcat_data_from_json(worldcat)
         self.oclc_counts = get_oclc_counts_from_json(hathi)
+        self.hathi_bib = get_hathi_data_from_json(bib)
 
-    def __get_json_through_oclc (self):
+    def __get_all_json_at_once (self, *getters):
+        futures = [fan_out_pool.submit(get) for get in getters]
+        return [future.result() for future in futures]
+
+    def __get_worldcat_json (self):
         if self.marc.oclc is None:
-            return None, None
+            return None
 
         else:
-            return self.__get_worldcat_json(), \
-                    self.__get_hathi_json_via_oclc()
-
-    def __get_worldcat_json (self):
-        return worldcat_api.get(
-                oclc=self.marc.oclc,
-                wskey=wc_key,
-                format="json",
-                maximumLibraries="50")
+            return worldcat_json_by_oclc(self.marc.oclc)
 
     def __get_hathi_json_via_oclc (self):
-        return hathi_oclc_api.get(oclc=self.marc.oclc)
+        if self.marc.oclc is None:
+            return None
 
-    def __hathi_bib_data_has_title (self, title):
-        hathi_json = self.__get_hathi_json_via_bib()
-        hathi_data = get_hathi_data_from_json(hathi_json)
+        else:
+            return hathi_json_by_oclc(self.marc.oclc)
 
+    def __hathi_bib_data_has_title (self, title):
         return "{:.1f}".format(
-                100 * (1 - hathi_data.min_title_distance(title)))
+                100 * (1 - self.hathi_bib.min_title_distance(title)))
 
     def __get_hathi_json_via_bib (self):
         if self.marc.bib is None:
             return None
 
         else:
-            return hathi_bib_api.get(bib=self.marc.bib)
+            return hathi_json_by_bib(self.marc.bib)
+
+def clear_memos ():
+    for memo in all_memos:
+        memo.clear()
+
+def use_worldcat_source (source):
+    global worldcat_source
+    worldcat_source = source
+    worldcat_json_by_oclc.clear()
+
+def use_url_opener (opener):
+    for api in all_apis:
+        api.url_opener = opener
+
+def use_response_cache (cache):
+    for api in all_apis:
+        api.cache = cache
+
+def use_fan_out_for (volume_workers):
+    # Volumes already running keep the pool they have; once nothing is
+    # using it, its threads go away on their own.
+    global fan_out_pool, fan_out_workers
+    workers = volume_workers * FAN_OUT_PER_VOLUME
+
+    if workers != fan_out_workers:
+        fan_out_pool = ThreadPoolExecutor(max_workers=workers)
+        fan_out_workers = workers
+
+class VolumeLookups:
+
+    def __init__ (self, pool, barcodes):
+        self.pool = pool
+        self.futures = [pool.submit(VolumeDataFromBarcode, b)
+                        for b in barcodes]
+
+    def __iter__ (self):
+        for i in range(len(self.futures)):
+            yield self.__wait_until_unblocked(i)
+            self.futures[i] = None
+
+    def __repr__ (self):
+        return "<{} {:d}>".format(self.__class__.__name__,
+                                  len(self.futures))
+
+    def __wait_until_unblocked (self, i):
+        # Volumes held up by an open circuit wait here, in the thread
+        # collecting results, and then go back in the pool's queue, so
+        # no worker sleeps while other hosts' work is waiting.
+        schedule = blocked_volume_retry.schedule()
+        volume = self.futures[i].result()
+
+        while volume.blocked_by is not None:
+            sleep(schedule.next_delay(volume.blocked_by))
+            self.__requeue_blocked_volumes(i)
+            volume = self.futures[i].result()
+
+        return volume
+
+    def __requeue_blocked_volumes (self, start):
+        # The circuit that held up this volume has likely held up later
+        # ones too, so they all get another go together.
+        for j in range(start, len(self.futures)):
+            volume = self.__blocked_volume(self.futures[j])
+
+            if volume is not None:
+                self.futures[j] = self.pool.submit(volume.look_up)
+
+    def __blocked_volume (self, future):
+        if future.done() and future.exception() is None:
+            volume = future.result()
+
+            if volume.blocked_by is not None:
+                return volume
+
+        return None
+
+def get_volume_data_in_order (barcodes, max_workers = 8):
+    use_fan_out_for(max_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from VolumeLookups(pool, barcodes)
@@ -0,0 +1,35 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import asyncio
+
+def run (coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+
+    finally:
+        loop.close()
+
+async def get_all (api, count, timeout = None):
+    return await asyncio.wait_for(
+            asyncio.gather(*(api.get(x=str(i)) for i in range(count))),
+            timeout)
+
+class AsyncOpenerErrorFake:
+
+    def __init__ (self, failure_count, error = ConnectionError):
+        self.failures_remaining = failure_count
+        self.error = error
+        self.calls = 0
+
+    async def __call__ (self, uri):
+        self.calls += 1
+
+        if self.failures_remaining > 0:
+            self.failures_remaining -= 1
+            raise self.error
+
+        else:
+            return b"finally"
@@ -0,0 +1,133 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from json import dumps as json_dump_str, loads as json_load_str
+from os.path import join, dirname
+from re import compile as re_compile
+from threading import Lock
+from time import sleep
+from urllib.parse import urlsplit
+
+from .. import reject_list
+from ..uri.rate_limiter import NoRateLimit
+
+class CatalogResponseStub:
+
+    def __init__ (self, output_data):
+        self.output_data = output_data
+
+    def read (self, *args, **kwargs):
+        return self.output_data
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        pass
+
+class CatalogFake:
+
+    routes = (
+        (re_compile(r"bc2meta\?.*id=(?:mdp\.)?([0-9]+)"), "{}.xml"),
+        (re_compile(r"/libraries/([0-9]+)"), "worldcat-{}.json"),
+    )
+
+    re_hathi_ids = re_compile(r"/brief/json/(.*)$")
+
+    hathi_files = {
+        "oclc": "hathitrust-{}.json",
+        "recordnumber": "bib-{}.json",
+    }
+
+    def __init__ (self, delay = 0):
+        self.delay = delay
+        self.uris = [ ]
+        self.in_flight = { }
+        self.max_in_flight = { }
+        self.max_total_in_flight = 0
+        self.__lock = Lock()
+
+    def __call__ (self, uri):
+        self.__start(uri)
+
+        try:
+            sleep(self.delay)
+            return CatalogResponseStub(self.__read_file_for(uri))
+
+        finally:
+            self.__finish(uri)
+
+    def count (self, fragment):
+        return len([u for u in self.uris if fragment in u])
+
+    def most_in_flight_at_once (self):
+        return max([0] + list(self.max_in_flight.values()))
+
+    def __start (self, uri):
+        host = urlsplit(uri).netloc
+
+        with self.__lock:
+            self.uris.append(uri)
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(
+                    self.max_in_flight.get(host, 0), self.in_flight[host])
+            self.max_total_in_flight = max(self.max_total_in_flight,
+                                           sum(self.in_flight.values()))
+
+    def __finish (self, uri):
+        host = urlsplit(uri).netloc
+
+        with self.__lock:
+            self.in_flight[host] -= 1
+
+    def __read_file_for (self, uri):
+        match = self.re_hathi_ids.search(uri)
+        if match:
+            return self.__combine_hathi_files(match.group(1).split("|"))
+
+        for regex, format_str in self.routes:
+            match = regex.search(uri)
+
+            if match:
+                return self.__read_file(format_str.format(match.group(1)))
+
+        return ""
+
+    def __combine_hathi_files (self, ids):
+        result = { }
+        for hathi_id in ids:
+            id_type, id_value = hathi_id.split(":")
+            filename = self.hathi_files[id_type].format(id_value)
+            result[hathi_id] = json_load_str(self.__read_file(filename)
+                                             or "{}")
+
+        return json_dump_str(result)
+
+    def __read_file (self, filename):
+        try:
+            with open(join(dirname(__file__), "files", filename)) as f:
+                return f.read()
+
+        except OSError:
+            return ""
+
+class UsingCatalogFake:
+
+    queriers = ("aleph_api", "worldcat_api", "hathi_api")
+
+    def use_catalog_fake (self, catalog):
+        self.catalog = catalog
+        reject_list.clear_memos()
+        self.originals = { }
+
+        for name in self.queriers:
+            api = getattr(reject_list, name)
+            self.originals[name] = api.url_opener, api.rate_limiter
+            api.url_opener = catalog
+            api.rate_limiter = NoRateLimit()
+
+    def tearDown (self):
+        for name, (opener, rate_limiter) in self.originals.items():
+            api = getattr(reject_list, name)
+            api.url_opener = opener
+            api.rate_limiter = rate_limiter
@@ -0,0 +1,143 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from threading import current_thread
+from urllib.error import HTTPError
+import unittest
+
+from ...bench.http_server import StandInHTTPServer
+from ..uri import URI, ResponseCache
+
+try:
+    from ..uri.async_api_querier import AsyncAPIQuerier, AsyncHostLimiter
+    from .async_helpers import AsyncOpenerErrorFake, get_all, run
+
+except (ImportError, SyntaxError):
+    # Anything older than Python 3.5 can't even parse async def.
+    AsyncAPIQuerier = None
+
+def echo_path (path):
+    if path.startswith("/moved"):
+        return 302, (("Location", "/echo" + path[6:]),), b""
+
+    elif path.startswith("/missing"):
+        return 404, (), b"not here"
+
+    else:
+        return path
+
+class ThreadRecordingCache (ResponseCache):
+
+    def __init__ (self):
+        super().__init__()
+        self.threads = [ ]
+
+    def get (self, uri, ttl = None):
+        self.threads.append(current_thread())
+        return super().get(uri, ttl)
+
+    def set (self, uri, response):
+        self.threads.append(current_thread())
+        super().set(uri, response)
+
+@unittest.skipIf(AsyncAPIQuerier is None, "async def needs Python 3.5")
+class GivenStandInServer (unittest.TestCase):
+
+    def setUp (self):
+        self.server = StandInHTTPServer(echo_path).__enter__()
+
+    def tearDown (self):
+        self.server.__exit__(None, None, None)
+
+    def new_api (self, path, **kwargs):
+        return AsyncAPIQuerier(URI(self.server.base_uri + path),
+                               **kwargs)
+
+    def test_get_returns_an_awaitable (self):
+        api = self.new_api("/hello")
+        assert_that(run(api.get()), is_(equal_to("/hello")))
+
+    def test_kwargs_build_the_uri (self):
+        api = self.new_api("/{x}.json")
+        assert_that(run(api.get(x="a", y="b c")),
+                    is_(equal_to("/a.json?y=b+c")))
+
+    def test_many_lookups_run_on_one_loop (self):
+        self.server.latency = 0.05
+        api = self.new_api("/{x}")
+
+        results = run(get_all(api, 50, timeout=2))
+        assert_that(results, is_(equal_to(["/" + str(i)
+                                           for i in range(50)])))
+
+    def test_host_limit_bounds_requests_in_flight (self):
+        self.server.latency = 0.05
+        api = self.new_api("/{x}", host_limiter=AsyncHostLimiter(2))
+        run(get_all(api, 6))
+
+        assert_that(self.server.paths, has_length(6))
+        assert_that(self.server.most_in_flight, is_(equal_to(2)))
+
+    def test_requests_overlap_without_a_host_limit (self):
+        self.server.latency = 0.05
+        run(get_all(self.new_api("/{x}"), 6))
+        assert_that(self.server.most_in_flight, is_(greater_than(2)))
+
+    def test_redirects_are_followed (self):
+        api = self.new_api("/moved/there")
+        assert_that(run(api.get()), is_(equal_to("/echo/there")))
+
+    def test_error_statuses_raise_http_errors (self):
+        api = self.new_api("/missing")
+        assert_that(calling(run).with_args(api.get()),
+                    raises(HTTPError))
+
+    def test_responses_can_be_cached (self):
+        cache = ResponseCache()
+        api = self.new_api("/hello", cache=cache)
+        run(api.get())
+        run(api.get())
+
+        assert_that(self.server.paths, has_length(1))
+        assert_that(cache.hits, is_(equal_to(1)))
+
+    def test_cache_is_used_off_the_event_loop (self):
+        cache = ThreadRecordingCache()
+        run(self.new_api("/hello", cache=cache).get())
+
+        assert_that(cache.threads, has_length(2))
+        assert_that(cache.threads, is_not(has_item(current_thread())))
+
+@unittest.skipIf(AsyncAPIQuerier is None, "async def needs Python 3.5")
+class AsyncRetryTest (unittest.TestCase):
+
+    def new_api (self, fake, **kwargs):
+        return AsyncAPIQuerier(URI(), url_opener=fake, sleep_time=0.001,
+                               **kwargs)
+
+    def test_connection_errors_are_retried (self):
+        fake = AsyncOpenerErrorFake(3)
+        assert_that(run(self.new_api(fake).get()),
+                    is_(equal_to("finally")))
+        assert_that(fake.calls, is_(equal_to(4)))
+
+    def test_silent_failure_after_max (self):
+        fake = AsyncOpenerErrorFake(5)
+        assert_that(run(self.new_api(fake, max_tries=3).get()),
+                    is_(equal_to("")))
+        assert_that(fake.calls, is_(equal_to(3)))
+
+    def test_other_errors_are_raised (self):
+        fake = AsyncOpenerErrorFake(1, KeyError)
+        assert_that(calling(run).with_args(self.new_api(fake).get()),
+                    raises(KeyError))
+
+    def test_unreachable_host_is_a_connection_error (self):
+        server = StandInHTTPServer(echo_path)
+        port = server.server_address[1]
+        server.server_close()
+
+        api = AsyncAPIQuerier(URI("http://127.0.0.1:{:d}/".format(port)),
+                              sleep_time=0.001, max_tries=2)
+        assert_that(run(api.get()), is_(equal_to("")))
@@ -0,0 +1,166 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from urllib.error import HTTPError
+import unittest
+
+from .test_uris import UrlopenerErrorFake
+from ..uri import URI, APIQuerier
+from ..uri import CircuitBreaker, CircuitBreakers, CircuitOpen
+
+class FakeClock:
+
+    def __init__ (self):
+        self.now = 1000.0
+
+    def __call__ (self):
+        return self.now
+
+def fail (breaker):
+    with breaker:
+        raise ConnectionError
+
+def http_error (code):
+    return HTTPError("http://a.edu/", code, "error", { }, None)
+
+def fail_with (breaker, error):
+    with breaker:
+        raise error
+
+def succeed (breaker):
+    with breaker:
+        pass
+
+class GivenClosedBreaker (unittest.TestCase):
+
+    def setUp (self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3,
+                                      cool_down=60,
+                                      clock=self.clock)
+
+    def fail_times (self, n):
+        for i in range(n):
+            assert_that(calling(fail).with_args(self.breaker),
+                        raises(ConnectionError))
+
+    def test_starts_closed (self):
+        assert_that(self.breaker.state,
+                    is_(equal_to(CircuitBreaker.CLOSED)))
+
+    def test_stays_closed_below_the_threshold (self):
+        self.fail_times(2)
+        succeed(self.breaker)
+
+    def test_success_resets_the_failure_count (self):
+        self.fail_times(2)
+        succeed(self.breaker)
+        self.fail_times(2)
+        assert_that(self.breaker.state,
+                    is_(equal_to(CircuitBreaker.CLOSED)))
+
+    def test_other_errors_are_not_failures (self):
+        for i in range(5):
+            with self.assertRaises(KeyError):
+                with self.breaker:
+                    raise KeyError
+
+        assert_that(self.breaker.failures, is_(equal_to(0)))
+
+    def test_server_errors_are_failures (self):
+        for code in (500, 503, 429):
+            assert_that(calling(fail_with).with_args(self.breaker,
+                                                     http_error(code)),
+                        raises(HTTPError))
+
+        assert_that(self.breaker.state,
+                    is_(equal_to(CircuitBreaker.OPEN)))
+
+    def test_client_errors_are_not_failures (self):
+        assert_that(calling(fail_with).with_args(self.breaker,
+                                                 http_error(404)),
+                    raises(HTTPError))
+        assert_that(self.breaker.failures, is_(equal_to(0)))
+
+    def test_opens_at_the_threshold (self):
+        self.fail_times(3)
+        assert_that(self.breaker.state,
+                    is_(equal_to(CircuitBreaker.OPEN)))
+        assert_that(calling(succeed).with_args(self.breaker),
+                    raises(CircuitOpen))
+
+    def test_half_opens_after_cooling_down (self):
+        self.fail_times(3)
+        self.clock.now += 60
+        succeed(self.breaker)
+        assert_that(self.breaker.state,
+                    is_(equal_to(CircuitBreaker.CLOSED)))
+
+    def test_only_one_probe_at_a_time (self):
+        self.fail_times(3)
+        self.clock.now += 60
+
+        with self.breaker:
+            assert_that(calling(succeed).with_args(self.breaker),
+                        raises(CircuitOpen))
+
+    def test_failed_probe_opens_it_again (self):
+        self.fail_times(3)
+        self.clock.now += 60
+        self.fail_times(1)
+        self.clock.now += 30
+        assert_that(calling(succeed).with_args(self.breaker),
+                    raises(CircuitOpen))
+
+class BreakerRegistryTest (unittest.TestCase):
+
+    def test_one_breaker_per_host (self):
+        breakers = CircuitBreakers()
+        assert_that(breakers("http://a.edu/one"),
+                    is_(same_instance(breakers("http://a.edu/two"))))
+        assert_that(breakers("http://a.edu/one"),
+                    is_not(same_instance(breakers("http://b.edu/"))))
+
+class APIQuerierBreakerTest (unittest.TestCase):
+
+    def setUp (self):
+        self.breakers = CircuitBreakers(failure_threshold=3,
+                                        cool_down=60)
+        self.fake = UrlopenerErrorFake(100, ConnectionError)
+
+    def new_api (self, uri):
+        return APIQuerier(URI(uri), url_opener=self.fake,
+                          sleep_time=0.001,
+                          circuit_breaker=self.breakers)
+
+    def test_open_circuit_is_raised_to_the_caller (self):
+        api = self.new_api("http://a.edu/x")
+        assert_that(calling(api.get), raises(CircuitOpen))
+        assert_that(self.fake.failures_remaining, is_(equal_to(97)))
+
+    def test_queriers_for_one_host_share_a_breaker (self):
+        assert_that(calling(self.new_api("http://a.edu/x").get),
+                    raises(CircuitOpen))
+        assert_that(calling(self.new_api("http://a.edu/y").get),
+                    raises(CircuitOpen))
+        assert_that(self.fake.failures_remaining, is_(equal_to(97)))
+
+    def test_other_hosts_are_unaffected (self):
+        self.fake.failures_remaining = 3
+        assert_that(calling(self.new_api("http://a.edu/").get),
+                    raises(CircuitOpen))
+        assert_that(self.new_api("http://b.edu/").get(),
+                    is_(equal_to("")))
+
+    def test_server_errors_open_the_circuit (self):
+        self.fake.error = http_error(503)
+        assert_that(calling(self.new_api("http://a.edu/x").get),
+                    raises(CircuitOpen))
+        assert_that(self.fake.failures_remaining, is_(equal_to(97)))
+
+    def test_client_errors_are_raised_right_away (self):
+        self.fake.error = http_error(404)
+        assert_that(calling(self.new_api("http://a.edu/x").get),
+                    raises(HTTPError))
+        assert_that(self.fake.failures_remaining, is_(equal_to(99)))
@@ -137,3 +137,11 @@ class TestAstroJsonRecordData (GivenAstroJson, HathiFileTest):
         title = "Abtronomical tables : manuscript, [17th century?]."
         assert_that(self.data.min_title_distance(title),
                     all_of(greater_than(0), less_than(0.5)))
+
+    def test_many_titles_can_be_matched_at_once (self):
+        distances = self.data.min_title_distances((
+                "Astronomical tables : manuscript, [17th century?].",
+                "hey sup"))
+
+        assert_that(distances[0], is_(less_than(.001)))
+        assert_that(distances[1], is_(greater_than(0.5)))
@@ -0,0 +1,159 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from json import dumps as json_dump_str, loads as json_load_str
+import unittest
+
+from ...test.read_example_file import ExampleFileTest
+from ..hathi import HathiBatcher, split_hathi_json_by_id
+from ..uri import URI, APIQuerier, ResponseCache
+from ..uri.response_cache import NoCache
+
+class QuerierFake:
+
+    uri = URI("http://hathi.test/brief/json/{ids}")
+    cache = NoCache()
+    cache_ttl = None
+
+class MultiIDQuerierFake (QuerierFake):
+
+    def __init__ (self, records_by_id):
+        self.records_by_id = records_by_id
+        self.requests = [ ]
+
+    def get_uncached (self, ids):
+        self.requests.append(ids.split("|"))
+        return json_dump_str(dict((i, self.records_by_id.get(i, { }))
+                                  for i in ids.split("|")))
+
+class FailingQuerierStub (QuerierFake):
+
+    def get_uncached (self, ids):
+        return ""
+
+class BatchOpenerStub:
+
+    def __call__ (self, uri):
+        return BytesIO(json_dump_str({ }).encode("utf_8"))
+
+class GivenAstroMultiJson (ExampleFileTest):
+    this__file__ = __file__
+    filename = "hathitrust-706055947.json"
+
+    def setUp (self):
+        super().setUp()
+        self.record = json_load_str(self.file_data)
+        self.multi_json = json_dump_str({"oclc:706055947": self.record})
+
+    def test_each_id_gets_its_own_json (self):
+        split = split_hathi_json_by_id(self.multi_json,
+                                       ["oclc:706055947"])
+        assert_that(json_load_str(split["oclc:706055947"]),
+                    is_(equal_to(self.record)))
+
+    def test_missing_ids_get_empty_json (self):
+        split = split_hathi_json_by_id(self.multi_json, ["oclc:1"])
+        assert_that(split["oclc:1"], is_(equal_to("{}")))
+
+    def test_failed_request_fails_every_id (self):
+        split = split_hathi_json_by_id("", ["oclc:1", "oclc:2"])
+        assert_that(split, is_(equal_to({"oclc:1": "", "oclc:2": ""})))
+
+    def test_batcher_yields_hathi_data (self):
+        batcher = HathiBatcher(MultiIDQuerierFake(
+                {"oclc:706055947": self.record}), max_wait=0)
+        data = batcher.get_hathi_data("oclc", "706055947")
+        assert_that(data.htids, is_(equal_to(["mdp.39015081447313"])))
+
+class GivenBatcherOfFour (unittest.TestCase):
+
+    def setUp (self):
+        self.api = MultiIDQuerierFake({"oclc:1": {"items": [ ]}})
+        self.batcher = HathiBatcher(self.api, chunk_size=4,
+                                    max_wait=0.01)
+
+    def test_lone_lookup_is_sent_after_waiting (self):
+        result = self.batcher.get("oclc", "1")
+        assert_that(json_load_str(result), is_(equal_to({"items": [ ]})))
+        assert_that(self.api.requests, is_(equal_to([["oclc:1"]])))
+
+    def test_concurrent_lookups_share_requests (self):
+        self.batcher.max_wait = 5
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: self.batcher.get("oclc", i),
+                          range(8)))
+
+        assert_that(self.api.requests, has_length(2))
+        assert_that(self.api.requests, only_contains(has_length(4)))
+
+    def test_failed_request_yields_empty_str (self):
+        batcher = HathiBatcher(FailingQuerierStub(), max_wait=0)
+        assert_that(batcher.get("oclc", "1"), is_(equal_to("")))
+
+    def test_chunk_size_is_capped_at_the_api_limit (self):
+        batcher = HathiBatcher(self.api, chunk_size=100)
+        assert_that(batcher.chunk_size, is_(equal_to(20)))
+
+    def test_ids_in_a_batch_are_sorted (self):
+        self.batcher.max_wait = 5
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: self.batcher.get("oclc", i),
+                          ("4", "2", "3", "1")))
+
+        assert_that(self.api.requests, is_(equal_to(
+                [["oclc:1", "oclc:2", "oclc:3", "oclc:4"]])))
+
+class GivenBatcherWithCache (unittest.TestCase):
+
+    def setUp (self):
+        self.api = MultiIDQuerierFake({"oclc:1": {"items": [ ]}})
+        self.api.cache = ResponseCache()
+        self.batcher = HathiBatcher(self.api, chunk_size=4, max_wait=5)
+
+    def get_all (self, ids):
+        with ThreadPoolExecutor(max_workers=len(ids)) as pool:
+            return list(pool.map(lambda i: self.batcher.get("oclc", i),
+                                 ids))
+
+    def test_each_id_is_cached_on_its_own (self):
+        self.get_all(("1", "2", "3", "4"))
+        assert_that(self.api.cache.get(
+                        "http://hathi.test/brief/json/oclc:1"),
+                    is_(equal_to(json_dump_str({"items": [ ]}))))
+
+    def test_cached_ids_send_no_requests (self):
+        first = self.get_all(("1", "2", "3", "4"))
+        self.api.requests = [ ]
+
+        assert_that(self.get_all(("3", "1", "4", "2")),
+                    is_(equal_to([first[2], first[0], first[3],
+                                  first[1]])))
+        assert_that(self.api.requests, is_(empty()))
+
+    def test_only_uncached_ids_are_sent (self):
+        self.get_all(("1", "2", "3", "4"))
+        self.api.requests = [ ]
+        self.batcher.max_wait = 0.01
+
+        self.get_all(("1", "5"))
+        assert_that(self.api.requests, is_(equal_to([["oclc:5"]])))
+
+    def test_batch_uris_are_not_cached (self):
+        api = APIQuerier(QuerierFake.uri, url_opener=BatchOpenerStub(),
+                         cache=ResponseCache())
+        batcher = HathiBatcher(api, chunk_size=2, max_wait=5)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda i: batcher.get("oclc", i), ("1", "2")))
+
+        assert_that(api.cache, has_length(2))
+        assert_that(api.cache.misses, is_(equal_to(2)))
+
+    def test_failed_requests_are_not_cached (self):
+        api = FailingQuerierStub()
+        api.cache = ResponseCache()
+        HathiBatcher(api, max_wait=0).get("oclc", "1")
+        assert_that(api.cache, has_length(0))
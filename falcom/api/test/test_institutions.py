@@ -0,0 +1,73 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+import unittest
+
+from ...test.read_example_file import ExampleFileTest
+from ..worldcat import HoldingCounts, InstitutionClassifier, \
+        get_worldcat_data_from_json
+from ..worldcat.institutions import CIC_INSTITUTIONS, \
+        HATHI_INSTITUTIONS, UM_INSTITUTIONS
+
+def count_one_at_a_time (holdings):
+    counts = [0, 0, 0, 0]
+
+    for code in holdings:
+        if code in HATHI_INSTITUTIONS:
+            counts[0] += 1
+        elif code in UM_INSTITUTIONS:
+            counts[1] += 1
+        elif code in CIC_INSTITUTIONS:
+            counts[2] += 1
+        else:
+            counts[3] += 1
+
+    return HoldingCounts(*counts)
+
+class InstitutionClassifierTest (unittest.TestCase):
+
+    def setUp (self):
+        self.classifier = InstitutionClassifier()
+
+    def test_symbols_fall_into_their_groups (self):
+        assert_that(self.classifier.category("HATHI"),
+                    is_(equal_to(InstitutionClassifier.HATHI)))
+        assert_that(self.classifier.category("EYM"),
+                    is_(equal_to(InstitutionClassifier.UM)))
+        assert_that(self.classifier.category("IUB"),
+                    is_(equal_to(InstitutionClassifier.CIC)))
+        assert_that(self.classifier.category("ZZZ"),
+                    is_(equal_to(InstitutionClassifier.OTHER)))
+
+    def test_counts_match_checking_each_set_in_turn (self):
+        holdings = ["HATHI", "EYM", "BEU", "IUB", "MNU", "ZZZ", "QQQ",
+                    "QQQ", "OSU"]
+
+        assert_that(self.classifier.count(holdings), is_(equal_to(
+                count_one_at_a_time(holdings))))
+
+    def test_empty_holdings_count_nothing (self):
+        assert_that(self.classifier.count(()),
+                    is_(equal_to(HoldingCounts(0, 0, 0, 0))))
+
+    def test_many_holdings_lists_at_once (self):
+        counts = self.classifier.count_many([["EYM"], ["ZZZ", "IUB"]])
+        assert_that(counts, is_(equal_to([HoldingCounts(0, 1, 0, 0),
+                                          HoldingCounts(0, 0, 1, 1)])))
+
+    def test_earlier_groups_win_a_shared_symbol (self):
+        classifier = InstitutionClassifier(((0, {"A", "B"}), (1, {"B"})))
+        assert_that(classifier.count(["A", "B", "C"]),
+                    is_(equal_to(HoldingCounts(2, 0, 0, 1))))
+
+class GivenWorldcatHoldings (ExampleFileTest):
+    this__file__ = __file__
+    filename = "worldcat-009651208.json"
+
+    def test_worldcat_data_can_be_counted (self):
+        data = get_worldcat_data_from_json(self.file_data)
+        counts = InstitutionClassifier().count(data)
+
+        assert_that(sum(counts), is_(equal_to(len(list(data)))))
+        assert_that(counts, is_(equal_to(count_one_at_a_time(data))))
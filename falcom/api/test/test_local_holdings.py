@@ -0,0 +1,111 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from json import dumps as json_dump_str
+from os.path import join
+from tempfile import TemporaryDirectory
+import unittest
+
+from .catalog_fake import CatalogFake, UsingCatalogFake
+from .. import reject_list
+from ..reject_list import VolumeDataFromBarcode
+from ..worldcat import LocalHoldings, get_worldcat_data_from_json
+
+ASTRO = "39015081447313"
+
+class GivenHoldingsExports (unittest.TestCase):
+
+    def setUp (self):
+        self.tmp = TemporaryDirectory()
+        self.holdings = None
+
+    def tearDown (self):
+        if self.holdings is not None:
+            self.holdings.close()
+
+        self.tmp.cleanup()
+
+    def write_export (self, name, lines):
+        path = join(self.tmp.name, name)
+
+        with open(path, "w") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+        return path
+
+    def build (self, *paths):
+        self.holdings = LocalHoldings.build(join(self.tmp.name, "index"),
+                                            *paths)
+        return self.holdings
+
+    def libraries_for (self, oclc):
+        return list(get_worldcat_data_from_json(self.holdings.get(oclc)))
+
+    def test_tsv_lines_give_symbols_by_oclc (self):
+        self.build(self.write_export("h.tsv", ["123\tEYM\tIUB",
+                                               "456\tHATHI"]))
+
+        assert_that(self.libraries_for("123"),
+                    is_(equal_to(["EYM", "IUB"])))
+        assert_that(self.libraries_for("456"), is_(equal_to(["HATHI"])))
+
+    def test_padded_and_unpadded_numbers_meet (self):
+        self.build(self.write_export("h.tsv", ["123\tEYM"]))
+        assert_that(self.libraries_for("000000123"),
+                    is_(equal_to(["EYM"])))
+
+    def test_scattered_lines_for_one_oclc_are_merged (self):
+        self.build(self.write_export("h.tsv", ["1\tA", "2\tB", "1\tC",
+                                               "1\tA"]))
+        assert_that(self.libraries_for("1"), is_(equal_to(["A", "C"])))
+
+    def test_json_lines_can_carry_titles (self):
+        line = json_dump_str({"oclc": "9", "title": "T",
+                              "symbols": ["EYM"]})
+        self.build(self.write_export("h.jsonl", [line]))
+
+        data = get_worldcat_data_from_json(self.holdings.get(oclc="9"))
+        assert_that(data.title, is_(equal_to("T")))
+        assert_that(list(data), is_(equal_to(["EYM"])))
+
+    def test_there_is_no_limit_of_fifty_libraries (self):
+        symbols = ["S{:d}".format(i) for i in range(120)]
+        self.build(self.write_export("h.tsv", ["5\t" + "\t".join(symbols)]))
+        assert_that(self.libraries_for("5"), has_length(120))
+
+    def test_unknown_numbers_give_nothing (self):
+        self.build(self.write_export("h.tsv", ["1\tA"]))
+
+        assert_that(self.holdings.get(oclc="2"), is_(equal_to("")))
+        assert_that(self.holdings.get(), is_(equal_to("")))
+        assert_that("2" in self.holdings, is_(equal_to(False)))
+
+class GivenLocalHoldingsForRejectList (UsingCatalogFake, unittest.TestCase):
+
+    def setUp (self):
+        self.use_catalog_fake(CatalogFake())
+        self.tmp = TemporaryDirectory()
+
+        export = join(self.tmp.name, "holdings.tsv")
+        with open(export, "w") as f:
+            f.write("706055947\tEYM\tIUB\tZZZ\n")
+
+        self.holdings = LocalHoldings.build(join(self.tmp.name, "index"),
+                                            export)
+        reject_list.use_worldcat_source(self.holdings)
+
+    def tearDown (self):
+        reject_list.use_worldcat_source(reject_list.worldcat_api)
+        self.holdings.close()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_holdings_come_from_the_local_index (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(list(data.worldcat), is_(equal_to(["EYM", "IUB",
+                                                       "ZZZ"])))
+
+    def test_worldcat_is_never_asked (self):
+        VolumeDataFromBarcode(ASTRO)
+        assert_that(self.catalog.count("/libraries/"), is_(equal_to(0)))
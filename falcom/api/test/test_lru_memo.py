@@ -0,0 +1,106 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+import unittest
+
+from ..common import LRUMemo
+
+class CountingFunction:
+
+    def __init__ (self, gate = None):
+        self.calls = [ ]
+        self.gate = gate
+
+    def __call__ (self, key):
+        self.calls.append(key)
+
+        if self.gate is not None:
+            self.gate.wait(5)
+
+        return "value for {}".format(key)
+
+class FailingFunction:
+
+    def __init__ (self):
+        self.calls = 0
+
+    def __call__ (self, key):
+        self.calls += 1
+        raise ConnectionError
+
+class GivenMemoOfCountingFunction (unittest.TestCase):
+
+    def setUp (self):
+        self.func = CountingFunction()
+        self.memo = LRUMemo(self.func, max_entries=2)
+
+    def test_returns_the_function_result (self):
+        assert_that(self.memo("a"), is_(equal_to("value for a")))
+
+    def test_repeated_keys_call_the_function_once (self):
+        for i in range(5):
+            self.memo("a")
+
+        assert_that(self.func.calls, is_(equal_to(["a"])))
+        assert_that(self.memo.hits, is_(equal_to(4)))
+        assert_that(self.memo.misses, is_(equal_to(1)))
+
+    def test_least_recently_used_key_is_forgotten (self):
+        self.memo("a")
+        self.memo("b")
+        self.memo("a")
+        self.memo("c")
+        self.memo("a")
+        self.memo("b")
+
+        assert_that(self.func.calls,
+                    is_(equal_to(["a", "b", "c", "b"])))
+
+    def test_clear_forgets_everything (self):
+        self.memo("a")
+        self.memo.clear()
+        self.memo("a")
+
+        assert_that(self.memo, has_length(1))
+        assert_that(self.func.calls, is_(equal_to(["a", "a"])))
+
+class GivenMemoOfSlowFunction (unittest.TestCase):
+
+    def setUp (self):
+        self.gate = Event()
+        self.func = CountingFunction(self.gate)
+        self.memo = LRUMemo(self.func)
+
+    def test_concurrent_requests_for_a_key_share_one_call (self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(self.memo, "a") for i in range(8)]
+            self.gate.set()
+            results = [f.result() for f in futures]
+
+        assert_that(self.func.calls, is_(equal_to(["a"])))
+        assert_that(set(results), is_(equal_to({"value for a"})))
+
+class GivenMemoOfFailingFunction (unittest.TestCase):
+
+    def setUp (self):
+        self.func = FailingFunction()
+        self.memo = LRUMemo(self.func)
+
+    def test_errors_are_raised (self):
+        assert_that(calling(self.memo).with_args("a"),
+                    raises(ConnectionError))
+
+    def test_errors_are_not_remembered (self):
+        for i in range(3):
+            assert_that(calling(self.memo).with_args("a"),
+                        raises(ConnectionError))
+
+        assert_that(self.func.calls, is_(equal_to(3)))
+
+    def test_empty_results_are_not_remembered (self):
+        memo = LRUMemo(lambda key: "")
+        memo("a")
+        assert_that(memo, has_length(0))
@@ -8,6 +8,7 @@ import xml.etree.ElementTree as ET
 from ...test.hamcrest import HasAttrs, evaluates_to
 from ...test.read_example_file import ExampleFileTest
 from ..marc import get_marc_data_from_xml
+from ..marc.mapping import MARCMapping
 
 def has_marc_attrs(**kwargs):
     return HasAttrs("MARC attrs", **kwargs)
@@ -125,3 +126,44 @@ class GivenAuthorInDatafield130 (MarcFileTest):
 
     def test_can_pull_author (self):
         self.assert_yields_marc_data(author="Châtelaine de Vergi.")
+
+class GivenSmallMARCRecord (unittest.TestCase):
+
+    xml = """<record xmlns="http://www.loc.gov/MARC21/slim">
+  <controlfield tag="001">123</controlfield>
+  <datafield tag="035">
+    <subfield code="a">first</subfield>
+    <subfield code="z">other</subfield>
+  </datafield>
+  <datafield tag="035">
+    <subfield code="a">second</subfield>
+  </datafield>
+  <datafield tag="245">
+    <subfield code="a">Title</subfield>
+  </datafield>
+</record>"""
+
+    def setUp (self):
+        self.marc = MARCMapping(self.xml)
+
+    def test_controlfields_are_found_by_tag (self):
+        assert_that(list(self.marc["001"]), is_(equal_to(["123"])))
+
+    def test_subfields_keep_document_order (self):
+        assert_that(list(self.marc["035", "a"]),
+                    is_(equal_to(["first", "second"])))
+
+    def test_subfields_belong_to_their_own_tag (self):
+        assert_that(list(self.marc["245", "z"]), is_(equal_to([ ])))
+        assert_that(list(self.marc["035", "z"]),
+                    is_(equal_to(["other"])))
+
+    def test_lookups_are_iterators (self):
+        values = self.marc["035", "a"]
+        assert_that(next(values), is_(equal_to("first")))
+        assert_that(calling(next).with_args(self.marc["999"]),
+                    raises(StopIteration))
+
+    def test_each_lookup_starts_over (self):
+        next(self.marc["035", "a"])
+        assert_that(next(self.marc["035", "a"]), is_(equal_to("first")))
@@ -0,0 +1,172 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from os.path import join, dirname
+from tempfile import TemporaryDirectory
+import unittest
+
+from ..marc import get_marc_data_from_xml
+from ..marc.bulk import BulkMARCExtractor, extract_rows_from_files, \
+        extract_rows_from_slice, marc_data_to_row, marcxml_slices
+
+MARC_XMLNS = "http://www.loc.gov/MARC21/slim"
+
+FILES = join(dirname(__file__), "files")
+
+def read_example_record (barcode):
+    with open(join(FILES, "{}.xml".format(barcode)), "r") as f:
+        return f.read()
+
+class MARCRowTest (unittest.TestCase):
+
+    def test_row_follows_the_extraction_rules (self):
+        data = get_marc_data_from_xml(read_example_record(
+                "39015079130699"))
+
+        assert_that(marc_data_to_row(data), is_(equal_to((
+                "006822264", "", "Isl. Ms. 402", "",
+                "[Calligraphic specimen,", "", "1790", "1791"))))
+
+class GivenDirectoryOfRecords (unittest.TestCase):
+
+    barcodes = ("39015071755826", "39015079130699", "39015081447313")
+
+    def setUp (self):
+        self.tmp = TemporaryDirectory()
+        self.records = [read_example_record(x) for x in self.barcodes]
+
+        for barcode, record in zip(self.barcodes, self.records):
+            with open(join(self.tmp.name, barcode + ".xml"), "w") as f:
+                f.write(record)
+
+        with open(join(self.tmp.name, "collection.marcxml"), "w") as f:
+            f.write("<collection>{}</collection>".format(
+                    "".join(self.records)))
+
+    def tearDown (self):
+        self.tmp.cleanup()
+
+    def write_collection (self, text):
+        path = join(self.tmp.name, "written.marcxml")
+        with open(path, "w") as f:
+            f.write(text)
+
+        return path
+
+    def rows_from_slices (self, path, records_per_slice):
+        rows = [ ]
+        for piece in marcxml_slices(path, records_per_slice):
+            rows.extend(extract_rows_from_slice(piece))
+
+        return rows
+
+    def expected_rows (self):
+        return [marc_data_to_row(get_marc_data_from_xml(x))
+                for x in self.records]
+
+    def rows_from_collection (self, text, chunk_size = 1):
+        extractor = BulkMARCExtractor(jobs=2, chunk_size=chunk_size)
+        return list(extractor.rows_from_sources(
+                [self.write_collection(text)]))
+
+    def test_each_xml_file_is_a_record (self):
+        paths = [join(self.tmp.name, x + ".xml") for x in self.barcodes]
+        assert_that(extract_rows_from_files(paths),
+                    is_(equal_to(self.expected_rows())))
+
+    def test_bad_records_become_empty_rows (self):
+        path = self.write_collection("<nope")
+        assert_that(extract_rows_from_files([path]),
+                    is_(equal_to([("",) * 8])))
+
+    def test_rows_come_back_in_input_order (self):
+        extractor = BulkMARCExtractor(jobs=2, chunk_size=1)
+        rows = list(extractor.rows_from_sources([self.tmp.name] * 5))
+
+        assert_that(rows, is_(equal_to(self.expected_rows() * 5)))
+        assert_that(extractor.records_done, is_(equal_to(15)))
+
+    def test_sources_can_mix_files_and_directories (self):
+        extractor = BulkMARCExtractor(jobs=2, chunk_size=2)
+        path = join(self.tmp.name, "collection.marcxml")
+        rows = list(extractor.rows_from_sources([path, self.tmp.name]))
+
+        assert_that(rows, is_(equal_to(self.expected_rows() * 2)))
+        assert_that(extractor.records_done, is_(equal_to(6)))
+
+    def test_slices_hold_whole_records (self):
+        path = join(self.tmp.name, "collection.marcxml")
+        for size in (1, 2, 3, 4):
+            assert_that(self.rows_from_slices(path, size),
+                        is_(equal_to(self.expected_rows())))
+
+    def test_slices_are_grouped_by_record_count (self):
+        path = join(self.tmp.name, "collection.marcxml")
+        assert_that(list(marcxml_slices(path, 2)), has_length(2))
+
+    def test_collection_namespace_reaches_every_slice (self):
+        records = [x.replace(' xmlns="{}"'.format(MARC_XMLNS), "")
+                   for x in self.records]
+        path = self.write_collection(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<collection xmlns="{}">{}</collection>'.format(
+                        MARC_XMLNS, "".join(records)))
+
+        assert_that(self.rows_from_slices(path, 1),
+                    is_(equal_to(self.expected_rows())))
+
+    def test_prefixed_records_are_found (self):
+        records = [x.replace(' xmlns="{}"'.format(MARC_XMLNS), "")
+                    .replace("<", "<marc:").replace("<marc:/", "</marc:")
+                   for x in self.records]
+        path = self.write_collection(
+                '<marc:collection xmlns:marc="{}">{}</marc:collection>'
+                .format(MARC_XMLNS, "".join(records)))
+
+        assert_that(self.rows_from_slices(path, 2),
+                    is_(equal_to(self.expected_rows())))
+
+    def test_file_of_one_record_is_one_slice (self):
+        path = join(self.tmp.name, self.barcodes[0] + ".xml")
+        assert_that(self.rows_from_slices(path, 5),
+                    is_(equal_to(self.expected_rows()[:1])))
+
+    def test_empty_records_stand_alone (self):
+        records = [self.records[0], '<record xmlns="{}"/>'.format(
+                MARC_XMLNS), self.records[1]]
+        rows = self.rows_from_collection("<collection>{}</collection>"
+                                         .format("".join(records)))
+
+        assert_that(rows, is_(equal_to([self.expected_rows()[0],
+                                         ("",) * 8,
+                                         self.expected_rows()[1]])))
+
+    def test_records_in_comments_and_cdata_are_ignored (self):
+        records = [self.records[0],
+                   "<!-- <record> -->",
+                   self.records[1].replace("</record>",
+                                           "<![CDATA[</record>]]>"
+                                           "</record>"),
+                   self.records[2]]
+        rows = self.rows_from_collection("<collection>{}</collection>"
+                                         .format("".join(records)))
+
+        assert_that(rows, is_(equal_to(self.expected_rows())))
+
+    def test_bad_slices_fall_back_to_reading_the_whole_file (self):
+        records = [self.records[0],
+                   self.records[1].replace("</record>",
+                                           "<?note </record> ?></record>"),
+                   self.records[2]]
+        extractor = BulkMARCExtractor(jobs=2, chunk_size=1)
+        path = self.write_collection("<collection>{}</collection>"
+                                     .format("".join(records)))
+        rows = list(extractor.rows_from_sources([path]))
+
+        assert_that(rows, is_(equal_to(self.expected_rows())))
+        assert_that(extractor.records_done, is_(equal_to(3)))
+
+    def test_empty_file_has_no_slices (self):
+        assert_that(list(marcxml_slices(self.write_collection(""))),
+                    is_(empty()))
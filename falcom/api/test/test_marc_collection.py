@@ -0,0 +1,60 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from io import BytesIO
+from os.path import join, dirname
+import unittest
+
+from ..marc import MARCXMLCollection, get_marc_data_from_xml_collection
+
+def read_example_record (barcode):
+    path = join(dirname(__file__), "files", "{}.xml".format(barcode))
+
+    with open(path, "r") as f:
+        return f.read()
+
+def make_collection (*records):
+    return BytesIO("<collection>{}</collection>".format(
+            "".join(records)).encode("utf-8"))
+
+class GivenCollectionOfThreeRecords (unittest.TestCase):
+
+    barcodes = ("39015079130699", "39015081447313", "39015071755826")
+
+    def setUp (self):
+        self.xml = make_collection(*(read_example_record(x)
+                                     for x in self.barcodes))
+
+    def test_yields_marc_data_in_order (self):
+        bibs = [x.bib for x in get_marc_data_from_xml_collection(self.xml)]
+        assert_that(bibs, is_(equal_to(["006822264", "002601791",
+                                        "002751011"])))
+
+    def test_each_record_is_parsed_like_a_single_record (self):
+        data = list(get_marc_data_from_xml_collection(self.xml))
+        assert_that(data[0].years, is_(equal_to(("1790", "1791"))))
+        assert_that(data[2].oclc, is_(equal_to("009651208")))
+
+    def test_records_are_dropped_once_read (self):
+        records = MARCXMLCollection(self.xml).records()
+        first = next(records)
+        next(records)
+
+        assert_that(list(first), is_(empty()))
+
+class GivenBrokenCollection (unittest.TestCase):
+
+    def setUp (self):
+        self.xml = BytesIO(make_collection(
+                read_example_record("39015079130699")).getvalue()[:-5])
+
+    def test_records_before_the_break_are_still_yielded (self):
+        data = get_marc_data_from_xml_collection(self.xml)
+        assert_that(next(data).bib, is_(equal_to("006822264")))
+
+class GivenEmptyCollection (unittest.TestCase):
+
+    def test_yields_nothing (self):
+        data = get_marc_data_from_xml_collection(make_collection())
+        assert_that(list(data), is_(empty()))
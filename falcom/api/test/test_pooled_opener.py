@@ -0,0 +1,88 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from urllib.error import HTTPError
+import unittest
+
+from ...bench.http_server import StandInHTTPServer
+from ..uri import URI, APIQuerier, PooledURLOpener
+
+def echo_path (path):
+    if path.startswith("/moved"):
+        return 302, (("Location", "/echo" + path[6:]),), b""
+
+    elif path.startswith("/missing"):
+        return 404, (), b"not here"
+
+    else:
+        return path
+
+class GivenStandInServer (unittest.TestCase):
+
+    def setUp (self):
+        self.server = StandInHTTPServer(echo_path).__enter__()
+        self.opener = PooledURLOpener()
+
+    def tearDown (self):
+        self.opener.close()
+        self.server.__exit__(None, None, None)
+
+    def get (self, path):
+        with self.opener(self.server.base_uri + path) as response:
+            return response.read()
+
+    def test_response_has_the_body (self):
+        assert_that(self.get("/hello?a=1"), is_(equal_to(b"/hello?a=1")))
+
+    def test_sequential_requests_share_one_connection (self):
+        for i in range(5):
+            self.get("/hello")
+
+        assert_that(self.server.connections, is_(equal_to(1)))
+        assert_that(self.opener.connections_opened, is_(equal_to(1)))
+        assert_that(self.opener.connections_reused, is_(equal_to(4)))
+
+    def test_finished_connection_waits_in_the_pool (self):
+        self.get("/hello")
+        assert_that(self.opener.idle_connections(), is_(equal_to(1)))
+
+    def test_unread_response_does_not_return_to_the_pool (self):
+        with self.opener(self.server.base_uri + "/hello"):
+            pass
+
+        assert_that(self.opener.idle_connections(), is_(equal_to(0)))
+
+    def test_redirects_are_followed (self):
+        assert_that(self.get("/moved/there"),
+                    is_(equal_to(b"/echo/there")))
+
+    def test_error_statuses_raise_http_errors (self):
+        assert_that(calling(self.get).with_args("/missing"),
+                    raises(HTTPError))
+
+    def test_stale_pooled_connection_is_replaced (self):
+        # The server will close each connection without telling us.
+        self.server.hang_up_quietly = True
+        self.get("/hello")
+
+        assert_that(self.get("/again"), is_(equal_to(b"/again")))
+        assert_that(self.opener.connections_opened, is_(equal_to(2)))
+
+    def test_unreachable_host_raises_connection_error (self):
+        port = self.server.server_address[1]
+        self.server.__exit__(None, None, None)
+        self.server = StandInHTTPServer(echo_path).__enter__()
+
+        opener = PooledURLOpener(timeout=1)
+        assert_that(calling(opener).with_args(
+                        "http://127.0.0.1:{:d}/".format(port)),
+                    raises(ConnectionError))
+
+    def test_api_querier_can_use_the_pool (self):
+        api = APIQuerier(URI(self.server.base_uri + "/{x}"),
+                         url_opener=self.opener)
+
+        assert_that(api.get(x="a"), is_(equal_to("/a")))
+        assert_that(api.get(x="b"), is_(equal_to("/b")))
+        assert_that(self.server.connections, is_(equal_to(1)))
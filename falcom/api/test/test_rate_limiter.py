@@ -0,0 +1,74 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+import unittest
+
+from .test_uris import UrlopenerStub
+from ..uri import URI, APIQuerier, TokenBucket
+
+class FakeClock:
+
+    def __init__ (self):
+        self.now = 1000.0
+        self.sleeps = [ ]
+
+    def __call__ (self):
+        return self.now
+
+    def sleep (self, seconds):
+        self.sleeps.append(seconds)
+
+class GivenTwoPerSecondBucket (unittest.TestCase):
+
+    def setUp (self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, burst=3, clock=self.clock,
+                                  sleep=self.clock.sleep)
+
+    def reserve_times (self, n):
+        return [self.bucket.reserve() for i in range(n)]
+
+    def test_burst_goes_through_at_once (self):
+        assert_that(self.reserve_times(3), is_(equal_to([0, 0, 0])))
+
+    def test_callers_past_the_burst_are_spaced_out (self):
+        self.reserve_times(3)
+        assert_that(self.reserve_times(3),
+                    is_(equal_to([0.5, 1.0, 1.5])))
+
+    def test_tokens_come_back_with_time (self):
+        self.reserve_times(3)
+        self.clock.now += 1
+        assert_that(self.reserve_times(3), is_(equal_to([0, 0, 0.5])))
+
+    def test_tokens_never_exceed_the_burst (self):
+        self.clock.now += 100
+        assert_that(self.reserve_times(4), is_(equal_to([0, 0, 0, 0.5])))
+
+    def test_acquire_sleeps_only_when_needed (self):
+        for i in range(4):
+            self.bucket.acquire()
+
+        assert_that(self.clock.sleeps, is_(equal_to([0.5])))
+
+class TokenBucketRateTest (unittest.TestCase):
+
+    def test_rate_must_be_positive (self):
+        for rate in (0, -1):
+            assert_that(calling(TokenBucket).with_args(rate),
+                        raises(ValueError, "rate"))
+
+class APIQuerierRateLimitTest (unittest.TestCase):
+
+    def test_each_request_takes_a_token (self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=2, clock=clock,
+                             sleep=clock.sleep)
+        api = APIQuerier(URI(), url_opener=UrlopenerStub("hi"),
+                         rate_limiter=bucket)
+
+        for i in range(4):
+            api.get()
+
+        assert_that(clock.sleeps, is_(equal_to([1.0, 2.0])))
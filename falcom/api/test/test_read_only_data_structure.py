@@ -0,0 +1,75 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+import unittest
+
+from ...test.hamcrest import evaluates_to
+from ..common import ReadOnlyDataStructure
+
+class Record (ReadOnlyDataStructure):
+
+    auto_properties = (
+        "name",
+        ("tags", ()),
+    )
+
+class LongerRecord (Record):
+
+    auto_properties = Record.auto_properties + ("size",)
+
+class GivenEmptyRecord (unittest.TestCase):
+
+    def setUp (self):
+        self.record = Record(name=None)
+
+    def test_evaluates_to_false (self):
+        assert_that(self.record, evaluates_to(False))
+
+    def test_properties_fall_back_to_defaults (self):
+        assert_that(self.record.name, is_(none()))
+        assert_that(self.record.tags, is_(equal_to(())))
+
+    def test_repr_shows_no_values (self):
+        assert_that(repr(self.record), is_(equal_to("<Record>")))
+
+class GivenRecordWithValues (unittest.TestCase):
+
+    def setUp (self):
+        self.record = Record(name="a", tags=("b",), extra=3, gone=None)
+
+    def test_evaluates_to_true (self):
+        assert_that(self.record, evaluates_to(True))
+
+    def test_properties_return_values (self):
+        assert_that(self.record.name, is_(equal_to("a")))
+        assert_that(self.record.tags, is_(equal_to(("b",))))
+
+    def test_get_sees_every_non_null_key (self):
+        assert_that(self.record.get("extra"), is_(equal_to(3)))
+        assert_that(self.record.get("gone", 5), is_(equal_to(5)))
+        assert_that(self.record.get("name", 5), is_(equal_to("a")))
+
+    def test_repr_shows_non_null_values (self):
+        assert_that(repr(self.record), is_(equal_to(
+                "<Record name='a' tags=('b',) extra=3>")))
+
+    def test_values_cannot_be_changed (self):
+        assert_that(calling(setattr).with_args(self.record, "name", "b"),
+                    raises(AttributeError))
+        assert_that(calling(setattr).with_args(self.record, "new", "b"),
+                    raises(AttributeError))
+
+class GivenSubclassOfRecord (unittest.TestCase):
+
+    def test_subclass_has_its_own_properties (self):
+        record = LongerRecord(name="a", size=2)
+        assert_that(record.name, is_(equal_to("a")))
+        assert_that(record.size, is_(equal_to(2)))
+        assert_that(record.tags, is_(equal_to(())))
+
+    def test_instances_have_no_dict (self):
+        assert_that(hasattr(LongerRecord(), "__dict__"), is_(equal_to(False)))
+
+    def test_extra_values_alone_make_it_true (self):
+        assert_that(LongerRecord(other=0), evaluates_to(True))
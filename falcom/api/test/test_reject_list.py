@@ -0,0 +1,209 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+import unittest
+
+from .catalog_fake import CatalogFake, UsingCatalogFake
+from ...decorators import try_forever
+from .. import reject_list
+from ..uri import CircuitOpen, ResponseCache
+from ..reject_list import VolumeDataFromBarcode, get_volume_data_in_order
+from ..reject_list import host_limiter
+
+ASTRO = "39015081447313"
+BUSINESS = "39015090867675"
+MIDAILY = "39015071755826"
+
+SIX_BARCODES = ("39015050666182", MIDAILY, "39015079130699", ASTRO,
+                "39015084510513", BUSINESS)
+
+class TrippedBreakerFake:
+
+    def __init__ (self, trips):
+        self.trips = trips
+
+    def __call__ (self, uri):
+        return self
+
+    def __enter__ (self):
+        if self.trips > 0:
+            self.trips -= 1
+            raise CircuitOpen("open")
+
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        return False
+
+class GivenCatalogFake (UsingCatalogFake, unittest.TestCase):
+
+    def setUp (self):
+        self.use_catalog_fake(CatalogFake())
+
+    def test_astro_volume_has_marc_data (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(data.marc.oclc, is_(equal_to("706055947")))
+
+    def test_astro_volume_has_worldcat_data (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(list(data.worldcat), is_(equal_to(["EYM"])))
+
+    def test_astro_volume_has_oclc_counts (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(data.oclc_counts, is_(equal_to((0, 1))))
+
+    def test_astro_volume_matches_its_own_title (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(data.hathi_title_match_percent(),
+                    is_(equal_to("46.5")))
+
+    def test_title_match_needs_no_further_requests (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        before = len(self.catalog.uris)
+        data.hathi_title_match_percent()
+        assert_that(self.catalog.uris, has_length(before))
+
+    def test_volumes_sharing_an_oclc_share_requests (self):
+        list(get_volume_data_in_order([ASTRO] * 40))
+        assert_that(self.catalog.count("/libraries/"), is_(equal_to(1)))
+        assert_that(self.catalog.count("oclc:"), is_(equal_to(1)))
+        assert_that(self.catalog.count("recordnumber:"),
+                    is_(equal_to(1)))
+
+    def test_unknown_barcode_has_no_marc_data (self):
+        data = VolumeDataFromBarcode("39015000000000")
+        assert_that(data.marc, is_(has_property("bib", none())))
+
+class GivenSlowCatalogFake (UsingCatalogFake, unittest.TestCase):
+
+    def setUp (self):
+        self.use_catalog_fake(CatalogFake(delay=0.01))
+        self.original_limit = host_limiter.limit
+
+    def tearDown (self):
+        super().tearDown()
+        host_limiter.limit = self.original_limit
+
+    def get_volumes (self, barcodes, max_workers = 4):
+        return list(get_volume_data_in_order(barcodes, max_workers))
+
+    def test_volumes_come_back_in_barcode_order (self):
+        barcodes = [BUSINESS, ASTRO, MIDAILY] * 3
+        volumes = self.get_volumes(barcodes)
+
+        assert_that([v.barcode for v in volumes],
+                    is_(equal_to(barcodes)))
+
+    def test_volumes_are_looked_up_at_the_same_time (self):
+        host_limiter.limit = 0
+        self.get_volumes([ASTRO] * 8)
+        assert_that(self.catalog.most_in_flight_at_once(), is_(greater_than(1)))
+
+    def test_one_volume_sends_its_hathi_lookups_together (self):
+        VolumeDataFromBarcode(ASTRO)
+        assert_that(self.catalog.count("/brief/json/"), is_(equal_to(1)))
+
+    def test_worldcat_and_hathi_requests_overlap (self):
+        self.catalog.delay = 0.1
+        VolumeDataFromBarcode(ASTRO)
+        assert_that(self.catalog.max_total_in_flight, is_(equal_to(2)))
+
+    def test_many_volumes_share_hathi_requests (self):
+        host_limiter.limit = 0
+        self.get_volumes([ASTRO, BUSINESS, MIDAILY], max_workers=3)
+        assert_that(self.catalog.count("/brief/json/"),
+                    is_(less_than(3)))
+
+    def test_host_limit_bounds_requests_in_flight (self):
+        host_limiter.limit = 2
+        self.get_volumes([ASTRO] * 8, max_workers=8)
+        assert_that(self.catalog.most_in_flight_at_once(), is_(less_than(3)))
+
+    def test_fan_out_pool_grows_with_the_volume_workers (self):
+        for workers in (2, 16):
+            self.get_volumes([ASTRO], max_workers=workers)
+            assert_that(reject_list.fan_out_workers,
+                        is_(equal_to(3 * workers)))
+
+class GivenWarmResponseCache (UsingCatalogFake, unittest.TestCase):
+
+    def setUp (self):
+        self.use_catalog_fake(CatalogFake())
+        self.original_caches = [api.cache for api in reject_list.all_apis]
+        reject_list.use_response_cache(ResponseCache())
+
+        self.get_volumes()
+        reject_list.clear_memos()
+        self.catalog.uris = [ ]
+
+    def tearDown (self):
+        super().tearDown()
+        for api, cache in zip(reject_list.all_apis, self.original_caches):
+            api.cache = cache
+
+    def get_volumes (self):
+        return list(get_volume_data_in_order(SIX_BARCODES, 6))
+
+    def test_rerun_sends_no_hathi_requests (self):
+        self.get_volumes()
+        assert_that(self.catalog.count("/brief/json/"), is_(equal_to(0)))
+
+    def test_rerun_sends_no_aleph_requests (self):
+        self.get_volumes()
+        assert_that(self.catalog.count("bc2meta"), is_(equal_to(0)))
+
+    def test_rerun_gets_the_same_hathi_data (self):
+        volumes = self.get_volumes()
+        assert_that(volumes[3].oclc_counts, is_(equal_to((0, 1))))
+
+class GivenTrippedWorldCatCircuit (UsingCatalogFake, unittest.TestCase):
+
+    def setUp (self):
+        self.use_catalog_fake(CatalogFake())
+        self.original_breaker = reject_list.worldcat_api.circuit_breaker
+        self.original_retry = reject_list.blocked_volume_retry
+        reject_list.blocked_volume_retry = try_forever(
+                seconds_between_attempts=0.01)
+
+    def tearDown (self):
+        super().tearDown()
+        reject_list.worldcat_api.circuit_breaker = self.original_breaker
+        reject_list.blocked_volume_retry = self.original_retry
+
+    def trip_worldcat (self, times):
+        reject_list.clear_memos()
+        reject_list.worldcat_api.circuit_breaker = TrippedBreakerFake(times)
+
+    def test_blocked_volume_says_why (self):
+        self.trip_worldcat(1)
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(data.blocked_by, is_(instance_of(CircuitOpen)))
+        assert_that(data.marc.oclc, is_(equal_to("706055947")))
+
+    def test_blocked_volume_picks_up_where_it_left_off (self):
+        self.trip_worldcat(1)
+        data = VolumeDataFromBarcode(ASTRO)
+        aleph_requests = self.catalog.count("bc2meta")
+        data.look_up()
+
+        assert_that(data.blocked_by, is_(none()))
+        assert_that(list(data.worldcat), is_(equal_to(["EYM"])))
+        assert_that(self.catalog.count("bc2meta"),
+                    is_(equal_to(aleph_requests)))
+
+    def test_blocked_volumes_come_back_complete_and_in_order (self):
+        barcodes = [BUSINESS, ASTRO, MIDAILY, ASTRO]
+        expected = [(v.barcode, v.oclc_counts)
+                    for v in get_volume_data_in_order(barcodes, 2)]
+        aleph_requests = self.catalog.count("bc2meta")
+
+        self.trip_worldcat(3)
+        volumes = list(get_volume_data_in_order(barcodes, 2))
+
+        assert_that([(v.barcode, v.oclc_counts) for v in volumes],
+                    is_(equal_to(expected)))
+        assert_that(volumes, only_contains(
+                has_property("blocked_by", none())))
+        assert_that(self.catalog.count("bc2meta"),
+                    is_(equal_to(2 * aleph_requests)))
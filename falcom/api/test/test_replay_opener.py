@@ -0,0 +1,248 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from json import loads as json_load_str
+from os.path import join
+from tempfile import TemporaryDirectory
+from urllib.error import HTTPError
+import gzip
+import unittest
+
+from ...compat import monotonic
+from .catalog_fake import CatalogFake, UsingCatalogFake
+from .test_uris import UrlopenerStub
+from .. import reject_list
+from ..reject_list import VolumeDataFromBarcode, get_volume_data_in_order
+from ..uri import URI, APIQuerier, MissingRecording
+from ..uri import RecordingURLOpener, ReplayURLOpener
+from ..uri.replay_opener import recording_key
+
+ASTRO = "39015081447313"
+
+SIX_BARCODES = ("39015050666182", "39015071755826", "39015079130699",
+                ASTRO, "39015084510513", "39015090867675")
+
+class HTTPErrorOpener:
+
+    def __call__ (self, uri):
+        raise HTTPError(uri, 404, "Not Found", { }, None)
+
+class BodiesByURIStub:
+
+    def __init__ (self, bodies):
+        self.bodies = bodies
+
+    def __call__ (self, uri):
+        return UrlopenerStub(self.bodies[uri])(uri)
+
+def read_archive (path):
+    with gzip.open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+class RecordingTest (unittest.TestCase):
+
+    def setUp (self):
+        self.tmpdir = TemporaryDirectory()
+        self.path = join(self.tmpdir.name, "responses.gz")
+
+    def tearDown (self):
+        self.tmpdir.cleanup()
+
+    def record (self, url_opener, *uris):
+        recorder = RecordingURLOpener(url_opener, self.path)
+
+        for uri in uris:
+            with recorder(uri) as response:
+                response.read()
+
+        recorder.save()
+        return recorder
+
+class RecordingKeyTest (unittest.TestCase):
+
+    def test_api_key_is_left_out (self):
+        assert_that(recording_key("http://a.edu/x?oclc=1&wskey=secret"),
+                    is_(equal_to("http://a.edu/x?oclc=1")))
+
+    def test_uri_without_a_query_is_unchanged (self):
+        assert_that(recording_key("http://a.edu/x/1"),
+                    is_(equal_to("http://a.edu/x/1")))
+
+    def test_ignored_params_can_be_chosen (self):
+        assert_that(recording_key("http://a.edu/?a=1&b=2", ("a",)),
+                    is_(equal_to("http://a.edu/?b=2")))
+
+class GivenRecordedResponses (RecordingTest):
+
+    def setUp (self):
+        super().setUp()
+        self.recorder = self.record(UrlopenerStub("hello"),
+                                    "http://a.edu/1",
+                                    "http://a.edu/2?wskey=secret")
+
+    def test_recorder_passes_responses_through (self):
+        recorder = RecordingURLOpener(UrlopenerStub(b"hi"), self.path)
+        with recorder("http://a.edu/") as response:
+            assert_that(response.read(), is_(equal_to(b"hi")))
+
+    def test_recorder_counts_responses (self):
+        assert_that(self.recorder, has_length(2))
+
+    def test_archive_is_gzipped (self):
+        assert_that(read_archive(self.path),
+                    contains_string("http://a.edu/1"))
+
+    def test_archive_leaves_out_api_keys (self):
+        assert_that(read_archive(self.path),
+                    is_not(contains_string("secret")))
+
+    def test_replay_gives_back_recorded_bytes (self):
+        replay = ReplayURLOpener(self.path)
+        with replay("http://a.edu/1") as response:
+            assert_that(response.read(), is_(equal_to(b"hello")))
+
+    def test_replay_matches_whatever_api_key_we_send (self):
+        replay = ReplayURLOpener(self.path)
+        with replay("http://a.edu/2?wskey=other") as response:
+            assert_that(response.read(), is_(equal_to(b"hello")))
+
+    def test_unrecorded_uri_raises_missing_recording (self):
+        replay = ReplayURLOpener(self.path)
+        assert_that(calling(replay).with_args("http://a.edu/3"),
+                    raises(MissingRecording, "a.edu/3"))
+
+    def test_missing_recording_is_not_worth_retrying (self):
+        assert_that(issubclass(MissingRecording, ConnectionError),
+                    is_(equal_to(False)))
+
+    def test_replay_counts_requests (self):
+        replay = ReplayURLOpener(self.path)
+        replay("http://a.edu/1")
+        replay("http://a.edu/1")
+        assert_that(replay.requests, is_(equal_to(2)))
+
+    def test_replay_waits_for_its_latency (self):
+        replay = ReplayURLOpener(self.path, latency=0.05)
+        start = monotonic()
+        replay("http://a.edu/1")
+        assert_that(monotonic() - start, is_(greater_than(0.04)))
+
+    def test_latency_can_depend_on_the_uri (self):
+        replay = ReplayURLOpener(self.path,
+                                 latency=lambda uri: 0.05 * ("2" in uri))
+        start = monotonic()
+        replay("http://a.edu/1")
+        assert_that(monotonic() - start, is_(less_than(0.04)))
+
+    def test_replay_works_through_an_api_querier (self):
+        api = APIQuerier(URI("http://a.edu/{n}"),
+                         url_opener=ReplayURLOpener(self.path))
+        assert_that(api.get(n="1"), is_(equal_to("hello")))
+
+class GivenRecordedBinaryAndErrorResponses (RecordingTest):
+
+    def test_bytes_that_are_not_utf8_survive (self):
+        self.record(UrlopenerStub(b"\xff\x00ok"), "http://a.edu/")
+        with ReplayURLOpener(self.path)("http://a.edu/") as response:
+            assert_that(response.read(), is_(equal_to(b"\xff\x00ok")))
+
+    def test_http_errors_are_recorded_and_replayed (self):
+        recorder = RecordingURLOpener(HTTPErrorOpener(), self.path)
+        assert_that(calling(recorder).with_args("http://a.edu/"),
+                    raises(HTTPError))
+        recorder.save()
+
+        replay = ReplayURLOpener(self.path)
+        assert_that(calling(replay).with_args("http://a.edu/"),
+                    raises(HTTPError, "404"))
+
+class GivenRecordedBatches (RecordingTest):
+
+    batch_uri = "http://a.edu/json/oclc:1|oclc:2"
+
+    def test_batch_errors_are_recorded_for_each_id (self):
+        recorder = RecordingURLOpener(HTTPErrorOpener(), self.path)
+        assert_that(calling(recorder).with_args(self.batch_uri),
+                    raises(HTTPError))
+        recorder.save()
+
+        replay = ReplayURLOpener(self.path)
+        for uri in ("http://a.edu/json/oclc:2|oclc:1",
+                    "http://a.edu/json/oclc:1"):
+            assert_that(calling(replay).with_args(uri),
+                        raises(HTTPError, "404"))
+
+    def test_ids_with_empty_bodies_replay_as_missing_entries (self):
+        self.record(BodiesByURIStub({
+                        self.batch_uri: '{"oclc:1": {"items": [ ]}}',
+                        "http://a.edu/json/oclc:3": ""}),
+                    self.batch_uri, "http://a.edu/json/oclc:3")
+
+        replay = ReplayURLOpener(self.path)
+        with replay("http://a.edu/json/oclc:3|oclc:1") as response:
+            assert_that(json_load_str(response.read().decode("utf-8")),
+                        is_(equal_to({"oclc:1": {"items": [ ]}})))
+
+class GivenRecordedVolume (UsingCatalogFake, RecordingTest):
+
+    def setUp (self):
+        RecordingTest.setUp(self)
+        self.use_catalog_fake(RecordingURLOpener(CatalogFake(), self.path))
+        VolumeDataFromBarcode(ASTRO)
+        self.catalog.save()
+
+        reject_list.clear_memos()
+        self.replay = ReplayURLOpener(self.path)
+        reject_list.use_url_opener(self.replay)
+
+    def tearDown (self):
+        UsingCatalogFake.tearDown(self)
+        RecordingTest.tearDown(self)
+
+    def test_volume_can_be_looked_up_offline (self):
+        data = VolumeDataFromBarcode(ASTRO)
+        assert_that(data.marc.oclc, is_(equal_to("706055947")))
+        assert_that(list(data.worldcat), is_(equal_to(["EYM"])))
+
+    def test_replay_sends_every_request_the_live_run_did (self):
+        VolumeDataFromBarcode(ASTRO)
+        assert_that(self.replay.requests,
+                    is_(equal_to(len(self.catalog.url_opener.uris))))
+
+    def test_batched_hathi_ids_are_recorded_one_by_one (self):
+        uris = [json_load_str(line)["uri"]
+                for line in read_archive(self.path).splitlines()]
+
+        assert_that(uris, has_item(ends_with("/json/oclc:706055947")))
+        assert_that(uris, only_contains(is_not(contains_string("|"))))
+
+class GivenRecordedVolumes (UsingCatalogFake, RecordingTest):
+
+    def setUp (self):
+        RecordingTest.setUp(self)
+        self.use_catalog_fake(RecordingURLOpener(CatalogFake(), self.path))
+        self.recorded = self.summarize(6)
+        self.catalog.save()
+        reject_list.use_url_opener(ReplayURLOpener(self.path))
+
+    def tearDown (self):
+        UsingCatalogFake.tearDown(self)
+        RecordingTest.tearDown(self)
+
+    def summarize (self, workers):
+        reject_list.clear_memos()
+        return [(v.marc.oclc, v.oclc_counts, v.hathi_title_match_percent())
+                for v in get_volume_data_in_order(SIX_BARCODES, workers)]
+
+    def test_replay_matches_with_any_number_of_workers (self):
+        for workers in (1, 2, 6, 6, 1):
+            assert_that(self.summarize(workers),
+                        is_(equal_to(self.recorded)))
+
+    def test_batch_of_unrecorded_ids_is_still_missing (self):
+        replay = ReplayURLOpener(self.path)
+        uri = "http://catalog.hathitrust.org/api/volumes/brief/json/" \
+              "oclc:706055947|oclc:1"
+        assert_that(calling(replay).with_args(uri),
+                    raises(MissingRecording, "oclc:1"))
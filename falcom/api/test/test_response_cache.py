@@ -0,0 +1,120 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from os.path import join
+from tempfile import TemporaryDirectory
+import unittest
+
+from .test_uris import UrlopenerSpy, UrlopenerStub
+from ..uri import URI, APIQuerier, ResponseCache
+
+class GivenEmptyCache (unittest.TestCase):
+
+    def setUp (self):
+        self.cache = ResponseCache()
+
+    def test_has_no_entries (self):
+        assert_that(self.cache, has_length(0))
+
+    def test_unknown_uri_is_a_miss (self):
+        assert_that(self.cache.get("http://a.edu/"), is_(none()))
+        assert_that(self.cache.misses, is_(equal_to(1)))
+        assert_that(self.cache.hits, is_(equal_to(0)))
+
+    def test_stored_response_is_a_hit (self):
+        self.cache.set("http://a.edu/", "hello")
+        assert_that(self.cache.get("http://a.edu/"),
+                    is_(equal_to("hello")))
+        assert_that(self.cache.hits, is_(equal_to(1)))
+
+    def test_storing_the_same_uri_twice_replaces_it (self):
+        self.cache.set("http://a.edu/", "hello")
+        self.cache.set("http://a.edu/", "goodbye")
+        assert_that(self.cache, has_length(1))
+        assert_that(self.cache.get("http://a.edu/"),
+                    is_(equal_to("goodbye")))
+
+    def test_expired_response_is_a_miss (self):
+        self.cache.set("http://a.edu/", "hello")
+        assert_that(self.cache.get("http://a.edu/", ttl=-1), is_(none()))
+        assert_that(self.cache, has_length(0))
+
+    def test_unexpired_response_is_a_hit (self):
+        self.cache.set("http://a.edu/", "hello")
+        assert_that(self.cache.get("http://a.edu/", ttl=60),
+                    is_(equal_to("hello")))
+
+class GivenCacheWithRoomForTwo (unittest.TestCase):
+
+    def setUp (self):
+        self.cache = ResponseCache(max_entries=2)
+        self.cache.set("a", "1")
+        self.cache.set("b", "2")
+
+    def test_third_entry_evicts_the_oldest (self):
+        self.cache.set("c", "3")
+        assert_that(self.cache, has_length(2))
+        assert_that(self.cache.get("a"), is_(none()))
+
+    def test_reading_an_entry_keeps_it_around (self):
+        self.cache.get("a")
+        self.cache.set("c", "3")
+        assert_that(self.cache.get("a"), is_(equal_to("1")))
+        assert_that(self.cache.get("b"), is_(none()))
+
+class CacheFileTest (unittest.TestCase):
+
+    def test_responses_survive_reopening_the_file (self):
+        with TemporaryDirectory() as tmp:
+            path = join(tmp, "cache.sqlite")
+
+            cache = ResponseCache(path)
+            cache.set("http://a.edu/", "hello")
+            cache.close()
+
+            cache = ResponseCache(path)
+            assert_that(cache, has_length(1))
+            assert_that(cache.get("http://a.edu/"),
+                        is_(equal_to("hello")))
+            cache.close()
+
+class APIQuerierCacheTest (unittest.TestCase):
+
+    def setUp (self):
+        self.cache = ResponseCache()
+
+    def test_second_get_is_served_from_the_cache (self):
+        spy = UrlopenerSpy()
+        self.cache.set("hello?a=1", "cached")
+        api = APIQuerier(URI("hello"), url_opener=spy, cache=self.cache)
+
+        assert_that(api.get(a="1"), is_(equal_to("cached")))
+        assert_that(spy, has_length(0))
+
+    def test_responses_are_stored_under_the_full_uri (self):
+        api = APIQuerier(URI("hello"), url_opener=UrlopenerStub("hi"),
+                         cache=self.cache)
+        api.get(a="1")
+        assert_that(self.cache.get("hello?a=1"), is_(equal_to("hi")))
+
+    def test_empty_responses_are_not_stored (self):
+        api = APIQuerier(URI("hello"), url_opener=UrlopenerStub(""),
+                         cache=self.cache)
+        api.get(a="1")
+        assert_that(self.cache, has_length(0))
+
+    def test_uncached_gets_skip_the_cache (self):
+        self.cache.set("hello?a=1", "cached")
+        api = APIQuerier(URI("hello"), url_opener=UrlopenerStub("hi"),
+                         cache=self.cache)
+
+        assert_that(api.get_uncached(a="1"), is_(equal_to("hi")))
+        assert_that(api.get_uncached(a="2"), is_(equal_to("hi")))
+        assert_that(self.cache, has_length(1))
+
+    def test_querier_ttl_is_used (self):
+        self.cache.set("hello", "stale")
+        api = APIQuerier(URI("hello"), url_opener=UrlopenerStub("new"),
+                         cache=self.cache, cache_ttl=-1)
+        assert_that(api.get(), is_(equal_to("new")))
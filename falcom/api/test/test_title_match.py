@@ -0,0 +1,64 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from distance import levenshtein
+from hamcrest import *
+from random import Random
+import unittest
+
+from ..hathi.title_match import TitleMatcher, bounded_levenshtein, \
+        min_title_distances, soften_title
+
+def random_title (rng):
+    return "".join(rng.choice("abc d,.") for i in range(rng.randint(0, 12)))
+
+class BoundedLevenshteinTest (unittest.TestCase):
+
+    def test_returns_distances_within_the_bound (self):
+        assert_that(bounded_levenshtein("kitten", "sitting", 3),
+                    is_(equal_to(3)))
+
+    def test_returns_none_beyond_the_bound (self):
+        assert_that(bounded_levenshtein("kitten", "sitting", 2),
+                    is_(none()))
+
+    def test_length_difference_alone_can_rule_out (self):
+        assert_that(bounded_levenshtein("a", "abcdef", 4), is_(none()))
+
+    def test_agrees_with_distance_package (self):
+        rng = Random(1)
+
+        for i in range(500):
+            a, b = random_title(rng), random_title(rng)
+            expected = levenshtein(a, b)
+            bound = rng.randint(0, 12)
+
+            assert_that(bounded_levenshtein(a, b, bound), is_(equal_to(
+                    expected if expected <= bound else None)))
+
+class TitleMatcherTest (unittest.TestCase):
+
+    def test_soften_title_drops_symbols_and_case (self):
+        assert_that(soften_title("The  Title: [vol. 1]"),
+                    is_(equal_to("the title vol 1")))
+
+    def test_no_titles_means_a_distance_of_1 (self):
+        assert_that(TitleMatcher(()).min_distance("x"), is_(equal_to(1)))
+
+    def test_matches_the_old_normalized_distance (self):
+        rng = Random(2)
+
+        for i in range(200):
+            ours = [random_title(rng) for j in range(rng.randint(1, 4))]
+            theirs = random_title(rng)
+            expected = min(levenshtein(soften_title(theirs),
+                                       soften_title(t), normalized=True)
+                           for t in ours)
+
+            assert_that(TitleMatcher(ours).min_distance(theirs),
+                        is_(equal_to(expected)))
+
+    def test_batch_matches_each_title (self):
+        distances = min_title_distances(["abc", "xyz", "abd"],
+                                        ["ABC.", "wxyz"])
+        assert_that(distances, is_(equal_to([0.0, 0.25, 1 / 3])))
@@ -5,7 +5,7 @@ from hamcrest import *
 import unittest
 
 from ...test.hamcrest import evaluates_to
-from ..uri import URI, APIQuerier
+from ..uri import URI, APIQuerier, HostLimiter
 
 class AbstractSpy:
 
@@ -196,6 +196,30 @@ class GivenComposedURI (unittest.TestCase):
         assert_that(self.uri(hello="a b", yes="c d e"), is_(equal_to(
                 "http://coolsite.gov/api/a b/c d e.json")))
 
+class HostLimiterTest (unittest.TestCase):
+
+    def test_same_host_shares_a_semaphore (self):
+        limiter = HostLimiter(2)
+        assert_that(limiter("http://a.edu/one"),
+                    is_(same_instance(limiter("http://a.edu/two"))))
+
+    def test_different_hosts_have_different_semaphores (self):
+        limiter = HostLimiter(2)
+        assert_that(limiter("http://a.edu/one"),
+                    is_not(same_instance(limiter("http://b.edu/one"))))
+
+    def test_semaphore_blocks_after_limit (self):
+        semaphore = HostLimiter(2)("http://a.edu/")
+        assert_that(semaphore.acquire(False), is_(equal_to(True)))
+        assert_that(semaphore.acquire(False), is_(equal_to(True)))
+        assert_that(semaphore.acquire(False), is_(equal_to(False)))
+
+    def test_zero_limit_never_blocks (self):
+        limiter = HostLimiter(0)
+        with limiter("http://a.edu/"):
+            with limiter("http://a.edu/"):
+                pass
+
 class APIQuerierTestHelpers (unittest.TestCase):
 
     def set_api_spy (self, uri):
@@ -209,12 +233,14 @@ class APIQuerierTestHelpers (unittest.TestCase):
     def set_api_error_fake (self,
                             error=ConnectionError,
                             failures=3,
-                            max_tries=0):
+                            max_tries=0,
+                            **kwargs):
         self.api = APIQuerier(
                 URI(),
                 url_opener=UrlopenerErrorFake(failures, error),
                 sleep_time=0.001,
-                max_tries=max_tries)
+                max_tries=max_tries,
+                **kwargs)
 
 class APIQuerierSpyTest (APIQuerierTestHelpers):
 
@@ -274,6 +300,11 @@ class APIQuerierTestErrors (APIQuerierTestHelpers):
         self.set_api_error_fake(failures=5, max_tries=3)
         assert_that(self.api.get(), is_(equal_to("")))
 
+    def test_backoff_is_capped (self):
+        self.set_api_error_fake(failures=20, backoff=10,
+                                max_sleep_time=0.001)
+        self.api.get() # should raise no error in reasonable time
+
     def test_when_max_is_zero_try_a_lot (self):
         self.set_api_error_fake(failures=100, max_tries=0)
         self.api.get() # should raise no error
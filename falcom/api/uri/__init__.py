@@ -3,4 +3,11 @@
 # BSD License. See LICENSE.txt for details.
 
 from .api_querier import APIQuerier
+from .circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpen
+from .host_limiter import HostLimiter
+from .pooled_opener import PooledURLOpener
+from .rate_limiter import TokenBucket
+from .replay_opener import MissingRecording, RecordingURLOpener
+from .replay_opener import ReplayURLOpener
+from .response_cache import ResponseCache
 from .uri import URI
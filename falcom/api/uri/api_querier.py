@@ -1,21 +1,35 @@
 # Copyright (c) 2017 The Regents of the University of Michigan.
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
+from urllib.error import HTTPError
+
 from ...decorators import try_forever
+from .circuit_breaker import CircuitOpen, NoCircuitBreaker
+from .circuit_breaker import is_host_failure
+from .host_limiter import HostLimiter
+from .rate_limiter import NoRateLimit
+from .response_cache import NoCache
 
 EXPECTED_ERROR = ConnectionError
 
+# Server errors are worth retrying too, but other HTTP errors aren't.
+RETRYABLE_ERRORS = (EXPECTED_ERROR, HTTPError)
+
 class APIQuery:
 
     def get (self, kwargs):
-        self.kwargs = kwargs
-        try_to_get_data = self.__get_forever_looper()
+        self.full_uri = self.uri(**kwargs)
+        cached = self.cache.get(self.full_uri, self.cache_ttl)
 
-        try:
-            return try_to_get_data()
+        if cached is None:
+            return self.__get_and_cache()
 
-        except EXPECTED_ERROR:
-            return ""
+        else:
+            return cached
+
+    def get_uncached (self, kwargs):
+        self.full_uri = self.uri(**kwargs)
+        return self.__get_from_api()
 
     @staticmethod
     def utf8 (str_or_bytes):
@@ -25,33 +39,115 @@ class APIQuery:
         else:
             return str_or_bytes
 
+    def __get_and_cache (self):
+        result = self.__get_from_api()
+
+        if result:
+            self.cache.set(self.full_uri, result)
+
+        return result
+
+    def __get_from_api (self):
+        try_to_get_data = self.__get_forever_looper()
+
+        try:
+            return try_to_get_data()
+
+        except CircuitOpen:
+            # Rather than pretend the host had nothing for us, we let
+            # the caller decide whether to wait or move on.
+            raise
+
+        except RETRYABLE_ERRORS as error:
+            if is_host_failure(error):
+                return ""
+
+            else:
+                raise
+
     def __get_forever_looper (self):
         decorator = try_forever(
                 seconds_between_attempts=self.sleep_time,
-                base_error=EXPECTED_ERROR,
+                max_seconds_between_attempts=self.max_sleep_time,
+                backoff=self.backoff,
+                jitter=self.jitter,
+                base_error=RETRYABLE_ERRORS,
+                retry_if=self.__is_worth_retrying,
                 limit=self.max_tries)
 
         return decorator(self.__open_uri)
 
+    def __is_worth_retrying (self, error):
+        return not isinstance(error, CircuitOpen) \
+                and is_host_failure(error)
+
     def __open_uri (self):
-        with self.url_opener(self.uri(**self.kwargs)) as response:
-            result = self.utf8(response.read())
+        with self.circuit_breaker(self.full_uri):
+            self.rate_limiter.acquire()
+
+            with self.host_limiter(self.full_uri):
+                with self.url_opener(self.full_uri) as response:
+                    result = self.utf8(response.read())
 
         return result
 
 class APIQuerier:
 
-    def __init__ (self, uri, url_opener, sleep_time=300, max_tries=0):
+    query_class = APIQuery
+
+    def __init__ (self, uri, url_opener, sleep_time=300, max_tries=0,
+                  backoff=1, max_sleep_time=None, jitter=0,
+                  host_limiter=None, cache=None, cache_ttl=None,
+                  circuit_breaker=None, rate_limiter=None):
         self.uri = uri
         self.url_opener = url_opener
         self.sleep_time = sleep_time
         self.max_tries = max_tries
+        self.backoff = backoff
+        self.max_sleep_time = max_sleep_time
+        self.jitter = jitter
+        self.cache_ttl = cache_ttl
+        self.__set_host_limiter(host_limiter)
+        self.__set_cache(cache)
+        self.__set_circuit_breaker(circuit_breaker)
+        self.__set_rate_limiter(rate_limiter)
 
     def get (self, **kwargs):
         return self.__new_query().get(kwargs)
 
+    def get_uncached (self, **kwargs):
+        return self.__new_query().get_uncached(kwargs)
+
+    def __set_host_limiter (self, host_limiter):
+        if host_limiter is None:
+            self.host_limiter = HostLimiter()
+
+        else:
+            self.host_limiter = host_limiter
+
+    def __set_cache (self, cache):
+        if cache is None:
+            self.cache = NoCache()
+
+        else:
+            self.cache = cache
+
+    def __set_circuit_breaker (self, circuit_breaker):
+        if circuit_breaker is None:
+            self.circuit_breaker = NoCircuitBreaker()
+
+        else:
+            self.circuit_breaker = circuit_breaker
+
+    def __set_rate_limiter (self, rate_limiter):
+        if rate_limiter is None:
+            self.rate_limiter = NoRateLimit()
+
+        else:
+            self.rate_limiter = rate_limiter
+
     def __new_query (self):
-        query = APIQuery()
+        query = self.query_class()
         self.__copy_self_to_query(query)
         return query
 
@@ -60,3 +156,11 @@ class APIQuerier:
         query.url_opener = self.url_opener
         query.sleep_time = self.sleep_time
         query.max_tries = self.max_tries
+        query.backoff = self.backoff
+        query.max_sleep_time = self.max_sleep_time
+        query.jitter = self.jitter
+        query.host_limiter = self.host_limiter
+        query.cache = self.cache
+        query.cache_ttl = self.cache_ttl
+        query.circuit_breaker = self.circuit_breaker
+        query.rate_limiter = self.rate_limiter
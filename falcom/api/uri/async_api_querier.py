@@ -0,0 +1,127 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import asyncio
+from urllib.parse import urlsplit
+
+from ...decorators import try_forever
+from .api_querier import APIQuery, APIQuerier, RETRYABLE_ERRORS
+from .async_opener import AsyncURLOpener
+from .circuit_breaker import CircuitOpen, is_host_failure
+
+class AsyncNoLimit:
+
+    async def __aenter__ (self):
+        return self
+
+    async def __aexit__ (self, exc_type, exc_value, traceback):
+        return False
+
+class AsyncHostLimiter:
+
+    def __init__ (self, limit = 0):
+        self.limit = limit
+        self.__semaphores = { }
+
+    def __call__ (self, uri):
+        if self.limit > 0:
+            return self.__get_semaphore(urlsplit(uri).netloc)
+
+        else:
+            return AsyncNoLimit()
+
+    def __repr__ (self):
+        return "<{} limit={:d}>".format(self.__class__.__name__,
+                                        self.limit)
+
+    def __get_semaphore (self, host):
+        # Everything here runs on one event loop thread, so there's no
+        # race between checking for a semaphore and adding one.
+        if host not in self.__semaphores:
+            self.__semaphores[host] = asyncio.Semaphore(self.limit)
+
+        return self.__semaphores[host]
+
+class AsyncAPIQuery:
+
+    async def get (self, kwargs):
+        self.full_uri = self.uri(**kwargs)
+        cached = await self.__in_thread(self.cache.get, self.full_uri,
+                                        self.cache_ttl)
+
+        if cached is None:
+            return await self.__get_and_cache()
+
+        else:
+            return cached
+
+    async def get_uncached (self, kwargs):
+        self.full_uri = self.uri(**kwargs)
+        return await self.__get_from_api()
+
+    async def __get_and_cache (self):
+        result = await self.__get_from_api()
+
+        if result:
+            await self.__in_thread(self.cache.set, self.full_uri, result)
+
+        return result
+
+    async def __in_thread (self, function, *args):
+        # The response cache is sqlite behind a lock, and we don't want
+        # a slow disk to hold up every other lookup on the loop.
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    async def __get_from_api (self):
+        schedule = self.__retry_schedule()
+
+        while True:
+            try:
+                return await self.__open_uri()
+
+            except CircuitOpen:
+                raise
+
+            except RETRYABLE_ERRORS as error:
+                if not is_host_failure(error):
+                    raise
+
+                delay = schedule.next_delay(error)
+                if delay is None:
+                    return ""
+
+            await asyncio.sleep(delay)
+
+    def __retry_schedule (self):
+        decorator = try_forever(
+                seconds_between_attempts=self.sleep_time,
+                max_seconds_between_attempts=self.max_sleep_time,
+                backoff=self.backoff,
+                jitter=self.jitter,
+                base_error=RETRYABLE_ERRORS,
+                limit=self.max_tries)
+
+        return decorator.schedule()
+
+    async def __open_uri (self):
+        with self.circuit_breaker(self.full_uri):
+            await asyncio.sleep(self.rate_limiter.reserve())
+
+            async with self.host_limiter(self.full_uri):
+                response = await self.url_opener(self.full_uri)
+
+        return APIQuery.utf8(response)
+
+class AsyncAPIQuerier (APIQuerier):
+
+    query_class = AsyncAPIQuery
+
+    def __init__ (self, uri, url_opener = None, **kwargs):
+        super().__init__(uri, url_opener, **kwargs)
+
+        if url_opener is None:
+            self.url_opener = AsyncURLOpener()
+
+        if kwargs.get("host_limiter") is None:
+            self.host_limiter = AsyncHostLimiter()
@@ -0,0 +1,98 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import asyncio
+from email.parser import BytesHeaderParser
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+class AsyncTransportError (ConnectionError):
+    pass
+
+class AsyncURLOpener:
+
+    default_ports = {
+        "http": 80,
+        "https": 443,
+    }
+
+    redirect_statuses = {301, 302, 303, 307, 308}
+
+    def __init__ (self, timeout = 60, max_redirects = 5):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+
+    async def __call__ (self, uri):
+        for i in range(self.max_redirects + 1):
+            status, reason, headers, body = await self.__get(uri)
+
+            if status in self.redirect_statuses:
+                uri = urljoin(uri, headers.get("Location", ""))
+
+            elif status >= 400:
+                raise HTTPError(uri, status, reason, headers, None)
+
+            else:
+                return body
+
+        raise AsyncTransportError("too many redirects: " + uri)
+
+    def __repr__ (self):
+        return "<{} timeout={}>".format(self.__class__.__name__,
+                                        self.timeout)
+
+    async def __get (self, uri):
+        try:
+            return await asyncio.wait_for(self.__exchange(uri),
+                                          self.timeout)
+
+        except (OSError, EOFError, ValueError,
+                asyncio.TimeoutError) as error:
+            if isinstance(error, ConnectionError):
+                raise
+
+            else:
+                raise AsyncTransportError(error)
+
+    async def __exchange (self, uri):
+        parts = urlsplit(uri)
+        reader, writer = await self.__connect(parts)
+
+        try:
+            writer.write(self.__request_bytes(parts))
+            return self.__parse_response(await reader.read())
+
+        finally:
+            writer.close()
+
+    def __connect (self, parts):
+        return asyncio.open_connection(
+                parts.hostname,
+                parts.port or self.default_ports[parts.scheme],
+                ssl=(parts.scheme == "https"))
+
+    def __request_bytes (self, parts):
+        # We ask for HTTP/1.0 and hang up after each response, so the
+        # body is simply everything the server sends back.
+        path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        return "GET {} HTTP/1.0\r\nHost: {}\r\n" \
+               "Connection: close\r\n\r\n".format(
+                       path, parts.netloc).encode("ascii")
+
+    def __parse_response (self, raw):
+        head, separator, body = raw.partition(b"\r\n\r\n")
+        if not separator:
+            raise EOFError("incomplete response")
+
+        status_line, _, header_bytes = head.partition(b"\r\n")
+        version, status, reason = self.__split_status_line(status_line)
+        headers = BytesHeaderParser().parsebytes(header_bytes)
+
+        return status, reason, headers, body
+
+    def __split_status_line (self, status_line):
+        parts = status_line.decode("iso-8859-1").split(" ", 2)
+        parts.extend([""] * (3 - len(parts)))
+
+        return parts[0], int(parts[1]), parts[2]
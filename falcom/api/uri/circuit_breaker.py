@@ -0,0 +1,125 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from threading import Lock
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+from ...compat import monotonic
+
+class CircuitOpen (ConnectionError):
+    pass
+
+def is_host_failure (error):
+    # A server error or being told to slow down means the host is in no
+    # better shape than one we can't reach. We check for HTTPError
+    # first, since it's an OSError, and on Python 3.2 so is everything
+    # we call a ConnectionError.
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+
+    else:
+        return isinstance(error, ConnectionError)
+
+class NoCircuitBreaker:
+
+    def __call__ (self, uri):
+        return self
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        return False
+
+class CircuitBreaker:
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__ (self, failure_threshold = 5, cool_down = 60,
+                  clock = monotonic):
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.__lock = Lock()
+
+    def __enter__ (self):
+        with self.__lock:
+            self.__raise_unless_we_may_try()
+
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        with self.__lock:
+            # Any other outcome, even an error, means the host answered.
+            if exc_value is not None and is_host_failure(exc_value):
+                self.__record_failure()
+
+            else:
+                self.__record_success()
+
+        return False
+
+    def __repr__ (self):
+        return "<{} {} failures={:d}>".format(self.__class__.__name__,
+                                              self.state, self.failures)
+
+    def __raise_unless_we_may_try (self):
+        if self.state == self.OPEN and self.__cool_down_is_over():
+            # We let exactly one request through to see whether the
+            # host has come back.
+            self.state = self.HALF_OPEN
+
+        elif self.state != self.CLOSED:
+            raise CircuitOpen("{} since {:.0f}s ago".format(
+                    self.state, self.clock() - self.opened_at))
+
+    def __cool_down_is_over (self):
+        return self.clock() - self.opened_at >= self.cool_down
+
+    def __record_success (self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def __record_failure (self):
+        self.failures += 1
+
+        if self.state == self.HALF_OPEN \
+                or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+
+class CircuitBreakers:
+
+    def __init__ (self, failure_threshold = 5, cool_down = 60,
+                  clock = monotonic):
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.clock = clock
+
+        self.__lock = Lock()
+        self.__breakers = { }
+
+    def __call__ (self, uri):
+        host = urlsplit(uri).netloc
+
+        with self.__lock:
+            if host not in self.__breakers:
+                self.__breakers[host] = self.__new_breaker()
+
+            return self.__breakers[host]
+
+    def __repr__ (self):
+        return "<{} {}>".format(self.__class__.__name__,
+                                repr(self.__breakers))
+
+    def __new_breaker (self):
+        return CircuitBreaker(self.failure_threshold, self.cool_down,
+                              self.clock)
@@ -0,0 +1,50 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from threading import BoundedSemaphore, Lock
+from urllib.parse import urlsplit
+
+class NoLimit:
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        return False
+
+class HostLimiter:
+
+    def __init__ (self, limit = 0):
+        self.__lock = Lock()
+        self.limit = limit
+
+    @property
+    def limit (self):
+        return self.__limit
+
+    @limit.setter
+    def limit (self, value):
+        with self.__lock:
+            self.__limit = value
+            self.__semaphores = { }
+
+    def __call__ (self, uri):
+        if self.limit > 0:
+            return self.__get_semaphore(self.__host(uri))
+
+        else:
+            return NoLimit()
+
+    def __repr__ (self):
+        return "<{} limit={:d}>".format(self.__class__.__name__,
+                                        self.limit)
+
+    def __host (self, uri):
+        return urlsplit(uri).netloc
+
+    def __get_semaphore (self, host):
+        with self.__lock:
+            if host not in self.__semaphores:
+                self.__semaphores[host] = BoundedSemaphore(self.limit)
+
+            return self.__semaphores[host]
@@ -0,0 +1,203 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from threading import Lock
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+class PooledResponse:
+
+    def __init__ (self, opener, key, connection, response):
+        self.__opener = opener
+        self.__key = key
+        self.__connection = connection
+        self.__response = response
+
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def read (self, *args):
+        try:
+            return self.__response.read(*args)
+
+        except (HTTPException, OSError) as error:
+            self.__connection.close()
+            raise self.__opener.TransportError(error)
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close (self):
+        if self.__connection is not None:
+            self.__return_or_close_connection()
+            self.__connection = None
+
+    def __return_or_close_connection (self):
+        if self.__connection_can_be_reused():
+            self.__opener.release(self.__key, self.__connection)
+
+        else:
+            self.__response.close()
+            self.__connection.close()
+
+    def __connection_can_be_reused (self):
+        # A response we've read to the end leaves the connection ready
+        # for another request unless the server asked us to hang up.
+        return self.__response.isclosed() \
+                and not self.__response.will_close
+
+class PooledURLOpener:
+
+    class TransportError (ConnectionError):
+        pass
+
+    class TooManyRedirects (HTTPException):
+        pass
+
+    connection_types = {
+        "http": HTTPConnection,
+        "https": HTTPSConnection,
+    }
+
+    redirect_statuses = {301, 302, 303, 307, 308}
+
+    def __init__ (self, max_idle_per_host = 4, timeout = 60,
+                  max_redirects = 5):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+        self.__lock = Lock()
+        self.__idle = { }
+
+    def __call__ (self, uri):
+        for i in range(self.max_redirects + 1):
+            response = self.__get(uri)
+
+            if response.status in self.redirect_statuses:
+                uri = self.__follow(uri, response)
+
+            else:
+                return self.__raise_if_error(uri, response)
+
+        raise self.TooManyRedirects(uri)
+
+    def idle_connections (self):
+        with self.__lock:
+            return sum(len(x) for x in self.__idle.values())
+
+    def release (self, key, connection):
+        with self.__lock:
+            idle = self.__idle.setdefault(key, [ ])
+
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                connection = None
+
+        if connection is not None:
+            connection.close()
+
+    def close (self):
+        with self.__lock:
+            for idle in self.__idle.values():
+                for connection in idle:
+                    connection.close()
+
+            self.__idle = { }
+
+    def __repr__ (self):
+        return "<{} opened={:d} reused={:d} idle={:d}>".format(
+                self.__class__.__name__, self.connections_opened,
+                self.connections_reused, self.idle_connections())
+
+    def __get (self, uri):
+        key, path = self.__split(uri)
+        connection, reused = self.__acquire(key)
+
+        try:
+            response = self.__request(connection, path)
+
+        except ConnectionError:
+            if reused:
+                # The server may have quietly closed a connection that
+                # sat idle in our pool, so we try once more on a new one.
+                return self.__get_with_new_connection(key, path)
+
+            else:
+                raise
+
+        return PooledResponse(self, key, connection, response)
+
+    def __get_with_new_connection (self, key, path):
+        connection = self.__connect(key)
+        response = self.__request(connection, path)
+
+        return PooledResponse(self, key, connection, response)
+
+    def __request (self, connection, path):
+        try:
+            connection.request("GET", path)
+            return connection.getresponse()
+
+        except (HTTPException, OSError) as error:
+            connection.close()
+            raise self.__as_connection_error(error)
+
+    def __as_connection_error (self, error):
+        if isinstance(error, ConnectionError):
+            return error
+
+        else:
+            return self.TransportError(error)
+
+    def __split (self, uri):
+        parts = urlsplit(uri)
+        path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        return (parts.scheme, parts.netloc), path
+
+    def __acquire (self, key):
+        with self.__lock:
+            idle = self.__idle.get(key)
+
+            if idle:
+                self.connections_reused += 1
+                return idle.pop(), True
+
+        return self.__connect(key), False
+
+    def __connect (self, key):
+        scheme, netloc = key
+        connection_type = self.connection_types[scheme]
+
+        with self.__lock:
+            self.connections_opened += 1
+
+        return connection_type(netloc, timeout=self.timeout)
+
+    def __follow (self, uri, response):
+        location = response.headers.get("Location", "")
+        with response:
+            response.read()
+
+        return urljoin(uri, location)
+
+    def __raise_if_error (self, uri, response):
+        if response.status >= 400:
+            with response:
+                response.read()
+
+            raise HTTPError(uri, response.status, response.reason,
+                            response.headers, None)
+
+        else:
+            return response
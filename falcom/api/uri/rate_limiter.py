@@ -0,0 +1,69 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from threading import Lock
+from time import sleep
+
+from ...compat import monotonic
+
+class NoRateLimit:
+
+    def reserve (self):
+        return 0
+
+    def acquire (self):
+        pass
+
+    def __repr__ (self):
+        return "<{}>".format(self.__class__.__name__)
+
+class TokenBucket:
+
+    def __init__ (self, rate, burst = 1, clock = monotonic,
+                  sleep = sleep):
+        if not rate > 0:
+            # There's no way to wait for a token that never comes.
+            raise ValueError("rate must be positive, not {}".format(rate))
+
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+
+        self.__lock = Lock()
+        self.__tokens = burst
+        self.__last_refill = clock()
+
+    def reserve (self):
+        with self.__lock:
+            self.__refill()
+
+            # Callers who find the bucket empty still take their token,
+            # leaving it in debt; each waits until its token would have
+            # arrived, so a crowd of callers leaves evenly spaced.
+            self.__tokens -= 1
+            return self.__seconds_until_paid_off()
+
+    def acquire (self):
+        wait = self.reserve()
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def __repr__ (self):
+        return "<{} rate={} burst={}>".format(self.__class__.__name__,
+                                              self.rate, self.burst)
+
+    def __refill (self):
+        now = self.clock()
+        earned = (now - self.__last_refill) * self.rate
+
+        self.__tokens = min(self.burst, self.__tokens + earned)
+        self.__last_refill = now
+
+    def __seconds_until_paid_off (self):
+        if self.__tokens >= 0:
+            return 0
+
+        else:
+            return -self.__tokens / self.rate
@@ -0,0 +1,240 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import gzip
+from json import dumps as json_dump_str, loads as json_load_str
+from threading import Lock
+from time import sleep
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+from urllib.parse import urlunsplit
+
+from ...compat import replace
+
+# API keys have no place in an archive we might share, and leaving them
+# out means a recording still matches after a key changes.
+DEFAULT_IGNORED_PARAMS = ("wskey",)
+
+class MissingRecording (LookupError):
+    pass
+
+def recording_key (uri, ignored_params = DEFAULT_IGNORED_PARAMS):
+    parts = urlsplit(uri)
+    query = [(k, v) for k, v in parse_qsl(parts.query, True)
+             if k not in ignored_params]
+
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def keys_by_batched_id (key):
+    # HathiTrust takes several ids at once, joined by "|" at the end of
+    # the path. Which ids share a request depends on timing, so we
+    # record and replay each id under the URI it would have alone.
+    parts = urlsplit(key)
+    head, slash, last = parts.path.rpartition("/")
+    ids = unquote(last).split("|")
+
+    if len(ids) > 1:
+        return dict((i, urlunsplit(parts._replace(path=head + "/" + i)))
+                    for i in ids)
+
+def split_batched_body (keys_by_id, body):
+    try:
+        data = json_load_str(body.decode("utf-8"))
+
+    except ValueError:
+        return None
+
+    if isinstance(data, dict):
+        return dict((key, json_bytes({i: data.get(i, { })}))
+                    for i, key in keys_by_id.items())
+
+def json_bytes (data):
+    return json_dump_str(data).encode("utf-8")
+
+def json_dict (body):
+    # An id that came back empty or strange is just an id with nothing
+    # recorded for it; the rest of its batch still stands.
+    try:
+        data = json_load_str(body.decode("utf-8"))
+
+    except ValueError:
+        return { }
+
+    return data if isinstance(data, dict) else { }
+
+class RecordedResponse:
+
+    def __init__ (self, body):
+        self.body = body
+
+    def read (self, *args, **kwargs):
+        return self.body
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        return False
+
+class RecordingURLOpener:
+
+    def __init__ (self, url_opener, path,
+                  ignored_params = DEFAULT_IGNORED_PARAMS):
+        self.url_opener = url_opener
+        self.path = path
+        self.ignored_params = ignored_params
+
+        self.__lock = Lock()
+        self.__recordings = { }
+
+    def __call__ (self, uri):
+        key = recording_key(uri, self.ignored_params)
+
+        try:
+            with self.url_opener(uri) as response:
+                body = response.read()
+
+        except HTTPError as error:
+            self.__record_error(key, error.code)
+            raise
+
+        body = self.__as_bytes(body)
+        self.__record_each(key, body)
+        return RecordedResponse(body)
+
+    def __len__ (self):
+        return len(self.__recordings)
+
+    def __repr__ (self):
+        return "<{} {} recorded={:d}>".format(self.__class__.__name__,
+                                              repr(self.path), len(self))
+
+    def save (self):
+        with self.__lock:
+            recordings = sorted(self.__recordings.items())
+
+        # gzip only has a text mode from Python 3.3 on, so we encode
+        # each line ourselves.
+        with gzip.open(self.path + ".tmp", "wb") as f:
+            for key, (status, body) in recordings:
+                f.write(self.__json_line(key, status, body).encode("utf-8"))
+
+        replace(self.path + ".tmp", self.path)
+
+    def __record_each (self, key, body):
+        keys_by_id = keys_by_batched_id(key)
+        bodies = None
+
+        if keys_by_id is not None:
+            bodies = split_batched_body(keys_by_id, body)
+
+        if bodies is None:
+            self.__record(key, 200, body)
+
+        else:
+            for id_key, id_body in bodies.items():
+                self.__record(id_key, 200, id_body)
+
+    def __record_error (self, key, status):
+        # A batch fails as a whole, so each of its ids failed with it.
+        keys_by_id = keys_by_batched_id(key) or {None: key}
+
+        for id_key in keys_by_id.values():
+            self.__record(id_key, status, b"")
+
+    def __record (self, key, status, body):
+        # Only answers the server actually gave are kept. Connection
+        # errors come and go, so replaying them would tell us nothing.
+        with self.__lock:
+            self.__recordings[key] = (status, self.__as_bytes(body))
+
+    def __as_bytes (self, body):
+        if isinstance(body, str):
+            return body.encode("utf-8")
+
+        else:
+            return body
+
+    def __json_line (self, key, status, body):
+        # Bodies that aren't valid UTF-8 still make it through a JSON
+        # string this way, and come back out byte for byte.
+        text = body.decode("utf-8", "surrogateescape")
+        return json_dump_str({"uri": key, "status": status,
+                              "body": text}) + "\n"
+
+class ReplayURLOpener:
+
+    def __init__ (self, path, latency = 0,
+                  ignored_params = DEFAULT_IGNORED_PARAMS):
+        self.path = path
+        self.latency = latency
+        self.ignored_params = ignored_params
+        self.requests = 0
+
+        self.__lock = Lock()
+        self.__recordings = self.__load()
+
+    def __call__ (self, uri):
+        with self.__lock:
+            self.requests += 1
+
+        self.__wait(uri)
+        return self.__response_for(uri)
+
+    def __len__ (self):
+        return len(self.__recordings)
+
+    def __repr__ (self):
+        return "<{} {} recorded={:d}>".format(self.__class__.__name__,
+                                              repr(self.path), len(self))
+
+    def __load (self):
+        recordings = { }
+
+        with gzip.open(self.path, "rb") as f:
+            for line in f:
+                data = json_load_str(line.decode("utf-8"))
+                body = data["body"].encode("utf-8", "surrogateescape")
+                recordings[data["uri"]] = (data["status"], body)
+
+        return recordings
+
+    def __wait (self, uri):
+        # Latency can be a number of seconds or a function of the URI,
+        # so that each API can be made as slow as it really is.
+        latency = self.latency(uri) if callable(self.latency) \
+                                    else self.latency
+
+        if latency > 0:
+            sleep(latency)
+
+    def __response_for (self, uri):
+        key = recording_key(uri, self.ignored_params)
+
+        if key in self.__recordings:
+            status, body = self.__recordings[key]
+
+        else:
+            status, body = self.__rebuild_batch(key)
+
+        if status >= 400:
+            raise HTTPError(uri, status, "recorded error", { }, None)
+
+        return RecordedResponse(body)
+
+    def __rebuild_batch (self, key):
+        keys_by_id = keys_by_batched_id(key) or {None: key}
+        merged = { }
+
+        for id_key in keys_by_id.values():
+            if id_key not in self.__recordings:
+                raise MissingRecording(id_key)
+
+            status, body = self.__recordings[id_key]
+
+            if status >= 400:
+                return status, b""
+
+            merged.update(json_dict(body))
+
+        return 200, json_bytes(merged)
@@ -0,0 +1,137 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import sqlite3
+from threading import Lock
+from time import time
+
+class NoCache:
+
+    hits = 0
+    misses = 0
+
+    def get (self, uri, ttl = None):
+        return None
+
+    def set (self, uri, response):
+        pass
+
+    def __len__ (self):
+        return 0
+
+    def __repr__ (self):
+        return "<{}>".format(self.__class__.__name__)
+
+class ResponseCache:
+
+    __schema = """CREATE TABLE IF NOT EXISTS responses (
+                      uri TEXT PRIMARY KEY,
+                      response TEXT NOT NULL,
+                      stored REAL NOT NULL,
+                      used INTEGER NOT NULL)"""
+
+    def __init__ (self, path = ":memory:", max_entries = 100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.__lock = Lock()
+        self.__connect()
+
+    def get (self, uri, ttl = None):
+        with self.__lock:
+            response = self.__get_fresh_response(uri, ttl)
+
+            if response is None:
+                self.misses += 1
+
+            else:
+                self.hits += 1
+                self.__mark_as_used(uri)
+
+            return response
+
+    def set (self, uri, response):
+        with self.__lock:
+            self.__store(uri, response)
+            self.__evict_least_recently_used()
+            self.__db.commit()
+
+    def close (self):
+        with self.__lock:
+            self.__db.commit()
+            self.__db.close()
+
+    def __len__ (self):
+        return self.__count
+
+    def __repr__ (self):
+        return "<{} {} entries={:d} hits={:d} misses={:d}>".format(
+                self.__class__.__name__, repr(self.path), len(self),
+                self.hits, self.misses)
+
+    def __connect (self):
+        self.__db = sqlite3.connect(self.path, check_same_thread=False)
+        self.__db.execute(self.__schema)
+        self.__db.execute("CREATE INDEX IF NOT EXISTS lru"
+                          " ON responses (used)")
+        self.__db.commit()
+
+        self.__count, self.__clock = self.__db.execute(
+                "SELECT COUNT(*), IFNULL(MAX(used), 0)"
+                " FROM responses").fetchone()
+
+    def __get_fresh_response (self, uri, ttl):
+        row = self.__db.execute(
+                "SELECT response, stored FROM responses WHERE uri = ?",
+                (uri,)).fetchone()
+
+        if row is None:
+            return None
+
+        elif self.__is_expired(row[1], ttl):
+            self.__delete(uri)
+            return None
+
+        else:
+            return row[0]
+
+    def __is_expired (self, stored, ttl):
+        return ttl is not None and time() - stored > ttl
+
+    def __tick (self):
+        # Recency is kept as a counter rather than a timestamp so that
+        # two uses in the same instant still have a definite order.
+        self.__clock += 1
+        return self.__clock
+
+    def __mark_as_used (self, uri):
+        self.__db.execute("UPDATE responses SET used = ? WHERE uri = ?",
+                          (self.__tick(), uri))
+
+    def __delete (self, uri):
+        self.__db.execute("DELETE FROM responses WHERE uri = ?", (uri,))
+        self.__db.commit()
+        self.__count -= 1
+
+    def __store (self, uri, response):
+        values = (response, time(), self.__tick(), uri)
+        updated = self.__db.execute(
+                "UPDATE responses SET response = ?, stored = ?, used = ?"
+                " WHERE uri = ?", values)
+
+        if updated.rowcount == 0:
+            self.__db.execute("INSERT INTO responses"
+                              " (response, stored, used, uri)"
+                              " VALUES (?, ?, ?, ?)", values)
+            self.__count += 1
+
+    def __evict_least_recently_used (self):
+        excess = self.__count - self.max_entries
+
+        if excess > 0:
+            self.__db.execute(
+                    "DELETE FROM responses WHERE uri IN (SELECT uri"
+                    " FROM responses ORDER BY used LIMIT ?)", (excess,))
+            self.__count -= excess
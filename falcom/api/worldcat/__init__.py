@@ -3,3 +3,5 @@
 # BSD License. See LICENSE.txt for details.
 
 from .from_json import get_worldcat_data_from_json
+from .institutions import HoldingCounts, InstitutionClassifier
+from .local_holdings import LocalHoldings
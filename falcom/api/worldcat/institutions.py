@@ -0,0 +1,159 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import Counter, namedtuple
+
+UM_INSTITUTIONS = frozenset({
+    "EYM",
+    "BEU",
+    "E8W",
+    "EER",
+    "EKL",
+    "EMI",
+    "EUQ",
+    "EYD",
+    "HJ8",
+    "U2T",
+    "UMSPO",
+    "UMDON",
+})
+
+HATHI_INSTITUTIONS = frozenset({
+    "HATHI",
+})
+
+CIC_INSTITUTIONS = frozenset({
+    # University of Chicago
+    "CGU",
+    "IAB",
+    "KEH",
+
+    # University of Illinois
+    "UIU",
+    "ILG",
+    "IAL",
+    "LSI",
+    "RHU",
+    "RQF",
+    "RQR",
+
+    # Indiana University
+    "AAAMC",
+    "FSIUL",
+    "I3U",
+    "IJZ",
+    "IUB",
+    "IUG",
+    "IUL",
+    "IULGB",
+    "IULSP",
+    "RQQ",
+    "XUL",
+    "XYA",
+
+    # University of Iowa
+    "NUI",
+    "LUI",
+    "UIL",
+    "UKO",
+
+    # Michigan State University
+    "EEM",
+    "EVK",
+    "MIMSU",
+    "MSUTA",
+    "MSUTP",
+
+    # University of Minnesota
+    "MNU",
+    "DIF",
+    "HOR",
+    "MCR",
+    "MLL",
+    "MND",
+    "MNH",
+    "MNU",
+    "MNUDS",
+    "MNX",
+    "MNY",
+    "NRI",
+    "UMM",
+    "UMMBL",
+    "XOR",
+
+    # Northwestern University
+    "INU",
+    "FSINU",
+    "INL",
+    "INM",
+    "INUQR",
+    "JCR",
+    "TSINU",
+    "YO5",
+
+    # Ohio State University
+    "OSU",
+    "OHL",
+    "OS0",
+    "OS1",
+    "OS6",
+    "ZH5",
+    "ZH6",
+
+    # Pennsylvania State University
+    "UPM",
+    "UPC",
+
+    # Purdue University
+    "IPL",
+    "IPC",
+    "IPN",
+    "IUP",
+    "HV6",
+
+    # University of Wisconsin - Madison
+    "GZI",
+})
+
+HoldingCounts = namedtuple("HoldingCounts", ("hathi", "um", "cic", "other"))
+
+class InstitutionClassifier:
+
+    HATHI = 0
+    UM = 1
+    CIC = 2
+    OTHER = 3
+
+    def __init__ (self, groups = None):
+        if groups is None:
+            groups = ((self.HATHI, HATHI_INSTITUTIONS),
+                      (self.UM, UM_INSTITUTIONS),
+                      (self.CIC, CIC_INSTITUTIONS))
+
+        self.__compile_symbol_table(groups)
+
+    def category (self, symbol):
+        return self.__categories.get(symbol, self.OTHER)
+
+    def count (self, holdings):
+        tally = Counter(map(self.__categories.get, holdings))
+        tally[self.OTHER] += tally.pop(None, 0)
+
+        return HoldingCounts(tally[self.HATHI], tally[self.UM],
+                             tally[self.CIC], tally[self.OTHER])
+
+    def count_many (self, holdings_lists):
+        return [self.count(h) for h in holdings_lists]
+
+    def __repr__ (self):
+        return "<{} symbols={:d}>".format(self.__class__.__name__,
+                                          len(self.__categories))
+
+    def __compile_symbol_table (self, groups):
+        # A symbol listed in more than one group belongs to the first,
+        # just as it did when each set was checked in turn.
+        self.__categories = { }
+
+        for category, symbols in groups:
+            for symbol in symbols:
+                self.__categories.setdefault(symbol, category)
@@ -0,0 +1,144 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+import dbm
+from json import dumps as json_dump_str, loads as json_load_str
+from threading import Lock
+
+def oclc_key (oclc):
+    # MARC gives us zero-padded OCLC numbers, and exports usually don't.
+    return (str(oclc).lstrip("0") or "0").encode("ascii")
+
+def read_tsv_holdings (line):
+    oclc, *symbols = line.split("\t")
+    return oclc, None, symbols
+
+def read_json_holdings (line):
+    data = json_load_str(line)
+    return data["oclc"], data.get("title"), data.get("symbols", [ ])
+
+class HoldingsIndexBuilder:
+
+    def __init__ (self, db):
+        self.db = db
+        self.records_read = 0
+        self.__oclc = None
+
+    def add_export (self, lines):
+        for line in lines:
+            line = line.rstrip("\n")
+
+            if line.strip():
+                self.add(*self.__reader(line)(line))
+
+        self.flush()
+
+    def add (self, oclc, title, symbols):
+        self.records_read += 1
+
+        if oclc_key(oclc) != self.__oclc:
+            self.flush()
+            self.__start(oclc_key(oclc))
+
+        if title is not None:
+            self.__title = title
+
+        self.__symbols.extend(s for s in symbols if s)
+
+    def flush (self):
+        if self.__oclc is not None:
+            self.__merge_into_db()
+            self.__oclc = None
+
+    def __reader (self, line):
+        if line.lstrip().startswith("{"):
+            return read_json_holdings
+
+        else:
+            return read_tsv_holdings
+
+    def __start (self, key):
+        self.__oclc = key
+        self.__title = None
+        self.__symbols = [ ]
+
+    def __merge_into_db (self):
+        # An export that isn't sorted by OCLC number can mention the
+        # same number in more than one place, so we add to what's there.
+        if self.__oclc in self.db:
+            old = json_load_str(self.db[self.__oclc].decode("utf-8"))
+            title = self.__title or old["title"]
+            symbols = [l["oclcSymbol"] for l in old["library"]]
+
+        else:
+            title = self.__title or ""
+            symbols = [ ]
+
+        seen = set(symbols)
+        for symbol in self.__symbols:
+            if symbol not in seen:
+                seen.add(symbol)
+                symbols.append(symbol)
+
+        self.db[self.__oclc] = self.__api_json(title, symbols)
+
+    def __api_json (self, title, symbols):
+        # We store what the WorldCat API would have said, so everything
+        # downstream reads it the same way.
+        return json_dump_str({
+            "title": title,
+            "library": [{"oclcSymbol": s} for s in symbols],
+        }).encode("utf-8")
+
+class LocalHoldings:
+
+    def __init__ (self, index_path):
+        self.index_path = index_path
+        self.db = dbm.open(index_path, "r")
+        self.__lock = Lock()
+
+    @classmethod
+    def build (cls, index_path, *export_paths):
+        # dbm objects only work with "with" from Python 3.4 on.
+        db = dbm.open(index_path, "n")
+
+        try:
+            builder = HoldingsIndexBuilder(db)
+
+            for path in export_paths:
+                with open(path, "r") as export:
+                    builder.add_export(export)
+
+        finally:
+            db.close()
+
+        return cls(index_path)
+
+    def get (self, oclc = None, **kwargs):
+        # We take (and ignore) the same arguments the WorldCat querier
+        # does, so that we can stand in for it.
+        if oclc is None:
+            return ""
+
+        with self.__lock:
+            value = self.db.get(oclc_key(oclc))
+
+        return "" if value is None else value.decode("utf-8")
+
+    def close (self):
+        self.db.close()
+
+    def __contains__ (self, oclc):
+        with self.__lock:
+            return oclc_key(oclc) in self.db
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__ (self):
+        return "<{} {}>".format(self.__class__.__name__,
+                                repr(self.index_path))
@@ -0,0 +1,8 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+
+from .micro import MICRO_BENCHMARKS, MicroBenchmark, MicroBenchmarkSuite
+from .pipeline import PipelineBenchmark, StandInCatalogs
+from .results import load_results, save_results
+from .synthetic_catalog import SyntheticCatalog
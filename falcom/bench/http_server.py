@@ -0,0 +1,113 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Lock, Thread
+from time import sleep
+
+class StandInRequestHandler (BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def setup (self):
+        super().setup()
+        self.server.count_connection()
+
+    def do_GET (self):
+        self.server.count_request(self.path)
+
+        try:
+            sleep(self.server.latency)
+            response = self.server.respond(self.path)
+
+        finally:
+            self.server.count_response()
+
+        if response is None:
+            # Hanging up without a word is how a flaky server looks to
+            # us, so that's what a responder returning None gets.
+            self.close_connection = True
+            return
+
+        status, headers, body = response
+
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        if self.server.hang_up_quietly:
+            self.close_connection = True
+
+    def log_message (self, *args):
+        pass
+
+class StandInHTTPServer (ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    # Tests and benchmarks open dozens of connections at once, more than
+    # the default listen backlog of five will hold.
+    request_queue_size = 128
+
+    def __init__ (self, responder, latency = 0):
+        super().__init__(("127.0.0.1", 0), StandInRequestHandler)
+        self.responder = responder
+        self.latency = latency
+        self.hang_up_quietly = False
+
+        self.connections = 0
+        self.paths = [ ]
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.__lock = Lock()
+
+    @property
+    def base_uri (self):
+        return "http://127.0.0.1:{:d}".format(self.server_address[1])
+
+    def count_connection (self):
+        with self.__lock:
+            self.connections += 1
+
+    def count_request (self, path):
+        with self.__lock:
+            self.paths.append(path)
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+
+    def count_response (self):
+        with self.__lock:
+            self.in_flight -= 1
+
+    def respond (self, path):
+        result = self.responder(path)
+
+        if result is None:
+            return None
+
+        elif isinstance(result, tuple):
+            status, headers, body = result
+
+        else:
+            status, headers, body = 200, (), result
+
+        if isinstance(body, str):
+            body = body.encode("utf_8")
+
+        return status, headers, body
+
+    def __enter__ (self):
+        Thread(target=self.serve_forever,
+               kwargs={"poll_interval": 0.01},
+               daemon=True).start()
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        self.shutdown()
+        self.server_close()
+        return False
@@ -0,0 +1,216 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import namedtuple
+from json import dumps as json_dump_str, loads as json_load_str
+from random import Random
+from os.path import dirname, join
+from platform import python_version
+
+from ..api.hathi import get_hathi_data_from_json
+from ..api.hathi.data import HathiData
+from ..api.hathi.title_match import soften_title
+from ..api.marc import get_marc_data_from_xml
+from ..api.worldcat import get_worldcat_data_from_json
+from ..compat import perf_counter
+from ..generate_pageview import Pagetags
+from ..luhn import LuhnNumber
+from ..table import Table
+from .synthetic_catalog import HATHI_PATH, WORLDCAT_PATH, WORDS
+from .synthetic_catalog import SyntheticCatalog
+
+SIZES = (1, 1000, 100000)
+
+# A change that makes anything twice as slow as its baseline fails.
+DEFAULT_THRESHOLD = 2.0
+
+def default_baseline_path ():
+    return join(dirname(__file__), "micro_baseline.json")
+
+Regression = namedtuple("Regression", ("key", "baseline", "score",
+                                       "ratio"))
+
+def calibrate (repeat = 10):
+    # Timings are divided by how long this fixed bit of work takes, so
+    # that a baseline made on one machine still means something on
+    # another.
+    def work ():
+        counts = { }
+        for i in range(100000):
+            key = i % 97
+            counts[key] = counts.get(key, 0) + i
+
+        return "".join(str(v) for v in counts.values())
+
+    return min(time_once(work) for i in range(repeat))
+
+def time_once (function, *args):
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+def compare (results, baseline, threshold = DEFAULT_THRESHOLD):
+    regressions = [ ]
+
+    for key, result in sorted(results["benchmarks"].items()):
+        if key in baseline["benchmarks"]:
+            old = baseline["benchmarks"][key]["score"]
+            ratio = result["score"] / old
+
+            if ratio > threshold:
+                regressions.append(Regression(key, old, result["score"],
+                                              ratio))
+
+    return regressions
+
+class MicroBenchmark:
+
+    def __init__ (self, name, make_input, run):
+        self.name = name
+        self.make_input = make_input
+        self.run = run
+
+    def time (self, size, min_seconds = 0.05, repeat = 3):
+        # Small inputs run in a loop until a try takes min_seconds, so
+        # the clock's resolution doesn't swamp what we measure.
+        data = self.make_input(size)
+        loops, first = self.__loops_for(data, min_seconds)
+        rest = [self.__time_loops(data, loops) for i in range(repeat - 1)]
+
+        return min([first] + rest) / loops
+
+    def __repr__ (self):
+        return "<{} {}>".format(self.__class__.__name__, self.name)
+
+    def __loops_for (self, data, min_seconds):
+        # The try that takes long enough also counts as our first.
+        loops = 1
+        seconds = self.__time_loops(data, loops)
+
+        while seconds < min_seconds:
+            loops *= 10
+            seconds = self.__time_loops(data, loops)
+
+        return loops, seconds
+
+    def __time_loops (self, data, loops):
+        start = perf_counter()
+
+        for i in range(loops):
+            self.run(data)
+
+        return perf_counter() - start
+
+def marcxml_records (size):
+    catalog = SyntheticCatalog()
+    return [catalog("/cgi-bin/bc2meta?id=" + barcode)
+            for barcode in catalog.barcodes(size)]
+
+def parse_marcxml_records (records):
+    for xml in records:
+        get_marc_data_from_xml(xml)
+
+def hathi_json_docs (size):
+    catalog = SyntheticCatalog()
+    ids = ["oclc:{:d}".format(500000000 + i) for i in range(size)]
+
+    return [json_dump_str(json_load_str(catalog(HATHI_PATH + i))[i])
+            for i in ids]
+
+def parse_hathi_json_docs (docs):
+    for json_data in docs:
+        get_hathi_data_from_json(json_data)
+
+def worldcat_json_docs (size):
+    catalog = SyntheticCatalog()
+    return [catalog(WORLDCAT_PATH + "{:d}".format(500000000 + i))
+            for i in range(size)]
+
+def parse_worldcat_json_docs (docs):
+    for json_data in docs:
+        get_worldcat_data_from_json(json_data)
+
+def hathi_titles (size):
+    random = Random(size)
+    titles = [" ".join(random.sample(WORDS, random.randint(2, 12)))
+              for i in range(size)]
+
+    return titles, " ".join(random.sample(WORDS, 6))
+
+def match_title (data):
+    # We start cold every time, as we would for a new HathiTrust record.
+    titles, title = data
+    soften_title.cache_clear()
+    HathiData(titles=titles).min_title_distance(title)
+
+def barcode_ints (size):
+    random = Random(size)
+    return [random.randrange(10**12, 10**13) for i in range(size)]
+
+def generate_check_digits (numbers):
+    luhn = LuhnNumber()
+    for n in numbers:
+        luhn.generate_from_int(n)
+
+def tab_separated_text (size):
+    return "\n".join("39015{:09d}\t{:d}\tQB {:d}\tTitle {:d}\tDC".format(
+            i, 100000000 + i, i % 1000, i) for i in range(size))
+
+def build_table (text):
+    Table(text)
+
+def raw_page_tags (size):
+    return {"tags": [{"number": str(i), "feature": "UNS"}
+                     for i in range(size)]}
+
+def generate_pageview (tag_data):
+    tags = Pagetags()
+    tags.add_raw_tags(tag_data)
+    tags.generate_pageview()
+
+MICRO_BENCHMARKS = (
+    MicroBenchmark("marc", marcxml_records, parse_marcxml_records),
+    MicroBenchmark("hathi_json", hathi_json_docs, parse_hathi_json_docs),
+    MicroBenchmark("worldcat_json", worldcat_json_docs,
+                   parse_worldcat_json_docs),
+    MicroBenchmark("title_match", hathi_titles, match_title),
+    MicroBenchmark("luhn", barcode_ints, generate_check_digits),
+    MicroBenchmark("table", tab_separated_text, build_table),
+    MicroBenchmark("pageview", raw_page_tags, generate_pageview),
+)
+
+class MicroBenchmarkSuite:
+
+    def __init__ (self, benchmarks = MICRO_BENCHMARKS, sizes = SIZES,
+                  repeat = 3):
+        self.benchmarks = benchmarks
+        self.sizes = sizes
+        self.repeat = repeat
+
+    def run (self, report = None):
+        results = { }
+
+        for benchmark in self.benchmarks:
+            for size in self.sizes:
+                key = "{}/{:d}".format(benchmark.name, size)
+                results[key] = self.__time(benchmark, size)
+
+                if report is not None:
+                    report(key, results[key])
+
+        return {"python": python_version(), "benchmarks": results}
+
+    def __repr__ (self):
+        return "<{} benchmarks={:d} sizes={}>".format(
+                self.__class__.__name__, len(self.benchmarks),
+                repr(self.sizes))
+
+    def __time (self, benchmark, size):
+        # A machine can change speed partway through a run, so we
+        # calibrate right before each benchmark rather than just once.
+        calibration = calibrate()
+        seconds = benchmark.time(size, repeat=self.repeat)
+
+        return {"seconds": seconds,
+                "calibration": calibration,
+                "score": seconds / calibration}
@@ -0,0 +1,182 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from math import ceil
+from platform import python_version
+
+from ..api import reject_list
+from ..api.reject_list import VolumeDataFromBarcode
+from ..api.uri import URI, PooledURLOpener
+from ..api.uri.circuit_breaker import NoCircuitBreaker
+from ..api.uri.rate_limiter import NoRateLimit
+from ..api.uri.response_cache import NoCache
+from ..api.worldcat import InstitutionClassifier
+from ..compat import perf_counter
+from .http_server import StandInHTTPServer
+from .results import peak_rss_kb
+from .synthetic_catalog import ALEPH_PATH, HATHI_PATH, WORLDCAT_PATH
+from .synthetic_catalog import SyntheticCatalog
+
+API_PATHS = (
+    ("aleph",    "aleph_api",    ALEPH_PATH),
+    ("worldcat", "worldcat_api", WORLDCAT_PATH + "{oclc}"),
+    ("hathi",    "hathi_api",    HATHI_PATH + "{ids}"),
+)
+
+def percentile (sorted_values, p):
+    if sorted_values:
+        rank = max(1, ceil(p * len(sorted_values) / 100))
+        return sorted_values[rank - 1]
+
+class StandInCatalogs:
+
+    # Each API gets a server of its own, so that the host limiter
+    # treats them as the separate hosts they really are.
+    settings = ("uri", "url_opener", "rate_limiter", "circuit_breaker",
+                "cache", "sleep_time", "max_sleep_time", "backoff",
+                "jitter")
+
+    def __init__ (self, catalog, latency = 0, retry_delay = 0.01):
+        self.catalog = catalog
+        self.latency = latency
+        self.retry_delay = retry_delay
+
+        self.servers = { }
+        self.url_opener = PooledURLOpener(max_idle_per_host=8)
+        self.__originals = [ ]
+
+    def request_counts (self):
+        return dict((name, len(server.paths))
+                    for name, server in self.servers.items())
+
+    def connection_counts (self):
+        return dict((name, server.connections)
+                    for name, server in self.servers.items())
+
+    def __enter__ (self):
+        try:
+            for name, api_name, path in API_PATHS:
+                self.__start_server(name)
+                self.__point_api_at_server(name, api_name, path)
+
+        except:
+            self.__exit__(None, None, None)
+            raise
+
+        reject_list.clear_memos()
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        for api, settings in self.__originals:
+            for key, value in settings.items():
+                setattr(api, key, value)
+
+        for server in self.servers.values():
+            server.__exit__(None, None, None)
+
+        self.url_opener.close()
+        reject_list.clear_memos()
+        return False
+
+    def __start_server (self, name):
+        server = StandInHTTPServer(self.catalog, self.latency)
+        self.servers[name] = server.__enter__()
+
+    def __point_api_at_server (self, name, api_name, path):
+        api = getattr(reject_list, api_name)
+        self.__originals.append((api, dict((key, getattr(api, key))
+                                           for key in self.settings)))
+
+        # We want to see how fast our code is, not how patient we are,
+        # so there are no rate limits, no caches, and quick retries.
+        api.uri = URI(self.servers[name].base_uri + path)
+        api.url_opener = self.url_opener
+        api.rate_limiter = NoRateLimit()
+        api.circuit_breaker = NoCircuitBreaker()
+        api.cache = NoCache()
+        api.sleep_time = self.retry_delay
+        api.max_sleep_time = None
+        api.backoff = 1
+        api.jitter = 0
+
+class PipelineBenchmark:
+
+    def __init__ (self, barcodes = 100, workers = 8, latency = 0.005,
+                  error_rate = 0, volumes_per_title = 1, seed = 0,
+                  retry_delay = 0.01):
+        self.barcodes = barcodes
+        self.workers = workers
+        self.latency = latency
+        self.error_rate = error_rate
+        self.volumes_per_title = volumes_per_title
+        self.seed = seed
+        self.retry_delay = retry_delay
+
+        self.institutions = InstitutionClassifier()
+
+    def run (self):
+        catalog = SyntheticCatalog(self.volumes_per_title,
+                                   self.error_rate, self.seed)
+        started = datetime.now()
+
+        with StandInCatalogs(catalog, self.latency,
+                             self.retry_delay) as stand_ins:
+            start = perf_counter()
+            latencies = self.__enrich_all(catalog.barcodes(self.barcodes))
+            seconds = perf_counter() - start
+
+        return self.__results(started, seconds, sorted(latencies),
+                              stand_ins, catalog)
+
+    def enrich (self, barcode):
+        # This is the work ugly_processor does for every row.
+        start = perf_counter()
+        data = VolumeDataFromBarcode(barcode)
+
+        if data.marc:
+            self.institutions.count(data.worldcat)
+            data.hathi_title_match_percent()
+
+        return perf_counter() - start
+
+    def __repr__ (self):
+        return "<{} barcodes={:d} workers={:d}>".format(
+                self.__class__.__name__, self.barcodes, self.workers)
+
+    def __enrich_all (self, barcodes):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.enrich, barcodes))
+
+    def __results (self, started, seconds, latencies, stand_ins,
+                   catalog):
+        return {
+            "started": started.replace(microsecond=0).isoformat(),
+            "python": python_version(),
+            "settings": self.__settings(),
+            "seconds": seconds,
+            "barcodes_per_second": self.barcodes / seconds,
+            "latency_ms": dict(
+                    ("p{:d}".format(p), self.__ms(latencies, p))
+                    for p in (50, 95, 99)),
+            "requests": stand_ins.request_counts(),
+            "connections": stand_ins.connection_counts(),
+            "errors_injected": catalog.errors,
+            "peak_rss_kb": peak_rss_kb(),
+        }
+
+    def __settings (self):
+        return {
+            "barcodes": self.barcodes,
+            "workers": self.workers,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "volumes_per_title": self.volumes_per_title,
+            "seed": self.seed,
+            "retry_delay": self.retry_delay,
+        }
+
+    def __ms (self, latencies, p):
+        value = percentile(latencies, p)
+        return None if value is None else 1000 * value
@@ -0,0 +1,29 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from json import dump as json_dump, load as json_load
+from sys import platform
+
+try:
+    import resource
+
+except ImportError:
+    resource = None
+
+def peak_rss_kb ():
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux counts this in kilobytes, but macOS counts it in bytes.
+    return peak // 1024 if platform == "darwin" else peak
+
+def save_results (results, path):
+    with open(path, "w") as f:
+        json_dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_results (path):
+    with open(path, "r") as f:
+        return json_load(f)
@@ -0,0 +1,193 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from json import dumps as json_dump_str
+from random import Random
+from threading import Lock
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from ..api.worldcat.institutions import CIC_INSTITUTIONS
+from ..api.worldcat.institutions import HATHI_INSTITUTIONS
+from ..luhn import get_check_digit
+
+ALEPH_PATH = "/cgi-bin/bc2meta"
+WORLDCAT_PATH = "/webservices/catalog/content/libraries/"
+HATHI_PATH = "/api/volumes/brief/json/"
+
+WORDS = ("annual", "report", "journal", "proceedings", "michigan",
+         "history", "studies", "bulletin", "survey", "transactions",
+         "society", "university", "geology", "astronomy", "law",
+         "review", "quarterly", "papers", "collected", "works")
+
+# Holdings are drawn from real symbols, so that sorting them into
+# institution groups costs what it does for real data.
+SYMBOLS = sorted(HATHI_INSTITUTIONS | CIC_INSTITUTIONS) \
+        + ["ZZ{:d}".format(n) for n in range(200)]
+
+MARCXML = """<record xmlns="http://www.loc.gov/MARC21/slim">
+<controlfield tag="001">{bib}</controlfield>
+<controlfield tag="008">{fixed}</controlfield>
+<datafield tag="035" ind1=" " ind2=" ">
+<subfield code="a">(OCoLC){oclc}</subfield>
+</datafield>
+<datafield tag="100" ind1="1" ind2=" ">
+<subfield code="a">{author}</subfield>
+</datafield>
+<datafield tag="245" ind1="0" ind2="0">
+<subfield code="a">{title} :</subfield>
+<subfield code="b">{subtitle}.</subfield>
+</datafield>
+<datafield tag="MDP" ind1=" " ind2=" ">
+<subfield code="h">{callno}</subfield>
+<subfield code="u">mdp.{barcode}</subfield>
+<subfield code="z">v.{volume}</subfield>
+</datafield>
+</record>"""
+
+class SyntheticCatalog:
+
+    def __init__ (self, volumes_per_title = 1, error_rate = 0, seed = 0):
+        self.volumes_per_title = volumes_per_title
+        self.error_rate = error_rate
+        self.seed = seed
+        self.errors = 0
+
+        self.__random = Random(seed)
+        self.__lock = Lock()
+
+    def __call__ (self, path):
+        if self.__should_fail():
+            return None
+
+        elif path.startswith(ALEPH_PATH):
+            return self.__aleph(path)
+
+        elif path.startswith(WORLDCAT_PATH):
+            return self.__worldcat(path)
+
+        elif path.startswith(HATHI_PATH):
+            return self.__hathi(path)
+
+        else:
+            return 404, (), ""
+
+    @staticmethod
+    def barcode (i):
+        number = "39015{:08d}".format(i)
+        return number + str(get_check_digit(number))
+
+    def barcodes (self, count):
+        return [self.barcode(i) for i in range(count)]
+
+    def __repr__ (self):
+        return "<{} error_rate={} errors={:d}>".format(
+                self.__class__.__name__, self.error_rate, self.errors)
+
+    def __should_fail (self):
+        with self.__lock:
+            if self.__random.random() < self.error_rate:
+                self.errors += 1
+                return True
+
+            else:
+                return False
+
+    def __aleph (self, path):
+        query = parse_qs(urlsplit(path).query)
+        barcode = query.get("id", [""])[0]
+
+        if barcode.startswith("mdp."):
+            barcode = barcode[4:]
+
+        if self.__is_ours(barcode):
+            return self.__marcxml(barcode)
+
+        else:
+            return ""
+
+    def __worldcat (self, path):
+        oclc = urlsplit(path).path[len(WORLDCAT_PATH):]
+
+        if not oclc.isdigit():
+            return 404, (), ""
+
+        t = int(oclc) - 500000000
+        random = self.__title_random(t)
+
+        symbols = random.sample(SYMBOLS, random.randint(1, 50))
+        return json_dump_str({
+            "title": self.__title(t),
+            "OCLCnumber": oclc,
+            "library": [{"oclcSymbol": s} for s in symbols],
+        })
+
+    def __hathi (self, path):
+        ids = unquote(urlsplit(path).path[len(HATHI_PATH):]).split("|")
+        return json_dump_str(dict((i, self.__hathi_record(i))
+                                  for i in ids))
+
+    def __hathi_record (self, hathi_id):
+        id_type, id_value = hathi_id.split(":")
+
+        if not id_value.isdigit():
+            return { }
+
+        elif id_type == "oclc":
+            t = int(id_value) - 500000000
+
+        else:
+            t = int(id_value) - 100000000
+
+        bib = self.__bib(t)
+        return {
+            "records": {bib: {
+                "titles": [self.__title(t) + " / " + self.__author(t)],
+                "oclcs": [self.__oclc(t)],
+            }},
+            "items": [{"fromRecord": bib,
+                       "htid": "mdp." + self.barcode(i),
+                       "orig": "University of Michigan"}
+                      for i in self.__volumes_of(t)],
+        }
+
+    def __is_ours (self, barcode):
+        return len(barcode) == 14 and barcode.isdigit() \
+                and barcode == self.barcode(int(barcode[5:13]))
+
+    def __marcxml (self, barcode):
+        i = int(barcode[5:13])
+        t = i // self.volumes_per_title
+        random = self.__title_random(t)
+        year = random.randint(1800, 1999)
+
+        return MARCXML.format(
+                bib=self.__bib(t),
+                oclc=self.__oclc(t),
+                fixed="930310s{:d}^^^^xx^^^^^^^^^^^^00||^^eng^d".format(year),
+                author=escape(self.__author(t)),
+                title=escape(self.__title(t)),
+                subtitle=escape(" ".join(random.sample(WORDS, 4))),
+                callno="QB {:d} .S{:d}".format(t % 1000, t % 97),
+                barcode=barcode,
+                volume=i % self.volumes_per_title + 1)
+
+    def __volumes_of (self, t):
+        first = t * self.volumes_per_title
+        return range(first, first + self.volumes_per_title)
+
+    def __title_random (self, t):
+        return Random("{}:{:d}".format(self.seed, t))
+
+    def __title (self, t):
+        random = self.__title_random(t)
+        return " ".join(random.sample(WORDS, 6)).capitalize()
+
+    def __author (self, t):
+        return "Author {:d}".format(t)
+
+    def __bib (self, t):
+        return "{:09d}".format(100000000 + t)
+
+    def __oclc (self, t):
+        return "{:d}".format(500000000 + t)
@@ -0,0 +1,47 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+
+try:
+    from time import monotonic
+
+except ImportError:
+    # Python 3.2 has no monotonic clock, so we make do with the wall
+    # clock and accept that a clock change can throw off a wait.
+    from time import time as monotonic
+
+try:
+    from os import cpu_count
+
+except ImportError:
+    import multiprocessing
+
+    def cpu_count ():
+        # Like os.cpu_count, we give None when we can't tell.
+        try:
+            return multiprocessing.cpu_count()
+
+        except NotImplementedError:
+            return None
+
+try:
+    from os import replace
+
+except ImportError:
+    # On POSIX, which is all we run 3.2 on, rename already replaces an
+    # existing file in one step.
+    from os import rename as replace
+
+def mtime_ns (stat):
+    # st_mtime_ns is new in Python 3.3.
+    if hasattr(stat, "st_mtime_ns"):
+        return stat.st_mtime_ns
+
+    else:
+        return int(stat.st_mtime * 10**9)
+
+try:
+    from time import perf_counter
+
+except ImportError:
+    from time import time as perf_counter
@@ -95,6 +95,12 @@ class GivenDefaultTryForeverDecorator (unittest.TestCase):
     def test_will_loop_without_limit (self):
         assert_that(self.decorator.limit, is_(equal_to(0)))
 
+    def test_will_loop_without_deadline (self):
+        assert_that(self.decorator.deadline, is_(none()))
+
+    def test_will_not_back_off (self):
+        assert_that(self.decorator.backoff, is_(equal_to(1)))
+
     def test_can_be_used_as_a_decorator (self):
         @self.decorator
         def return_five():
@@ -129,6 +135,76 @@ class GivenMethodThatFailsThreeTimes (unittest.TestCase):
         looper = self.init_looper(100, KeyError)
         assert_that(calling(looper), raises(RuntimeError))
 
+class GivenBackoffDecorator (unittest.TestCase):
+
+    def first_delays (self, count = 5, **kwargs):
+        delays = try_forever(**kwargs).delays()
+        return [next(delays) for i in range(count)]
+
+    def test_default_delays_do_not_change (self):
+        assert_that(self.first_delays(seconds_between_attempts=3),
+                    is_(equal_to([3, 3, 3, 3, 3])))
+
+    def test_backoff_multiplies_each_delay (self):
+        assert_that(self.first_delays(seconds_between_attempts=1,
+                                      backoff=2),
+                    is_(equal_to([1, 2, 4, 8, 16])))
+
+    def test_delays_can_be_capped (self):
+        assert_that(self.first_delays(seconds_between_attempts=1,
+                                      backoff=3,
+                                      max_seconds_between_attempts=10),
+                    is_(equal_to([1, 3, 9, 10, 10])))
+
+    def test_capped_delays_stay_capped_after_many_failures (self):
+        delays = self.first_delays(2000, seconds_between_attempts=1,
+                                   backoff=2,
+                                   max_seconds_between_attempts=10)
+        assert_that(delays[-1], is_(equal_to(10)))
+
+    def test_uncapped_delays_never_overflow (self):
+        delays = self.first_delays(2000, seconds_between_attempts=1,
+                                   backoff=2, jitter=0.5)
+        assert_that(delays[-1], is_(greater_than(10**300)))
+
+    def test_jitter_only_shortens_delays (self):
+        for delay in self.first_delays(100,
+                                       seconds_between_attempts=10,
+                                       jitter=0.5):
+            assert_that(delay, all_of(greater_than_or_equal_to(5),
+                                      less_than_or_equal_to(10)))
+
+    def test_jitter_varies_delays (self):
+        delays = self.first_delays(100, seconds_between_attempts=10,
+                                   jitter=0.5)
+        assert_that(len(set(delays)), is_(greater_than(1)))
+
+class GivenMethodThatAlwaysFails (unittest.TestCase):
+
+    def setUp (self):
+        self.tough_method = CallableThatFailsThenSucceeds(10**6)
+
+    def test_deadline_gives_up_instead_of_sleeping_past_it (self):
+        looper = try_forever(seconds_between_attempts=60,
+                             deadline=1)(self.tough_method)
+        assert_that(calling(looper), raises(RuntimeError))
+        assert_that(self.tough_method.countdown,
+                    is_(equal_to(10**6 - 1)))
+
+    def test_deadline_allows_retries_that_fit (self):
+        looper = try_forever(seconds_between_attempts=0.001,
+                             deadline=0.05)(self.tough_method)
+        assert_that(calling(looper), raises(RuntimeError))
+        assert_that(self.tough_method.countdown,
+                    is_(less_than(10**6 - 2)))
+
+    def test_errors_failing_retry_if_are_raised_at_once (self):
+        looper = try_forever(seconds_between_attempts=60,
+                             retry_if=lambda e: False)(self.tough_method)
+        assert_that(calling(looper), raises(RuntimeError))
+        assert_that(self.tough_method.countdown,
+                    is_(equal_to(10**6 - 1)))
+
 class FailThenSucceedTest (unittest.TestCase):
 
     def test_we_can_fail_then_succeed (self):
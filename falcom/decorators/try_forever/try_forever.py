@@ -1,8 +1,54 @@
 # Copyright (c) 2017 The Regents of the University of Michigan.
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
+from random import uniform
 from time import sleep
 
+from ...compat import monotonic
+
+class RetrySchedule:
+
+    def __init__ (self, try_forever):
+        self.retry_if = try_forever.retry_if
+        self.remaining = try_forever.limit
+        self.delays = try_forever.delays()
+        self.give_up_at = self.__deadline_from_now(try_forever.deadline)
+
+    def next_delay (self, error):
+        if self.retry_if(error):
+            return self.__next_delay_unless_out_of_tries()
+
+        else:
+            return None
+
+    def __next_delay_unless_out_of_tries (self):
+        self.remaining -= 1
+
+        if self.remaining == 0:
+            # We'll never get here if we start at zero, since we'll
+            # already be negative. Otherwise, we'll get here after
+            # the limit's worth of failures.
+            return None
+
+        else:
+            return self.__next_delay_unless_past_deadline()
+
+    def __next_delay_unless_past_deadline (self):
+        delay = next(self.delays)
+
+        if monotonic() + delay > self.give_up_at:
+            return None
+
+        else:
+            return delay
+
+    def __deadline_from_now (self, deadline):
+        if deadline is None:
+            return float("inf")
+
+        else:
+            return monotonic() + deadline
+
 class TryForever:
 
     __time_specifiers = (
@@ -17,32 +63,62 @@ class TryForever:
 
     def __call__ (self, func):
         def result (*args, **kwargs):
-            n = self.limit
+            schedule = self.schedule()
 
             while True:
                 try:
                     return func(*args, **kwargs)
 
-                except self.base_error:
-                    n -= 1
-                    if n == 0:
-                        # We'll never get here if n starts at zero,
-                        # since it will already be negative. Otherwise,
-                        # we'll get here after n failures.
+                except self.base_error as error:
+                    delay = schedule.next_delay(error)
+                    if delay is None:
                         raise
 
-                sleep(self.seconds_between_attempts)
+                sleep(delay)
 
         return result
 
+    def schedule (self):
+        return RetrySchedule(self)
+
+    def delays (self):
+        # We cap each delay before growing the next one from it, so a
+        # long run of failures can't build up a number too big to use.
+        delay = self.__capped(float(self.seconds_between_attempts))
+
+        while True:
+            yield self.__with_jitter(delay)
+            delay = self.__capped(delay * self.backoff)
+
     def __repr__ (self):
         return "<{}>".format(self.__class__.__name__)
 
     def __set_properties (self, kwargs):
         self.base_error = kwargs.pop("base_error", Exception)
+        self.retry_if = kwargs.pop("retry_if", lambda error: True)
         self.limit = kwargs.pop("limit", 0)
+        self.deadline = kwargs.pop("deadline", None)
 
         self.__set_pause_time(kwargs, 60)
+        self.__set_backoff(kwargs)
+
+    def __set_backoff (self, kwargs):
+        self.backoff = kwargs.pop("backoff", 1)
+        self.max_seconds_between_attempts = kwargs.pop(
+                "max_seconds_between_attempts", None)
+        self.jitter = kwargs.pop("jitter", 0)
+
+    def __capped (self, delay):
+        if self.max_seconds_between_attempts is None:
+            return delay
+
+        else:
+            return min(delay, self.max_seconds_between_attempts)
+
+    def __with_jitter (self, delay):
+        # With jitter, each pause is cut short by a random fraction of
+        # up to self.jitter so that many failing callers spread out.
+        return delay * uniform(1 - self.jitter, 1)
 
     def __set_pause_time (self, kwargs, default):
         all_times_given = self.__get_all_pause_times_from(kwargs)
@@ -2,6 +2,7 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 
+from .batch import UNKNOWN_DIGIT, new_luhn_batch
 from .luhn_number import LuhnNumber
 
 def get_check_digit (number = None):
@@ -11,3 +12,12 @@ def get_check_digit (number = None):
 def verify_check_digit (number = None):
     n = LuhnNumber(number)
     return n.has_valid_check_digit()
+
+# These give NumPy arrays when NumPy is installed and lists when it
+# isn't. Either way, numbers we can't read get UNKNOWN_DIGIT as their
+# check digit and are never valid.
+def get_check_digits (numbers):
+    return new_luhn_batch(numbers).check_digits()
+
+def verify_check_digits (numbers):
+    return new_luhn_batch(numbers).valid_mask()
@@ -0,0 +1,172 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from numbers import Integral
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+# What each digit adds to a Luhn total when it sits in a doubled place.
+ROTATED_DIGITS = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+def chunk_total (chunk):
+    # The ones and hundreds digits of a chunk are doubled.
+    return ROTATED_DIGITS[chunk % 10] + (chunk // 10) % 10 \
+            + ROTATED_DIGITS[(chunk // 100) % 10] + chunk // 1000
+
+# Numbers we can't read get this in place of a check digit, since an
+# integer array has no room for None.
+UNKNOWN_DIGIT = -1
+
+# Taking four digits at a time keeps the doubled places lined up, so we
+# can look each chunk's share of the total up at once.
+CHUNK_TOTALS = tuple(chunk_total(i) for i in range(10000))
+
+def parse_number (number):
+    if isinstance(number, Integral):
+        return int(number) if number >= 0 else None
+
+    elif isinstance(number, str):
+        return parse_str(number)
+
+    else:
+        return None
+
+def parse_str (number):
+    try:
+        return parse_number(int(number))
+
+    except ValueError:
+        return None
+
+class LuhnBatch:
+
+    def __init__ (self, numbers):
+        self.numbers = [parse_number(n) for n in numbers]
+        self.known = [n is not None for n in self.numbers]
+
+    def check_digits (self):
+        return [UNKNOWN_DIGIT if n is None else self.__check_digit(n)
+                for n in self.numbers]
+
+    def valid_mask (self):
+        return [n is not None and n % 10 == self.__check_digit(n // 10)
+                for n in self.numbers]
+
+    def __len__ (self):
+        return len(self.numbers)
+
+    def __repr__ (self):
+        return "<{} {:d}>".format(self.__class__.__name__, len(self))
+
+    def __check_digit (self, n):
+        total = 0
+
+        while n > 0:
+            n, chunk = divmod(n, 10000)
+            total += CHUNK_TOTALS[chunk]
+
+        return (9 * total) % 10
+
+class NumPyLuhnBatch:
+
+    def __init__ (self, numbers):
+        if self.__is_signed_int_array(numbers):
+            self.__set_numbers_from_array(numbers)
+
+        else:
+            self.__set_numbers_from_list(numbers)
+
+    def check_digits (self):
+        digits = self.__check_digits_for(self.numbers)
+        return numpy.where(self.known, digits, UNKNOWN_DIGIT)
+
+    def valid_mask (self):
+        expected = self.__check_digits_for(self.numbers // 10)
+        return self.known & (self.numbers % 10 == expected)
+
+    def __len__ (self):
+        return len(self.numbers)
+
+    def __repr__ (self):
+        return "<{} {:d}>".format(self.__class__.__name__, len(self))
+
+    def __is_signed_int_array (self, numbers):
+        return isinstance(numbers, numpy.ndarray) \
+                and numpy.issubdtype(numbers.dtype, numpy.signedinteger)
+
+    def __set_numbers_from_array (self, numbers):
+        self.known = numbers >= 0
+        self.numbers = numpy.where(self.known, numbers,
+                                   0).astype(numpy.int64)
+
+    def __set_numbers_from_list (self, numbers):
+        if not isinstance(numbers, numpy.ndarray):
+            numbers = list(numbers)
+
+        try:
+            # NumPy can read plain digit strings far faster than we can
+            # one at a time, so we only do that when it balks.
+            self.__set_numbers_from_array(
+                    numpy.array(numbers, dtype=str).astype(numpy.int64))
+
+        except ValueError:
+            self.__parse_each_number(numbers)
+
+    def __parse_each_number (self, numbers):
+        if isinstance(numbers, numpy.ndarray):
+            numbers = numbers.tolist()
+
+        parsed = [parse_number(n) for n in numbers]
+
+        self.known = numpy.array([n is not None for n in parsed],
+                                 dtype=bool)
+        self.numbers = numpy.array([n or 0 for n in parsed],
+                                   dtype=numpy.int64)
+
+    def __check_digits_for (self, numbers):
+        rotated = numpy.array(ROTATED_DIGITS)
+        total = numpy.zeros(len(numbers), dtype=numpy.int64)
+        doubled = True
+
+        while numbers.any():
+            digits = numbers % 10
+            total += rotated[digits] if doubled else digits
+            numbers = numbers // 10
+            doubled = not doubled
+
+        return (9 * total) % 10
+
+class LongLuhnBatch (LuhnBatch):
+
+    # We work these out with Python's unbounded integers but hand them
+    # back as arrays, so callers get what NumPyLuhnBatch would give.
+
+    def __init__ (self, numbers):
+        super().__init__(numbers)
+        self.known = numpy.array(self.known, dtype=bool)
+
+    def check_digits (self):
+        return numpy.array(super().check_digits(), dtype=numpy.int64)
+
+    def valid_mask (self):
+        return numpy.array(super().valid_mask(), dtype=bool)
+
+def new_luhn_batch (numbers):
+    if numpy is None:
+        return LuhnBatch(numbers)
+
+    else:
+        return new_numpy_luhn_batch(numbers)
+
+def new_numpy_luhn_batch (numbers):
+    try:
+        return NumPyLuhnBatch(numbers)
+
+    except OverflowError:
+        # Something in here is too long for 64 bits, so we fall back on
+        # Python's unbounded integers.
+        return LongLuhnBatch(numbers)
@@ -0,0 +1,9 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+
+from .columnar_table import ColumnarTable
+from .mapped_table import MappedTable, default_index_path
+from .resumable_writer import ResumableTableWriter
+from .streaming_table import StreamingTable
+from .table import Table
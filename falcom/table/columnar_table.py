@@ -0,0 +1,236 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import Counter
+from itertools import compress, islice
+
+from .table import Table
+
+try:
+    import numpy
+
+except ImportError:
+    numpy = None
+
+class ColumnarTable:
+
+    InconsistentColumnCounts = Table.InconsistentColumnCounts
+
+    # We write this many rows at a time, so that neither a huge table
+    # nor one write call per row slows us down.
+    rows_per_write = 4096
+
+    def __init__ (self, columns = ( ), header = None):
+        self.columns = [self.__as_column(c) for c in columns]
+        self.__header = None
+        self.__raise_error_unless_columns_are_the_same_length()
+
+        if header is not None:
+            self.add_header(*header)
+
+    @classmethod
+    def from_rows (cls, rows):
+        rows = list(rows)
+        cls.__raise_error_unless_rows_are_the_same_length(rows)
+        return cls(zip(*rows))
+
+    @classmethod
+    def from_text (cls, tab_separated_text):
+        return cls.from_rows(Table(tab_separated_text))
+
+    @property
+    def rows (self):
+        return len(self)
+
+    @property
+    def cols (self):
+        return len(self.columns)
+
+    @property
+    def header (self):
+        return self.__header
+
+    def body (self):
+        body = iter(self)
+        next(body, None)
+        return body
+
+    def add_header (self, *args):
+        if len(args) != self.cols:
+            raise self.InconsistentColumnCounts(self.cols, args)
+
+        self.__header = args
+
+    def column (self, key):
+        return self.columns[self.__column_index(key)]
+
+    def select (self, *keys):
+        indices = [self.__column_index(k) for k in keys]
+        return self.__new_table([self.columns[i] for i in indices],
+                                self.__header_at(indices))
+
+    def filter (self, mask):
+        mask = self.__as_mask(mask)
+        return self.__new_table([self.__compress(c, mask)
+                                 for c in self.columns],
+                                self.__header)
+
+    def hconcat (self, other):
+        if other.__body_rowcount() != self.__body_rowcount():
+            raise ValueError("can't put {:d} rows beside {:d}".format(
+                    other.__body_rowcount(), self.__body_rowcount()))
+
+        return self.__new_table(self.columns + other.columns,
+                                self.__combined_header(other))
+
+    def as_numbers (self, *keys):
+        indices = set(self.__column_index(k) for k in keys)
+        return self.__new_table([self.__numeric(c) if i in indices else c
+                                 for i, c in enumerate(self.columns)],
+                                self.__header)
+
+    def value_counts (self, key):
+        return Counter(self.column(key))
+
+    def write_tsv (self, f):
+        rows = iter(self.__string_rows())
+
+        while True:
+            lines = ["\t".join(r) for r in islice(rows,
+                                                  self.rows_per_write)]
+
+            if lines:
+                f.write("\n".join(lines) + "\n")
+
+            else:
+                break
+
+    def __len__ (self):
+        return self.__body_rowcount() + self.__get_header_rowcount()
+
+    def __iter__ (self):
+        if self.__header is not None:
+            yield self.__header
+
+        yield from zip(*self.columns)
+
+    def __getitem__ (self, key):
+        if self.__header is None:
+            return self.__get_row(key)
+
+        elif key == 0:
+            return self.__header
+
+        else:
+            return self.__get_row(key - 1)
+
+    def __repr__ (self):
+        return "<{} rows={:d} cols={:d}>".format(self.__class__.__name__,
+                                                 self.rows, self.cols)
+
+    def __as_column (self, column):
+        if numpy is not None and isinstance(column, numpy.ndarray):
+            return column
+
+        else:
+            return list(column)
+
+    def __raise_error_unless_columns_are_the_same_length (self):
+        lengths = set(len(c) for c in self.columns)
+
+        if len(lengths) > 1:
+            raise ValueError("columns have different lengths: {}".format(
+                    sorted(lengths)))
+
+    @classmethod
+    def __raise_error_unless_rows_are_the_same_length (cls, rows):
+        for line_number, row in enumerate(rows, 1):
+            if len(row) != len(rows[0]):
+                raise cls.InconsistentColumnCounts(len(rows[0]), row,
+                                                   line_number)
+
+    def __new_table (self, columns, header):
+        return self.__class__(columns, header)
+
+    def __column_index (self, key):
+        if isinstance(key, str) and self.__header is not None:
+            return self.__header.index(key)
+
+        else:
+            return key
+
+    def __header_at (self, indices):
+        if self.__header is not None:
+            return tuple(self.__header[i] for i in indices)
+
+    def __combined_header (self, other):
+        if self.__header is None and other.__header is None:
+            return None
+
+        else:
+            return self.__header_or_blanks() + other.__header_or_blanks()
+
+    def __header_or_blanks (self):
+        if self.__header is None:
+            return ("",) * self.cols
+
+        else:
+            return self.__header
+
+    def __as_mask (self, mask):
+        # The mask is read once per column, so a generator would be
+        # used up by the first; we read it once, up front, instead.
+        if numpy is None:
+            mask = [bool(x) for x in mask]
+
+        elif isinstance(mask, numpy.ndarray):
+            mask = mask.astype(bool)
+
+        else:
+            mask = numpy.fromiter(mask, dtype=bool)
+
+        if len(mask) != self.__body_rowcount():
+            raise ValueError("can't filter {:d} rows with {:d}".format(
+                    self.__body_rowcount(), len(mask)))
+
+        return mask
+
+    def __compress (self, column, mask):
+        if isinstance(column, list):
+            return list(compress(column, mask))
+
+        else:
+            return column[mask]
+
+    def __numeric (self, column):
+        if numpy is None:
+            return [int(x) for x in column]
+
+        else:
+            return numpy.array(column, dtype=numpy.int64)
+
+    def __string_rows (self):
+        if self.__header is not None:
+            yield self.__header
+
+        yield from zip(*(self.__strings(c) for c in self.columns))
+
+    def __strings (self, column):
+        if isinstance(column, list):
+            return ["" if x is None else str(x) for x in column]
+
+        else:
+            return column.astype(str).tolist()
+
+    def __body_rowcount (self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __get_header_rowcount (self):
+        return 0 if self.__header is None else 1
+
+    def __get_row (self, i):
+        if self.columns:
+            return tuple(c[i] for c in self.columns)
+
+        else:
+            raise IndexError("table row index out of range")
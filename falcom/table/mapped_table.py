@@ -0,0 +1,271 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from array import array
+from bisect import bisect_right
+from mmap import mmap, ACCESS_READ
+from os import fstat
+from struct import Struct
+from sys import byteorder
+
+from ..compat import mtime_ns, replace
+from .table import Table
+
+def offset_typecode ():
+    # Python 3.2 has no "Q" arrays, but "L" is 64 bits on the 64-bit
+    # systems we run it on.
+    try:
+        array("Q")
+        return "Q"
+
+    except ValueError:
+        return "L"
+
+OFFSET_TYPECODE = offset_typecode()
+
+def default_index_path (path):
+    return path + ".idx"
+
+class OffsetIndex:
+
+    # The header says which version of which file the offsets are for:
+    # its size, its modification time, and where its last row ends.
+    header = Struct("<8sQQQ")
+    magic = b"falcidx1"
+
+    def __init__ (self, offsets, size, mtime, end):
+        self.offsets = offsets
+        self.size = size
+        self.mtime = mtime
+        self.end = end
+
+    @classmethod
+    def load (cls, path, size, mtime):
+        if not cls.__can_be_saved():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return cls.__read_if_current(f, size, mtime)
+
+        except (OSError, ValueError):
+            return None
+
+    def save (self, path):
+        if not self.__can_be_saved():
+            return
+
+        offsets = array(OFFSET_TYPECODE, self.offsets)
+        if byteorder == "big":
+            offsets.byteswap()
+
+        with open(path + ".tmp", "wb") as f:
+            f.write(self.header.pack(self.magic, self.size, self.mtime,
+                                     self.end))
+            offsets.tofile(f)
+
+        replace(path + ".tmp", path)
+
+    @staticmethod
+    def __can_be_saved ():
+        # The index file holds 64-bit offsets, which we can only read
+        # and write directly when our arrays hold the same.
+        return array(OFFSET_TYPECODE).itemsize == 8
+
+    @classmethod
+    def __read_if_current (cls, f, size, mtime):
+        magic, saved_size, saved_mtime, end = cls.header.unpack(
+                f.read(cls.header.size))
+
+        if (magic, saved_size, saved_mtime) != (cls.magic, size, mtime):
+            return None
+
+        offsets = array(OFFSET_TYPECODE, f.read())
+        if byteorder == "big":
+            offsets.byteswap()
+
+        return cls(offsets, size, mtime, end)
+
+    def __repr__ (self):
+        return "<{} rows={:d}>".format(self.__class__.__name__,
+                                       len(self.offsets))
+
+class MappedTable:
+
+    InputStrContainsCarriageReturn = Table.InputStrContainsCarriageReturn
+    InconsistentColumnCounts = Table.InconsistentColumnCounts
+
+    def __init__ (self, path, index_path = None):
+        self.path = path
+        self.index_path = index_path
+        self.index_was_loaded = False
+        self.__header = None
+
+        self.__open()
+
+        try:
+            self.__load_or_build_index()
+
+        except:
+            self.close()
+            raise
+
+        self.cols = len(self.__parse_row(0)) if self.__offsets else 0
+
+    @property
+    def rows (self):
+        return len(self)
+
+    def body (self):
+        body = iter(self)
+        next(body, None)
+        return body
+
+    def add_header (self, *args):
+        self.__assert_valid_length(args)
+        self.__header = args
+
+    def close (self):
+        if self.__map is not None:
+            self.__map.close()
+
+        self.__file.close()
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__ (self):
+        return len(self.__offsets) + self.__get_header_rowcount()
+
+    def __iter__ (self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__ (self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+
+        elif self.__header is None:
+            return self.__get_row(key)
+
+        elif key == 0:
+            return self.__header
+
+        else:
+            return self.__get_row(key - 1)
+
+    def __repr__ (self):
+        items = [self.__class__.__name__, repr(self.path)]
+
+        if self.__header is not None:
+            items.insert(1, repr(self.__header))
+
+        return "<{}>".format(" ".join(items))
+
+    def __open (self):
+        self.__file = open(self.path, "rb")
+        stat = fstat(self.__file.fileno())
+        self.__size = stat.st_size
+        self.__mtime = mtime_ns(stat)
+
+        # An empty file can't be mapped, but it also has nothing in it.
+        if self.__size:
+            self.__map = mmap(self.__file.fileno(), 0, access=ACCESS_READ)
+
+        else:
+            self.__map = None
+
+    def __load_or_build_index (self):
+        index = self.__load_index()
+
+        if index is None:
+            index = self.__build_index()
+            self.__save_index(index)
+
+        else:
+            self.index_was_loaded = True
+
+        self.__offsets = index.offsets
+        self.__end = index.end
+
+    def __load_index (self):
+        if self.index_path is not None:
+            return OffsetIndex.load(self.index_path, self.__size,
+                                    self.__mtime)
+
+    def __save_index (self, index):
+        if self.index_path is not None:
+            index.save(self.index_path)
+
+    def __build_index (self):
+        offsets = array(OFFSET_TYPECODE)
+        end = self.__size
+
+        if self.__map is not None:
+            end = self.__end_without_trailing_newlines()
+            self.__find_line_starts(offsets, end)
+            self.__raise_error_if_carriage_returns(offsets)
+
+        return OffsetIndex(offsets, self.__size, self.__mtime, end)
+
+    def __end_without_trailing_newlines (self):
+        end = self.__size
+
+        while end > 0 and self.__map[end - 1:end] == b"\n":
+            end -= 1
+
+        return end
+
+    def __find_line_starts (self, offsets, end):
+        # Like Table, we ignore trailing blank lines, but a file with
+        # anything in it at all has at least one row.
+        start = 0
+
+        while start >= 0:
+            offsets.append(start)
+            start = self.__map.find(b"\n", start, end)
+
+            if start >= 0:
+                start += 1
+
+    def __raise_error_if_carriage_returns (self, offsets):
+        position = self.__map.find(b"\r")
+
+        if position >= 0:
+            raise self.InputStrContainsCarriageReturn("line {:d}".format(
+                    bisect_right(offsets, position)))
+
+    def __get_row (self, i):
+        if i < 0:
+            i += len(self.__offsets)
+
+        if not 0 <= i < len(self.__offsets):
+            raise IndexError("table row index out of range")
+
+        row = self.__parse_row(i)
+        self.__assert_valid_length(row, i + 1)
+        return row
+
+    def __parse_row (self, i):
+        start = self.__offsets[i]
+        stop = self.__row_stop(i)
+        return tuple(self.__map[start:stop].decode("utf-8").split("\t"))
+
+    def __row_stop (self, i):
+        if i + 1 < len(self.__offsets):
+            return self.__offsets[i + 1] - 1
+
+        else:
+            return self.__end
+
+    def __assert_valid_length (self, row, line_number = None):
+        if len(row) != self.cols:
+            raise self.InconsistentColumnCounts(self.cols, row,
+                                                line_number)
+
+    def __get_header_rowcount (self):
+        return 0 if self.__header is None else 1
@@ -0,0 +1,100 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from collections import OrderedDict
+from os import remove
+from os.path import exists
+
+from ..compat import replace
+
+class ResumableTableWriter:
+
+    def __init__ (self, path, header = None):
+        self.path = path
+        self.partial_path = path + ".partial"
+        self.journal_path = path + ".journal"
+
+        self.done = OrderedDict()
+        self.rows_written = 0
+
+        self.__read_journal()
+        self.__open_files(header)
+
+    @property
+    def resumed (self):
+        return bool(self.done)
+
+    def write_row (self, key, row, note = ""):
+        self.__output.write("\t".join(row) + "\n")
+        self.__output.flush()
+        self.rows_written += 1
+        self.__record(key, note)
+
+    def skip (self, key, note = ""):
+        self.__record(key, note)
+
+    def finish (self):
+        self.close()
+        replace(self.partial_path, self.path)
+        remove(self.journal_path)
+
+    def close (self):
+        self.__output.close()
+        self.__journal.close()
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+
+        else:
+            self.close()
+
+        return False
+
+    def __repr__ (self):
+        return "<{} {} done={:d}>".format(self.__class__.__name__,
+                                          repr(self.path), len(self.done))
+
+    def __read_journal (self):
+        self.__offset = 0
+
+        if exists(self.journal_path) and exists(self.partial_path):
+            with open(self.journal_path, "r") as journal:
+                for line in journal:
+                    self.__read_journal_line(line)
+
+    def __read_journal_line (self, line):
+        # A line without its newline was cut off mid-write, so the row
+        # it was about to record can't be trusted either.
+        if line.endswith("\n"):
+            offset, key, note = line[:-1].split("\t", 2)
+            self.__offset = int(offset)
+            self.done[key] = note
+
+    def __open_files (self, header):
+        if self.resumed:
+            self.__output = open(self.partial_path, "r+")
+            self.__output.truncate(self.__offset)
+            self.__output.seek(self.__offset)
+            self.__journal = open(self.journal_path, "a")
+
+        else:
+            self.__output = open(self.partial_path, "w")
+            self.__journal = open(self.journal_path, "w")
+            self.__write_header(header)
+
+    def __write_header (self, header):
+        if header is not None:
+            self.__output.write("\t".join(header) + "\n")
+            self.__output.flush()
+
+    def __record (self, key, note):
+        # We only journal a row once it's safely in the partial file,
+        # along with how long that file was at the time.
+        self.done[key] = note
+        self.__journal.write("{:d}\t{}\t{}\n".format(self.__output.tell(),
+                                                     key, note))
+        self.__journal.flush()
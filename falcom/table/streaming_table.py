@@ -0,0 +1,131 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from .table import Table
+
+class StreamingTable:
+
+    InputStrContainsCarriageReturn = Table.InputStrContainsCarriageReturn
+    InconsistentColumnCounts = Table.InconsistentColumnCounts
+
+    def __init__ (self, source):
+        self.source = source
+        self.__header = None
+        self.__set_start_position()
+        self.cols = self.__count_cols_in_first_row()
+
+    def body (self):
+        body = iter(self)
+        next(body, None)
+        return body
+
+    def add_header (self, *args):
+        self.__assert_valid_length(args)
+        self.__header = args
+
+    def __iter__ (self):
+        if self.__header is not None:
+            yield self.__header
+
+        yield from self.__rows()
+
+    def __repr__ (self):
+        items = [self.__class__.__name__, repr(self.source)]
+
+        if self.__header is not None:
+            items.insert(1, repr(self.__header))
+
+        return "<{}>".format(" ".join(items))
+
+    def __set_start_position (self):
+        if self.__source_is_a_path():
+            self.__start = None
+
+        else:
+            self.__start = self.source.tell()
+
+    def __count_cols_in_first_row (self):
+        lines = self.__numbered_lines()
+
+        try:
+            for line_number, text in lines:
+                return len(self.__split_row(text))
+
+            return 0
+
+        finally:
+            lines.close()
+
+    def __rows (self):
+        # Blank lines only count as rows when something follows them,
+        # just as Table ignores trailing blank lines.
+        blank_line_numbers = [ ]
+        any_rows = False
+
+        for line_number, text in self.__numbered_lines():
+            if text:
+                for blank_line_number in blank_line_numbers:
+                    yield self.__checked_row(("",), blank_line_number)
+
+                blank_line_numbers = [ ]
+                any_rows = True
+                yield self.__checked_row(self.__split_row(text),
+                                         line_number)
+
+            else:
+                blank_line_numbers.append(line_number)
+
+        if blank_line_numbers and not any_rows:
+            yield self.__checked_row(("",), blank_line_numbers[0])
+
+    def __numbered_lines (self):
+        with self.__open() as lines:
+            for line_number, line in enumerate(lines, 1):
+                text = self.__strip_newline(line)
+                self.__raise_error_if_carriage_return(text, line_number)
+
+                yield line_number, text
+
+    def __open (self):
+        if self.__source_is_a_path():
+            # We ask for no newline translation so that we can see (and
+            # complain about) any carriage returns.
+            return open(self.source, "r", newline="\n")
+
+        else:
+            self.source.seek(self.__start)
+            return NoClose(self.source)
+
+    def __source_is_a_path (self):
+        return isinstance(self.source, str)
+
+    def __strip_newline (self, line):
+        return line[:-1] if line.endswith("\n") else line
+
+    def __raise_error_if_carriage_return (self, text, line_number):
+        if "\r" in text:
+            raise self.InputStrContainsCarriageReturn(
+                    "line {:d}".format(line_number))
+
+    def __split_row (self, text):
+        return tuple(text.split("\t"))
+
+    def __checked_row (self, row, line_number):
+        self.__assert_valid_length(row, line_number)
+        return row
+
+    def __assert_valid_length (self, row, line_number = None):
+        if len(row) != self.cols:
+            raise self.InconsistentColumnCounts(self.cols, row,
+                                                line_number)
+
+class NoClose:
+
+    def __init__ (self, f):
+        self.f = f
+
+    def __enter__ (self):
+        return self.f
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        return False
@@ -8,14 +8,21 @@ class Table:
         pass
 
     class InconsistentColumnCounts (RuntimeError):
-        def __init__ (self, expected_len, row):
+        def __init__ (self, expected_len, row, line_number = None):
             self.expected_len = expected_len
             self.row = row
+            self.line_number = line_number
 
         def __str__ (self):
-            return "Expected every row to have len={:d}: {}".format(
+            message = "Expected every row to have len={:d}: {}".format(
                     self.expected_len, repr(self.row))
 
+            if self.line_number is None:
+                return message
+
+            else:
+                return "line {:d}: {}".format(self.line_number, message)
+
     def __init__ (self, tab_separated_text = None):
         self.text = tab_separated_text
 
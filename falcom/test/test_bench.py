@@ -0,0 +1,256 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from json import load as json_load
+from os.path import join
+from tempfile import TemporaryDirectory
+import unittest
+
+from ..api import reject_list
+from ..api.hathi import get_hathi_data_from_json
+from ..api.hathi.batch import split_hathi_json_by_id
+from ..api.marc import get_marc_data_from_xml
+from ..api.reject_list import VolumeDataFromBarcode
+from ..api.worldcat import get_worldcat_data_from_json
+from ..bench import MICRO_BENCHMARKS, MicroBenchmark, MicroBenchmarkSuite
+from ..bench import PipelineBenchmark, StandInCatalogs, SyntheticCatalog
+from ..bench import load_results, save_results
+from ..bench.micro import SIZES, compare, default_baseline_path
+from ..bench.pipeline import percentile
+from ..luhn import verify_check_digit
+from .hamcrest import evaluates_to
+
+class GivenSyntheticCatalog (unittest.TestCase):
+
+    def setUp (self):
+        self.catalog = SyntheticCatalog(volumes_per_title=2)
+        self.barcode = self.catalog.barcode(5)
+
+    def get_marc (self, barcode):
+        return get_marc_data_from_xml(self.catalog(
+                "/cgi-bin/bc2meta?id={}&type=bc".format(barcode)))
+
+    def get_hathi (self, hathi_id):
+        json_data = self.catalog("/api/volumes/brief/json/" + hathi_id)
+        return get_hathi_data_from_json(
+                split_hathi_json_by_id(json_data, [hathi_id])[hathi_id])
+
+    def test_barcodes_look_like_ours (self):
+        assert_that(self.barcode, matches_regexp(r"^39015[0-9]{9}$"))
+        assert_that(verify_check_digit(self.barcode), is_(equal_to(True)))
+
+    def test_barcodes_are_all_different (self):
+        assert_that(set(self.catalog.barcodes(100)), has_length(100))
+
+    def test_marc_has_a_bib_oclc_and_title (self):
+        marc = self.get_marc(self.barcode)
+        assert_that(marc.bib, is_(equal_to("100000002")))
+        assert_that(marc.oclc, is_(equal_to("500000002")))
+        assert_that(marc.title, is_not(none()))
+
+    def test_marc_can_be_found_by_htid (self):
+        assert_that(self.get_marc("mdp." + self.barcode).bib,
+                    is_(equal_to("100000002")))
+
+    def test_volumes_of_a_title_share_a_bib (self):
+        assert_that(self.get_marc(self.catalog.barcode(4)).bib,
+                    is_(equal_to("100000002")))
+
+    def test_unknown_barcode_has_no_marc (self):
+        assert_that(self.get_marc("39015000000000"),
+                    evaluates_to(False))
+
+    def test_worldcat_has_holdings (self):
+        worldcat = get_worldcat_data_from_json(self.catalog(
+                "/webservices/catalog/content/libraries/500000002"))
+        assert_that(list(worldcat), is_not(empty()))
+
+    def test_worldcat_is_the_same_every_time (self):
+        path = "/webservices/catalog/content/libraries/500000002"
+        assert_that(self.catalog(path), is_(equal_to(self.catalog(path))))
+
+    def test_hathi_lists_every_volume_of_a_title (self):
+        hathi = self.get_hathi("recordnumber:100000002")
+        assert_that(hathi.htids, contains_exactly(
+                "mdp." + self.catalog.barcode(4), "mdp." + self.barcode))
+
+    def test_hathi_title_is_close_to_the_marc_title (self):
+        hathi = self.get_hathi("oclc:500000002")
+        assert_that(hathi.min_title_distance(
+                        self.get_marc(self.barcode).title),
+                    is_(less_than(0.5)))
+
+    def test_unknown_path_is_not_found (self):
+        assert_that(self.catalog("/nowhere")[0], is_(equal_to(404)))
+
+    def test_error_rate_makes_it_hang_up (self):
+        catalog = SyntheticCatalog(error_rate=1)
+        assert_that(catalog("/cgi-bin/bc2meta"), is_(none()))
+        assert_that(catalog.errors, is_(equal_to(1)))
+
+class PercentileTest (unittest.TestCase):
+
+    def test_nearest_rank (self):
+        values = list(range(1, 101))
+        assert_that(percentile(values, 50), is_(equal_to(50)))
+        assert_that(percentile(values, 99), is_(equal_to(99)))
+
+    def test_one_value_is_every_percentile (self):
+        assert_that(percentile([7], 1), is_(equal_to(7)))
+        assert_that(percentile([7], 99), is_(equal_to(7)))
+
+    def test_no_values_have_no_percentile (self):
+        assert_that(percentile([ ], 50), is_(none()))
+
+class GivenStandInCatalogs (unittest.TestCase):
+
+    def setUp (self):
+        self.catalog = SyntheticCatalog()
+        self.original_uri = reject_list.aleph_api.uri
+        self.original_opener = reject_list.aleph_api.url_opener
+
+    def test_volumes_come_from_the_stand_ins (self):
+        with StandInCatalogs(self.catalog) as stand_ins:
+            data = VolumeDataFromBarcode(self.catalog.barcode(3))
+
+        assert_that(data.marc.oclc, is_(equal_to("500000003")))
+        assert_that(stand_ins.request_counts(),
+                    has_entries(aleph=1, worldcat=1, hathi=1))
+
+    def test_queriers_are_put_back_afterward (self):
+        with StandInCatalogs(self.catalog):
+            pass
+
+        assert_that(reject_list.aleph_api.uri,
+                    is_(equal_to(self.original_uri)))
+        assert_that(reject_list.aleph_api.url_opener,
+                    is_(same_instance(self.original_opener)))
+
+    def test_hung_up_requests_are_retried (self):
+        catalog = SyntheticCatalog(error_rate=0.3, seed=1)
+
+        with StandInCatalogs(catalog, retry_delay=0):
+            data = VolumeDataFromBarcode(catalog.barcode(3))
+
+        assert_that(data.marc.oclc, is_(equal_to("500000003")))
+
+class GivenSmallPipelineBenchmark (unittest.TestCase):
+
+    @classmethod
+    def setUpClass (cls):
+        cls.results = PipelineBenchmark(barcodes=12, workers=4,
+                                        latency=0,
+                                        volumes_per_title=3).run()
+
+    def test_throughput_is_positive (self):
+        assert_that(self.results["barcodes_per_second"],
+                    is_(greater_than(0)))
+
+    def test_percentiles_are_in_order (self):
+        latency = self.results["latency_ms"]
+        assert_that(latency["p50"], is_(less_than_or_equal_to(
+                latency["p95"])))
+        assert_that(latency["p95"], is_(less_than_or_equal_to(
+                latency["p99"])))
+
+    def test_every_barcode_asks_aleph (self):
+        assert_that(self.results["requests"]["aleph"],
+                    is_(equal_to(12)))
+
+    def test_shared_titles_share_worldcat_requests (self):
+        assert_that(self.results["requests"]["worldcat"],
+                    is_(equal_to(4)))
+
+    def test_settings_are_recorded (self):
+        assert_that(self.results["settings"],
+                    has_entries(barcodes=12, workers=4))
+
+    def test_results_can_be_saved_as_json (self):
+        with TemporaryDirectory() as tmpdir:
+            path = join(tmpdir, "results.json")
+            save_results(self.results, path)
+
+            with open(path) as f:
+                assert_that(json_load(f), is_(equal_to(self.results)))
+
+class CountingBenchmark (MicroBenchmark):
+
+    def __init__ (self):
+        super().__init__("counting", lambda size: list(range(size)),
+                         self.count)
+        self.calls = 0
+
+    def count (self, data):
+        self.calls += 1
+        sum(data)
+
+class MicroBenchmarkTest (unittest.TestCase):
+
+    def test_every_benchmark_runs_on_one_item (self):
+        for benchmark in MICRO_BENCHMARKS:
+            benchmark.run(benchmark.make_input(1))
+
+    def test_quick_benchmarks_are_looped (self):
+        benchmark = CountingBenchmark()
+        benchmark.time(1, min_seconds=0.01, repeat=2)
+        assert_that(benchmark.calls, is_(greater_than(10)))
+
+    def test_time_is_per_call (self):
+        benchmark = CountingBenchmark()
+        assert_that(benchmark.time(1, min_seconds=0.01),
+                    is_(less_than(0.01)))
+
+    def test_suite_scores_against_calibration (self):
+        results = MicroBenchmarkSuite([CountingBenchmark()], (1, 10),
+                                      repeat=1).run()
+        assert_that(results["benchmarks"], has_entries({
+                "counting/1": has_key("score"),
+                "counting/10": has_key("score")}))
+
+        result = results["benchmarks"]["counting/10"]
+        assert_that(result["score"], is_(close_to(
+                result["seconds"] / result["calibration"], 1e-9)))
+
+    def test_baseline_covers_every_benchmark_and_size (self):
+        baseline = load_results(default_baseline_path())
+        for benchmark in MICRO_BENCHMARKS:
+            for size in SIZES:
+                assert_that(baseline["benchmarks"],
+                            has_key("{}/{:d}".format(benchmark.name,
+                                                     size)))
+
+class GivenMicroBaseline (unittest.TestCase):
+
+    def setUp (self):
+        self.baseline = {"benchmarks": {
+            "marc/1": {"score": 1.0},
+            "table/1": {"score": 2.0},
+        }}
+
+    def results (self, **scores):
+        return {"benchmarks": dict((k.replace("_", "/"), {"score": v})
+                                   for k, v in scores.items())}
+
+    def test_same_speed_is_no_regression (self):
+        assert_that(compare(self.results(marc_1=1.0), self.baseline),
+                    is_(empty()))
+
+    def test_up_to_twice_as_slow_is_allowed (self):
+        assert_that(compare(self.results(marc_1=2.0), self.baseline),
+                    is_(empty()))
+
+    def test_more_than_twice_as_slow_is_a_regression (self):
+        regressions = compare(self.results(marc_1=2.1, table_1=2.0),
+                              self.baseline)
+        assert_that(regressions, has_length(1))
+        assert_that(regressions[0].key, is_(equal_to("marc/1")))
+        assert_that(regressions[0].ratio, is_(close_to(2.1, 1e-9)))
+
+    def test_threshold_can_be_changed (self):
+        assert_that(compare(self.results(table_1=3.0), self.baseline,
+                            threshold=1.2), has_length(1))
+
+    def test_new_benchmarks_have_nothing_to_regress_from (self):
+        assert_that(compare(self.results(luhn_1=9.0), self.baseline),
+                    is_(empty()))
@@ -5,7 +5,9 @@ from hamcrest import *
 import unittest
 
 from .hamcrest import ComposedMatcher, evaluates_to
-from ..luhn import get_check_digit, verify_check_digit, LuhnNumber
+from ..luhn import get_check_digit, verify_check_digit, LuhnNumber, \
+        get_check_digits, verify_check_digits
+from ..luhn.batch import LuhnBatch, NumPyLuhnBatch, UNKNOWN_DIGIT, numpy
 
 class yields_null_check_digit (ComposedMatcher):
 
@@ -173,3 +175,79 @@ class LuhnNumberClassTest (unittest.TestCase):
     def test_one (self):
         assert_that(LuhnNumber(1), evaluates_to(True))
         assert_that(LuhnNumber("1"), evaluates_to(True))
+
+class LuhnBatchTests:
+
+    examples = [0, 5, 18, 42, 7992739871, 79927398713, 39015079130699,
+                "39015081447313", "79927398710", "nope", "", None, 3.0, -18]
+
+    def assert_batch_agrees (self, numbers):
+        batch = self.batch_class(numbers)
+
+        assert_that(list(batch.valid_mask()), is_(equal_to(
+                [verify_check_digit(n) for n in numbers])))
+        assert_that(list(batch.check_digits()), is_(equal_to(
+                [self.digit_or_null(get_check_digit(n), n)
+                 for n in numbers])))
+
+    def digit_or_null (self, digit, number):
+        if isinstance(number, int) and number < 0:
+            return self.null_digit
+
+        else:
+            return self.null_digit if digit is None else digit
+
+    def test_examples_agree_with_single_numbers (self):
+        self.assert_batch_agrees(self.examples)
+
+    def test_a_range_agrees_with_single_numbers (self):
+        self.assert_batch_agrees(list(range(0, 3000, 7)))
+
+    def test_empty_batch_is_empty (self):
+        assert_that(list(self.batch_class([]).valid_mask()), is_(empty()))
+
+    def test_known_marks_numbers_we_could_read (self):
+        assert_that(list(self.batch_class(["18", "nope", -1, 5]).known),
+                    is_(equal_to([True, False, False, True])))
+
+class PythonLuhnBatchTest (LuhnBatchTests, unittest.TestCase):
+    batch_class = LuhnBatch
+    null_digit = UNKNOWN_DIGIT
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class NumPyLuhnBatchTest (LuhnBatchTests, unittest.TestCase):
+    batch_class = NumPyLuhnBatch
+    null_digit = UNKNOWN_DIGIT
+
+    def test_integer_arrays_are_read_directly (self):
+        numbers = numpy.array([79927398713, 79927398710, -1])
+        assert_that(NumPyLuhnBatch(numbers).valid_mask().tolist(),
+                    is_(equal_to([True, False, False])))
+
+class BatchFunctionTest (unittest.TestCase):
+
+    def test_mask_marks_valid_barcodes (self):
+        mask = verify_check_digits(["39015079130699", "39015079130698"])
+        assert_that(list(mask), is_(equal_to([True, False])))
+
+    def test_check_digits_complete_barcodes (self):
+        assert_that(list(get_check_digits([3901507913069])),
+                    is_(equal_to([9])))
+
+    def test_numbers_past_64_bits_still_work (self):
+        static = 10 ** 30 + 7992739871
+        number = static * 10 + get_check_digit(static)
+        assert_that(list(verify_check_digits([number])),
+                    is_(equal_to([True])))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numbers_past_64_bits_still_give_arrays (self):
+        numbers = [10 ** 40, "nope", 18]
+        digits = get_check_digits(numbers)
+
+        assert_that(digits, is_(instance_of(numpy.ndarray)))
+        assert_that(digits.tolist(), is_(equal_to(
+                [get_check_digit(10 ** 40), UNKNOWN_DIGIT,
+                 get_check_digit(18)])))
+        assert_that(verify_check_digits(numbers).tolist(),
+                    is_(equal_to([False, False, True])))
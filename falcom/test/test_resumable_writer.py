@@ -0,0 +1,91 @@
+# Copyright (c) 2017 The Regents of the University of Michigan.
+# All Rights Reserved. Licensed according to the terms of the Revised
+# BSD License. See LICENSE.txt for details.
+from hamcrest import *
+from os.path import exists, join
+from tempfile import TemporaryDirectory
+import unittest
+
+from ..table import ResumableTableWriter
+
+class GivenOutputPath (unittest.TestCase):
+
+    def setUp (self):
+        self.tmp = TemporaryDirectory()
+        self.path = join(self.tmp.name, "out.tsv")
+
+    def tearDown (self):
+        self.tmp.cleanup()
+
+    def read (self, path):
+        with open(path, "r") as f:
+            return f.read()
+
+    def new_writer (self):
+        return ResumableTableWriter(self.path, ("a", "b"))
+
+    def test_rows_land_in_the_partial_file_as_they_finish (self):
+        writer = self.new_writer()
+        writer.write_row("1", ("x", "y"))
+
+        assert_that(self.read(writer.partial_path),
+                    is_(equal_to("a\tb\nx\ty\n")))
+        assert_that(exists(self.path), is_(equal_to(False)))
+        writer.close()
+
+    def test_finish_swaps_the_file_into_place (self):
+        with self.new_writer() as writer:
+            writer.write_row("1", ("x", "y"))
+            writer.skip("2")
+
+        assert_that(self.read(self.path), is_(equal_to("a\tb\nx\ty\n")))
+        assert_that(exists(writer.partial_path), is_(equal_to(False)))
+        assert_that(exists(writer.journal_path), is_(equal_to(False)))
+
+    def test_restart_skips_what_was_journaled (self):
+        writer = self.new_writer()
+        writer.write_row("1", ("x", "y"), "note\twith tab")
+        writer.skip("2")
+        writer.close()
+
+        writer = self.new_writer()
+        assert_that(writer.resumed, is_(equal_to(True)))
+        assert_that(list(writer.done.items()), is_(equal_to([
+                ("1", "note\twith tab"), ("2", "")])))
+
+        writer.write_row("3", ("z", "w"))
+        writer.finish()
+        assert_that(self.read(self.path),
+                    is_(equal_to("a\tb\nx\ty\nz\tw\n")))
+
+    def test_restart_drops_rows_that_were_never_journaled (self):
+        writer = self.new_writer()
+        writer.write_row("1", ("x", "y"))
+        writer.close()
+
+        with open(writer.partial_path, "a") as f:
+            f.write("half a ro")
+
+        with open(writer.journal_path, "a") as f:
+            f.write("99\t2")
+
+        with self.new_writer() as writer:
+            assert_that(list(writer.done), is_(equal_to(["1"])))
+            writer.write_row("2", ("z", "w"))
+
+        assert_that(self.read(self.path),
+                    is_(equal_to("a\tb\nx\ty\nz\tw\n")))
+
+    def test_errors_leave_the_journal_for_next_time (self):
+        try:
+            with self.new_writer() as writer:
+                writer.write_row("1", ("x", "y"))
+                raise ConnectionError
+
+        except ConnectionError:
+            pass
+
+        assert_that(exists(self.path), is_(equal_to(False)))
+
+        with self.new_writer() as writer:
+            assert_that(writer.done, has_key("1"))
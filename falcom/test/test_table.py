@@ -2,10 +2,14 @@
 # All Rights Reserved. Licensed according to the terms of the Revised
 # BSD License. See LICENSE.txt for details.
 from hamcrest import *
+from io import StringIO
+from os.path import join
+from tempfile import TemporaryDirectory
 import unittest
 
 from .hamcrest import ComposedMatcher, evaluates_to
-from ..table import Table
+from ..table import ColumnarTable, MappedTable, StreamingTable, Table, \
+        default_index_path
 
 class an_internally_consistent_table (ComposedMatcher):
 
@@ -167,3 +171,262 @@ class Test3x3TableWithOverriddenHeader (
 
     def test_first_row_is_the_new_header (self):
         assert_that(self.table[0], is_(equal_to(("2", "4", "8"))))
+
+class StreamingTableTest (unittest.TestCase):
+
+    examples = ("", "a", "a\tb", "a\tb\nc\td\n", "a\n\n", "\n",
+                "a\n\nb\n\n\n", "\t\t\n\t\t")
+
+    def assert_matches_table (self, text):
+        stream = StreamingTable(StringIO(text))
+
+        assert_that(list(stream), is_(equal_to(list(Table(text)))),
+                    repr(text))
+        assert_that(stream.cols, is_(equal_to(Table(text).cols)),
+                    repr(text))
+
+    def test_rows_match_a_table_of_the_same_text (self):
+        for text in self.examples:
+            self.assert_matches_table(text)
+
+    def test_rows_can_be_read_more_than_once (self):
+        table = StreamingTable(StringIO("a\tb\nc\td\n"))
+        assert_that(list(table.body()), is_(equal_to([("c", "d")])))
+        assert_that(list(table.body()), is_(equal_to([("c", "d")])))
+
+    def test_header_comes_first (self):
+        table = StreamingTable(StringIO("a\tb\nc\td\n"))
+        table.add_header("1", "2")
+
+        assert_that(list(table.body()),
+                    is_(equal_to([("a", "b"), ("c", "d")])))
+
+    def test_bad_column_count_names_its_line (self):
+        table = StreamingTable(StringIO("a\tb\nc\td\ne\n"))
+        rows = table.body()
+
+        assert_that(next(rows), is_(equal_to(("c", "d"))))
+        assert_that(calling(next).with_args(rows),
+                    raises(Table.InconsistentColumnCounts, "line 3"))
+
+    def test_carriage_returns_name_their_line (self):
+        table = StreamingTable(StringIO("a\nb\r\n"))
+        assert_that(calling(list).with_args(table),
+                    raises(Table.InputStrContainsCarriageReturn, "line 2"))
+
+class GivenStreamingTableFile (unittest.TestCase):
+
+    def setUp (self):
+        self.tmp = TemporaryDirectory()
+        self.path = join(self.tmp.name, "table.tsv")
+
+    def tearDown (self):
+        self.tmp.cleanup()
+
+    def write (self, text):
+        with open(self.path, "w", newline="") as f:
+            f.write(text)
+
+    def test_rows_are_read_from_the_path (self):
+        self.write("a\tb\nc\td\n")
+        assert_that(list(StreamingTable(self.path).body()),
+                    is_(equal_to([("c", "d")])))
+
+    def test_windows_newlines_are_refused (self):
+        self.write("a\tb\r\nc\td\r\n")
+        assert_that(calling(StreamingTable).with_args(self.path),
+                    raises(Table.InputStrContainsCarriageReturn, "line 1"))
+
+class GivenMappedTableFile (unittest.TestCase):
+
+    def setUp (self):
+        self.tmp = TemporaryDirectory()
+        self.path = join(self.tmp.name, "table.tsv")
+        self.tables = [ ]
+
+    def tearDown (self):
+        for table in self.tables:
+            table.close()
+
+        self.tmp.cleanup()
+
+    def write (self, text):
+        with open(self.path, "w", newline="") as f:
+            f.write(text)
+
+    def open_table (self, **kwargs):
+        table = MappedTable(self.path, **kwargs)
+        self.tables.append(table)
+        return table
+
+    def test_rows_match_a_table_of_the_same_text (self):
+        for text in StreamingTableTest.examples:
+            self.write(text)
+            table = self.open_table()
+
+            assert_that(list(table), is_(equal_to(list(Table(text)))),
+                        repr(text))
+            assert_that(len(table), is_(equal_to(len(Table(text)))),
+                        repr(text))
+
+    def test_table_is_internally_consistent (self):
+        self.write("a\tb\tc\nd\te\tf\ng\th\ti\n")
+        assert_that(self.open_table(),
+                    is_(an_internally_consistent_table()))
+
+    def test_rows_can_be_read_in_any_order (self):
+        self.write("".join("{:d}\tx\n".format(i) for i in range(100)))
+        table = self.open_table()
+
+        assert_that(table[73], is_(equal_to(("73", "x"))))
+        assert_that(table[-1], is_(equal_to(("99", "x"))))
+        assert_that(table[0], is_(equal_to(("0", "x"))))
+
+    def test_rows_can_be_sliced_like_a_table (self):
+        text = "".join("{:d}\tx\n".format(i) for i in range(10))
+        self.write(text)
+        table = self.open_table()
+
+        for key in (slice(2, 5), slice(None, None, 3), slice(-3, None),
+                    slice(8, 20), slice(5, 2)):
+            assert_that(table[key], is_(equal_to(Table(text)[key])))
+
+    def test_slices_include_the_header (self):
+        self.write("a\tb\nc\td\n")
+        table = self.open_table()
+        table.add_header("1", "2")
+
+        assert_that(table[:2], is_(equal_to([("1", "2"), ("a", "b")])))
+        assert_that(table[1:], is_(equal_to([("a", "b"), ("c", "d")])))
+
+    def test_header_comes_first (self):
+        self.write("a\tb\nc\td\n")
+        table = self.open_table()
+        table.add_header("1", "2")
+
+        assert_that(table, has_length(3))
+        assert_that(table[2], is_(equal_to(("c", "d"))))
+
+    def test_bad_column_count_names_its_line (self):
+        self.write("a\tb\nc\nd\te\n")
+        table = self.open_table()
+
+        assert_that(table[2], is_(equal_to(("d", "e"))))
+        assert_that(calling(table.__getitem__).with_args(1),
+                    raises(Table.InconsistentColumnCounts, "line 2"))
+
+    def test_carriage_returns_name_their_line (self):
+        self.write("a\nb\nc\r\n")
+        assert_that(calling(MappedTable).with_args(self.path),
+                    raises(Table.InputStrContainsCarriageReturn, "line 3"))
+
+    def test_saved_index_is_used_when_reopened (self):
+        self.write("a\tb\nc\td\n")
+        index_path = default_index_path(self.path)
+
+        assert_that(self.open_table(index_path=index_path).index_was_loaded,
+                    is_(equal_to(False)))
+
+        table = self.open_table(index_path=index_path)
+        assert_that(table.index_was_loaded, is_(equal_to(True)))
+        assert_that(list(table), is_(equal_to([("a", "b"), ("c", "d")])))
+
+    def test_saved_index_is_ignored_once_the_file_changes (self):
+        index_path = default_index_path(self.path)
+        self.write("a\tb\nc\td\n")
+        self.open_table(index_path=index_path)
+
+        self.write("a\tb\nc\td\ne\tf\n")
+        table = self.open_table(index_path=index_path)
+
+        assert_that(table.index_was_loaded, is_(equal_to(False)))
+        assert_that(table[2], is_(equal_to(("e", "f"))))
+
+class ColumnarTableTest (unittest.TestCase):
+
+    def test_rows_match_a_table_of_the_same_text (self):
+        for text in StreamingTableTest.examples:
+            assert_that(list(ColumnarTable.from_text(text)),
+                        is_(equal_to(list(Table(text)))), repr(text))
+
+    def test_table_is_internally_consistent (self):
+        table = ColumnarTable.from_text("a\tb\tc\nd\te\tf\n")
+        assert_that(table, is_(an_internally_consistent_table()))
+
+    def test_empty_table_is_internally_consistent (self):
+        assert_that(ColumnarTable(), is_(an_empty_table()))
+
+    def test_mismatched_rows_are_not_allowed (self):
+        assert_that(calling(ColumnarTable.from_rows).with_args(
+                        [("a", "b"), ("c",)]),
+                    raises(Table.InconsistentColumnCounts, "line 2"))
+
+    def test_mismatched_columns_are_not_allowed (self):
+        assert_that(calling(ColumnarTable).with_args([["a"], ["b", "c"]]),
+                    raises(ValueError))
+
+class GivenColumnarRejectList (unittest.TestCase):
+
+    def setUp (self):
+        self.table = ColumnarTable.from_rows([
+                ("39015079130699", "3", "DC"),
+                ("39015081447313", "0", "DX"),
+                ("39015071755826", "5", "DC"),
+            ])
+        self.table.add_header("barcode", "numcic", "status")
+
+    def test_columns_can_be_found_by_name (self):
+        assert_that(self.table.column("status"),
+                    is_(equal_to(["DC", "DX", "DC"])))
+
+    def test_statuses_can_be_counted (self):
+        assert_that(self.table.value_counts("status"),
+                    has_entries(DC=2, DX=1))
+
+    def test_select_keeps_the_chosen_columns (self):
+        selected = self.table.select("status", 0)
+        assert_that(selected.header, is_(equal_to(("status", "barcode"))))
+        assert_that(selected[1], is_(equal_to(("DC", "39015079130699"))))
+
+    def test_filter_keeps_rows_by_mask (self):
+        mask = [s == "DC" for s in self.table.column("status")]
+        assert_that(list(self.table.filter(mask).body()),
+                    is_(equal_to([("39015079130699", "3", "DC"),
+                                  ("39015071755826", "5", "DC")])))
+
+    def test_filter_reads_a_generator_mask_once (self):
+        mask = (s == "DC" for s in self.table.column("status"))
+        assert_that(list(self.table.filter(mask).body()),
+                    is_(equal_to([("39015079130699", "3", "DC"),
+                                  ("39015071755826", "5", "DC")])))
+
+    def test_mask_must_cover_every_row (self):
+        assert_that(calling(self.table.filter).with_args([True, False]),
+                    raises(ValueError))
+
+    def test_numbers_can_be_compared_in_bulk (self):
+        numbers = self.table.as_numbers("numcic")
+        mask = [n > 0 for n in numbers.column("numcic")]
+
+        assert_that(numbers.filter(mask).column("barcode"),
+                    is_(equal_to(["39015079130699", "39015071755826"])))
+
+    def test_columns_can_be_added_beside (self):
+        extension = ColumnarTable([["x", "y", "z"]], header=("extra",))
+        combined = self.table.hconcat(extension)
+
+        assert_that(combined.cols, is_(equal_to(4)))
+        assert_that(combined[3], is_(equal_to(
+                ("39015071755826", "5", "DC", "z"))))
+
+    def test_only_equal_lengths_can_be_added_beside (self):
+        assert_that(calling(self.table.hconcat).with_args(
+                        ColumnarTable([["x"]])),
+                    raises(ValueError))
+
+    def test_writes_tsv_that_reads_back_the_same (self):
+        out = StringIO()
+        self.table.as_numbers("numcic").write_tsv(out)
+
+        assert_that(list(Table(out.getvalue())),
+                    is_(equal_to(list(self.table))))